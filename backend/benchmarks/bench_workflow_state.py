@@ -0,0 +1,105 @@
+"""
+Benchmark the per-node state overhead of the GraphMind workflow.
+
+Compares the old node pattern (``state.model_dump()`` followed by
+``GraphState(**state_data)``) with nodes that return partial updates, using a
+four-node LangGraph pipeline over synthetic documents so only the state
+handling is measured.
+
+Run it as a module from the backend directory, so ``src`` is importable
+(``python benchmarks/bench_workflow_state.py`` fails with ModuleNotFoundError):
+    cd backend
+    python -m benchmarks.bench_workflow_state --pages 300 --runs 5
+"""
+import argparse
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from langchain_core.documents import Document
+from langgraph.graph import StateGraph, END
+
+from src.workflows.state import GraphState
+
+NODE_NAMES = ["process_documents", "retrieve_relevant_context", "generate_knowledge_graph", "generate_summary"]
+
+
+def make_documents(pages: int, chunks_per_page: int = 4) -> Dict[str, List[Document]]:
+    """Build documents and chunks roughly the size of a parsed PDF."""
+    documents = [
+        Document(page_content="lorem ipsum " * 250, metadata={"source": "bench.pdf", "page": page})
+        for page in range(pages)
+    ]
+    chunks = [
+        Document(page_content="lorem ipsum " * 60, metadata={"source": "bench.pdf", "page": page, "chunk": index})
+        for page in range(pages)
+        for index in range(chunks_per_page)
+    ]
+    return {"documents": documents, "chunks": chunks}
+
+
+def legacy_node(name: str, updates: Dict[str, Any]) -> Callable[[GraphState], GraphState]:
+    """Node that copies the whole state, as the workflow nodes used to."""
+    def node(state: GraphState) -> GraphState:
+        state_data = state.model_dump()
+        state_data.update(updates)
+        state_data["current_step"] = name
+        return GraphState(**state_data)
+    return node
+
+
+def partial_node(name: str, updates: Dict[str, Any]) -> Callable[[GraphState], Dict[str, Any]]:
+    """Node that returns only the fields it changes."""
+    def node(state: GraphState) -> Dict[str, Any]:
+        return dict(updates, current_step=name)
+    return node
+
+
+def build_pipeline(node_factory: Callable, data: Dict[str, List[Document]]):
+    updates = {
+        "process_documents": {"documents": data["documents"], "chunks": data["chunks"]},
+        "retrieve_relevant_context": {"relevant_chunks": data["chunks"][:5], "combined_context": "context"},
+        "generate_knowledge_graph": {"entities": [], "relationships": [], "knowledge_graph": {}},
+        "generate_summary": {"summary": "summary"},
+    }
+    graph = StateGraph(GraphState)
+    for name in NODE_NAMES:
+        graph.add_node(name, node_factory(name, updates[name]))
+    graph.set_entry_point(NODE_NAMES[0])
+    for current, following in zip(NODE_NAMES, NODE_NAMES[1:]):
+        graph.add_edge(current, following)
+    graph.add_edge(NODE_NAMES[-1], END)
+    return graph.compile()
+
+
+def time_pipeline(pipeline, runs: int) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        pipeline.invoke(GraphState(query="benchmark", file_path="bench.pdf"))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=300, help="Number of synthetic PDF pages")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per variant")
+    args = parser.parse_args()
+
+    data = make_documents(args.pages)
+    print(f"{len(data['documents'])} documents, {len(data['chunks'])} chunks, {len(NODE_NAMES)} nodes, {args.runs} runs")
+
+    results = {}
+    for label, factory in (("model_dump + rebuild", legacy_node), ("partial updates", partial_node)):
+        timings = time_pipeline(build_pipeline(factory, data), args.runs)
+        median = statistics.median(timings)
+        results[label] = median
+        print(f"{label:<22} total {median * 1000:9.2f} ms   per node {median * 1000 / len(NODE_NAMES):8.2f} ms")
+
+    speedup = results["model_dump + rebuild"] / results["partial updates"]
+    print(f"speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 from src.api.routes import router as api_router
 from src.config.settings import settings
+from src.config.logging import logging
+from src.services import get_parser_pool, shutdown_parser_pool
+from src.components.tasks.redis_client import redis_client
 import os
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start parser processes before traffic arrives so the first upload doesn't pay for it
+    if settings.PARSER_EXECUTION_MODE == "process":
+        get_parser_pool().warm_up()
+    # Index tasks stored before the task index existed; listing works without it
+    try:
+        redis_client.ensure_task_index()
+    except Exception:
+        logging.exception("Failed to build the task index")
+    yield
+    shutdown_parser_pool()
+
 def create_app() -> FastAPI:
     app = FastAPI(
+        lifespan=lifespan,
         title="GraphMind API",
         version="0.1.0",
         description="API for GraphMind, a tool for visualizing knowledge graphs.",
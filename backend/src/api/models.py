@@ -12,10 +12,20 @@ class QueryRequest(BaseModel):
 
 class DocumentProcessRequest(BaseModel):
     s3_key: str = Field(..., description="S3 key of the document to process")
+    document_id: Optional[str] = Field(
+        None, min_length=1,
+        description="Stable ID of the document across re-uploads, so only changed chunks are re-embedded; defaults to the S3 key"
+    )
     chunk_size: int = Field(1000, ge=100, le=5000, description="Size of text chunks")
     chunk_overlap: int = Field(200, ge=0, le=1000, description="Overlap between chunks")
     process_in_background: bool = Field(True, description="Process in background or synchronously")
 
+class BulkIngestRequest(BaseModel):
+    prefix: str = Field(..., min_length=1, description="S3 key prefix whose documents should be ingested")
+    chunk_size: int = Field(1000, ge=100, le=5000, description="Size of text chunks")
+    chunk_overlap: int = Field(200, ge=0, le=1000, description="Overlap between chunks")
+    workers: Optional[int] = Field(None, ge=1, le=64, description="Documents downloaded and parsed in parallel")
+
 # Response Models
 class QueryResponse(BaseModel):
     success: bool = Field(..., description="Indicates if the query workflow was successful")
@@ -27,6 +37,7 @@ class QueryResponse(BaseModel):
     relevant_chunks: Optional[List[Dict[str, Any]]] = Field(None, description="Relevant text chunks found")
     processing_steps: Optional[List[str]] = Field(None, description="Steps completed in the workflow")
     processing_time: Optional[float] = Field(None, description="Time taken to process the query in seconds")
+    cached: bool = Field(False, description="True when the response was served from the query cache")
     error: Optional[str] = Field(None, description="Error message, if any")
     timestamp: datetime = Field(default_factory=datetime.now, description="Response timestamp")
 
@@ -36,12 +47,22 @@ class DocumentProcessResponse(BaseModel):
     document_name: Optional[str] = Field(None, description="Name of the processed document")
     documents_processed: Optional[int] = Field(None, description="Number of documents processed")
     chunks_created: Optional[int] = Field(None, description="Number of chunks created")
+    chunks_added: Optional[int] = Field(None, description="Number of new or changed chunks embedded and upserted")
+    chunks_unchanged: Optional[int] = Field(None, description="Number of chunks reused from the previous ingest")
+    chunks_removed: Optional[int] = Field(None, description="Number of stale chunks deleted from the vector store")
     processing_time: Optional[float] = Field(None, description="Time taken to process in seconds")
     processing_steps: Optional[List[str]] = Field(None, description="Steps completed in the workflow")
     task_id: Optional[str] = Field(None, description="Background task ID if processed asynchronously")
     error: Optional[str] = Field(None, description="Error message, if any")
     timestamp: datetime = Field(default_factory=datetime.now, description="Response timestamp")
 
+class BulkIngestResponse(BaseModel):
+    success: bool = Field(..., description="Indicates if the bulk ingestion was started")
+    message: str = Field(..., description="Status message")
+    task_id: str = Field(..., description="Parent task ID tracking the bulk ingestion")
+    prefix: str = Field(..., description="S3 key prefix being ingested")
+    timestamp: datetime = Field(default_factory=datetime.now, description="Response timestamp")
+
 # Health and Status Models
 class HealthResponse(BaseModel):
     status: str = Field(..., description="Service status")
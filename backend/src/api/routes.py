@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, status, UploadFile, File
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, BackgroundTasks, status, UploadFile, File, Form, Query, Header
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any, Optional, Tuple
 import time
+import json
 import os
 import uuid
-import requests
 import tempfile
 import shutil
 from datetime import datetime
@@ -11,13 +13,19 @@ from pathlib import Path
 
 from src.api.models import (
     QueryRequest, DocumentProcessRequest, QueryResponse, DocumentProcessResponse,
-    HealthResponse, TaskStatusResponse
+    HealthResponse, TaskStatusResponse, BulkIngestRequest, BulkIngestResponse
 )
-from src.workflows.flow_manager import WorkflowManager
+from src.workflows.flow_manager import WorkflowManager, QueryCapacityExceeded
 from src.components.tasks.task_manager import task_manager
+from src.components.tasks.redis_client import InvalidTaskCursor
+from src.components.tasks.task_events import stream_task_events, TaskNotFound
+from src.components.tasks.job_queue import job_queue
+from src.components.tasks.worker import JOB_PROCESS_DOCUMENT, JOB_BULK_INGEST
+from src.components.data_ingestion.upload_spool import upload_spool, SpoolWriter
+from src.components.data_ingestion.bulk_ingestion import bulk_ingestion
 from src.config.aws_config import s3_client
 from src.config.settings import settings
-from src.config.logging import logging
+from src.config.logging import logging, GraphMindException
 
 router = APIRouter()
 workflow_manager = WorkflowManager()
@@ -73,8 +81,14 @@ async def readiness_check():
         raise HTTPException(status_code=503, detail="Service not ready")
 
 @router.post("/documents/upload")
-async def upload_document(file: UploadFile = File(...), background_tasks: BackgroundTasks = BackgroundTasks()):
-    """Upload a document to S3 storage"""
+async def upload_document(file: UploadFile = File(...), background_tasks: BackgroundTasks = BackgroundTasks(),
+                          document_id: Optional[str] = Form(None)):
+    """Upload a document to S3 storage
+    
+    Pass the same ``document_id`` when uploading a revised version of a document
+    so only its changed chunks are re-embedded and the old version's stale
+    chunks are removed. Without one, every upload is a new document.
+    """
     try:
         # Validate file type
         if not file.filename:
@@ -90,32 +104,28 @@ async def upload_document(file: UploadFile = File(...), background_tasks: Backgr
                 detail=f"File type '{file_extension}' not allowed. Allowed types: {settings.ALLOWED_FILE_TYPES}"
             )
         
-        # Check file size
-        file_content = await file.read()
-        if len(file_content) > settings.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File size exceeds maximum limit of {settings.MAX_FILE_SIZE / (1024*1024):.1f}MB"
-            )
-        
-        if len(file_content) == 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File is empty"
-            )
-        
         # Generate unique S3 key
         file_id = str(uuid.uuid4())
         s3_key = f"documents/{file_id}/{file.filename}"
-        
-        # Upload to S3
-        from io import BytesIO
-        file_obj = BytesIO(file_content)
-        s3_url = s3_client.upload_fileobj(
-            file_obj, 
-            s3_key, 
-            content_type=file.content_type or 'application/octet-stream'
-        )
+        document_id = document_id or s3_key
+        
+        # Stream to S3 part by part; the size limit is enforced while reading.
+        # A local copy is staged alongside so this worker can skip the download;
+        # queued jobs run on separate worker hosts, so they have no use for it.
+        spool_writer = upload_spool.open_writer(s3_key) if not _use_job_queue() else None
+        try:
+            s3_url, file_size = await _stream_upload_to_s3(
+                file,
+                s3_key,
+                content_type=file.content_type or 'application/octet-stream',
+                spool_writer=spool_writer
+            )
+        except BaseException:
+            if spool_writer:
+                spool_writer.abort()
+            raise
+        if spool_writer:
+            await run_in_threadpool(spool_writer.commit)
         
         # Generate presigned URL for immediate access
         presigned_url = s3_client.generate_presigned_url(s3_key, expiration=3600)
@@ -126,15 +136,15 @@ async def upload_document(file: UploadFile = File(...), background_tasks: Backgr
             "chunk_size": settings.CHUNK_SIZE,
             "chunk_overlap": settings.CHUNK_OVERLAP,
             "filename": file.filename,
+            "document_id": document_id,
             "auto_processed": True
         }
         
         task_id = task_manager.create_task(task_data)
         
         # Add background processing task
-        background_tasks.add_task(
-            _process_document_background,
-            task_id, s3_key, settings.CHUNK_SIZE, settings.CHUNK_OVERLAP
+        _schedule_document_processing(
+            background_tasks, task_id, s3_key, settings.CHUNK_SIZE, settings.CHUNK_OVERLAP, document_id
         )
         
         return {
@@ -142,10 +152,11 @@ async def upload_document(file: UploadFile = File(...), background_tasks: Backgr
             "message": "File uploaded and processing started automatically",
             "s3_url": s3_url,
             "s3_key": s3_key,
+            "document_id": document_id,
             "presigned_url": presigned_url,
             "filename": file.filename,
             "content_type": file.content_type,
-            "size": len(file_content),
+            "size": file_size,
             "task_id": task_id,
             "processing_status": "started"
         }
@@ -157,11 +168,84 @@ async def upload_document(file: UploadFile = File(...), background_tasks: Backgr
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Upload failed: {str(e)}")
 
+async def _read_upload_part(file: UploadFile, part_size: int, initial: bytes = b"") -> bytes:
+    """Read up to ``part_size`` bytes from the upload after ``initial``, short only at end of file"""
+    buffer = bytearray(initial)
+    while len(buffer) < part_size:
+        data = await file.read(part_size - len(buffer))
+        if not data:
+            break
+        buffer.extend(data)
+    return bytes(buffer)
+
+def _check_upload_size(size: int) -> None:
+    """Reject uploads as soon as they grow past MAX_FILE_SIZE"""
+    if size > settings.MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File size exceeds maximum limit of {settings.MAX_FILE_SIZE / (1024*1024):.1f}MB"
+        )
+
+async def _stream_upload_to_s3(file: UploadFile, s3_key: str, content_type: str,
+                               spool_writer: Optional[SpoolWriter] = None) -> Tuple[str, int]:
+    """Upload an UploadFile to S3 one part at a time.
+    
+    Only a single part is held in memory per upload: the next part is read once
+    the previous one is sent. Files that fit in one part (a one-byte peek past
+    it finds the end of the file) are sent with a single PUT; larger ones use a
+    multipart upload that is aborted if reading, validation or any part upload
+    fails. All S3 calls run in
+    the thread pool so the event loop is never blocked. When ``spool_writer`` is
+    given every part is also written to the local upload spool.
+    
+    Returns:
+        Tuple of (S3 URL, uploaded size in bytes)
+    """
+    # S3 requires every part but the last to be at least 5 MB
+    part_size = max(settings.S3_MULTIPART_CHUNKSIZE, 5 * 1024 * 1024)
+    
+    part = await _read_upload_part(file, part_size)
+    total_size = len(part)
+    _check_upload_size(total_size)
+    if total_size == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File is empty"
+        )
+    
+    peeked = await file.read(1)
+    if not peeked:
+        if spool_writer:
+            await run_in_threadpool(spool_writer.write, part)
+        s3_url = await run_in_threadpool(s3_client.put_object, part, s3_key, content_type)
+        return s3_url, total_size
+    
+    upload_id = await run_in_threadpool(s3_client.create_multipart_upload, s3_key, content_type)
+    try:
+        parts = []
+        part_number = 1
+        while part:
+            if spool_writer:
+                await run_in_threadpool(spool_writer.write, part)
+            parts.append(await run_in_threadpool(s3_client.upload_part, s3_key, upload_id, part_number, part))
+            part = await _read_upload_part(file, part_size, initial=peeked)
+            peeked = b""
+            total_size += len(part)
+            _check_upload_size(total_size)
+            part_number += 1
+        
+        s3_url = await run_in_threadpool(s3_client.complete_multipart_upload, s3_key, upload_id, parts)
+        return s3_url, total_size
+    except BaseException:
+        await run_in_threadpool(s3_client.abort_multipart_upload, s3_key, upload_id)
+        raise
+
 @router.delete("/documents/{s3_key:path}")
 async def delete_document(s3_key: str):
     """Delete a document from S3 storage"""
     try:
         success = s3_client.delete_file(s3_key)
+        upload_spool.discard(s3_key)
         if success:
             return {
                 "success": True,
@@ -209,9 +293,11 @@ async def process_query(request: QueryRequest):
     start_time = time.time()
     
     try:
-        response = workflow_manager.process_query(
+        # Runs the workflow off the event loop so health checks stay responsive
+        response = await workflow_manager.aprocess_query(
             query=request.query,
             file_path=request.file_path,
+            top_k=request.top_k,
         )
         
         processing_time = time.time() - start_time
@@ -231,9 +317,17 @@ async def process_query(request: QueryRequest):
             relevant_chunks=response.get("relevant_chunks"),
             processing_steps=response.get("processing_steps"),
             processing_time=processing_time,
+            cached=response.get("cached", False),
             error=None
         )
         
+    except QueryCapacityExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": "1"})
+    except HTTPException:
+        raise
     except Exception as e:
         processing_time = time.time() - start_time
         raise HTTPException(
@@ -241,7 +335,108 @@ async def process_query(request: QueryRequest):
             detail=f"Query processing failed: {str(e)}")
         
 
-def _process_document_background(task_id: str, s3_key: str, chunk_size: int, chunk_overlap: int):
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get hit rates and sizes of the exact and semantic query caches"""
+    try:
+        return workflow_manager.get_cache_stats()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get cache stats: {str(e)}")
+
+@router.post("/query/stream")
+async def stream_query(request: QueryRequest):
+    """Stream query results as Server-Sent Events while each workflow stage completes."""
+    events = workflow_manager.astream_query(
+        query=request.query,
+        file_path=request.file_path,
+        top_k=request.top_k,
+    )
+    
+    # Pull the first event eagerly so a saturated worker still answers with 429
+    try:
+        first_event = await events.__anext__()
+    except QueryCapacityExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": "1"})
+    
+    async def event_stream():
+        yield _format_sse(first_event)
+        async for event in events:
+            yield _format_sse(event)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Serialize a workflow event as a Server-Sent Events frame"""
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+        
+
+def _download_from_s3(s3_key: str) -> Path:
+    """Download an S3 object into a fresh temp directory and return the file path.
+    
+    The caller owns the returned file and must remove its parent directory.
+    """
+    temp_dir = Path(tempfile.mkdtemp())
+    temp_file_path = temp_dir / s3_key.split('/')[-1]
+    
+    logging.info(f"Downloading S3 file: {s3_key} to {temp_file_path}")
+    try:
+        size = s3_client.download_to_path(s3_key, str(temp_file_path))
+    except Exception:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    
+    logging.info(f"Downloaded {size} bytes to {temp_file_path}")
+    return temp_file_path
+
+def _fetch_document(s3_key: str) -> Path:
+    """Get a local copy of an uploaded document in a fresh temp directory.
+    
+    Uses the upload spool when this worker received the upload itself and falls
+    back to downloading from S3 otherwise. The caller must remove the parent
+    directory of the returned path.
+    """
+    temp_dir = Path(tempfile.mkdtemp())
+    temp_file_path = temp_dir / s3_key.split('/')[-1]
+    if upload_spool.checkout(s3_key, str(temp_file_path)):
+        return temp_file_path
+    
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    return _download_from_s3(s3_key)
+
+def _use_job_queue() -> bool:
+    return settings.INGESTION_EXECUTION_MODE == "queue"
+
+def _schedule_document_processing(background_tasks: BackgroundTasks, task_id: str, s3_key: str,
+                                  chunk_size: int, chunk_overlap: int, document_id: Optional[str] = None):
+    """Hand a document to the ingestion workers, or process it in this process"""
+    if _use_job_queue():
+        job_queue.enqueue(JOB_PROCESS_DOCUMENT, {
+            "task_id": task_id, "s3_key": s3_key, "chunk_size": chunk_size, "chunk_overlap": chunk_overlap,
+            "document_id": document_id
+        })
+    else:
+        background_tasks.add_task(
+            _process_document_background, task_id, s3_key, chunk_size, chunk_overlap, document_id
+        )
+
+def _schedule_bulk_ingestion(background_tasks: BackgroundTasks, task_id: str):
+    """Hand a bulk ingestion to the ingestion workers, or run it in this process"""
+    if _use_job_queue():
+        job_queue.enqueue(JOB_BULK_INGEST, {"task_id": task_id})
+    else:
+        background_tasks.add_task(_run_bulk_ingestion_background, task_id)
+
+def _process_document_background(task_id: str, s3_key: str, chunk_size: int, chunk_overlap: int,
+                                 document_id: Optional[str] = None):
     """Background task for document processing"""
     try:
         # Mark task as started
@@ -250,42 +445,28 @@ def _process_document_background(task_id: str, s3_key: str, chunk_size: int, chu
         # Update progress
         task_manager.update_task_progress(task_id, 10, "Starting document processing...")
         
-        # Download file from S3 to temporary location
+        # Fetch the file to a temporary location
         task_manager.update_task_progress(task_id, 20, "Downloading file from S3...")
         
-        temp_dir = Path(tempfile.mkdtemp())
-        filename = s3_key.split('/')[-1]
-        temp_file_path = temp_dir / filename
-        
-        logging.info(f"Downloading S3 file: {s3_key} to {temp_file_path}")
-        
-        # Get presigned URL and download
-        presigned_url = s3_client.generate_presigned_url(s3_key, expiration=3600)
-        
-        logging.info(f"Generated presigned URL for download")
-        
-        response = requests.get(presigned_url)
-        response.raise_for_status()
+        # Local staged copy when available, else stream straight to disk from S3
+        temp_file_path = _fetch_document(s3_key)
         
-        logging.info(f"Downloaded {len(response.content)} bytes")
-        
-        with open(temp_file_path, 'wb') as f:
-            f.write(response.content)
-        
-        logging.info(f"File saved to {temp_file_path}")
-        
-        task_manager.update_task_progress(task_id, 30, "File downloaded, processing document...")
-        
-        # Process the document
-        result = workflow_manager.process_documents(str(temp_file_path))
+        try:
+            task_manager.update_task_progress(task_id, 30, "File downloaded, processing document...")
+            
+            # Process the document
+            result = workflow_manager.process_documents(
+                str(temp_file_path), document_key=document_id or s3_key,
+                chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            )
+        finally:
+            # Clean up temp file
+            shutil.rmtree(temp_file_path.parent, ignore_errors=True)
         
         # Add S3 key to result
         if result.get("success"):
             result["s3_key"] = s3_key
         
-        # Clean up temp file
-        shutil.rmtree(temp_dir, ignore_errors=True)
-        
         # Mark as completed
         task_manager.mark_task_completed(task_id, result)
         
@@ -311,10 +492,10 @@ async def process_document(request: DocumentProcessRequest, background_tasks_man
             
             task_id = task_manager.create_task(task_data)
             
-            # Add to background tasks
-            background_tasks_manager.add_task(
-                _process_document_background,
-                task_id, request.s3_key, request.chunk_size, request.chunk_overlap
+            # Add to background tasks (or the job queue)
+            _schedule_document_processing(
+                background_tasks_manager, task_id, request.s3_key, request.chunk_size, request.chunk_overlap,
+                request.document_id
             )
             
             processing_time = time.time() - start_time
@@ -332,29 +513,26 @@ async def process_document(request: DocumentProcessRequest, background_tasks_man
             )
         else:
             # Process synchronously - download from S3 first
-            temp_dir = Path(tempfile.mkdtemp())
-            filename = request.s3_key.split('/')[-1]
-            temp_file_path = temp_dir / filename
-            
-            # Download file from S3
-            presigned_url = s3_client.generate_presigned_url(request.s3_key, expiration=3600)
-            
-            response = requests.get(presigned_url)
-            response.raise_for_status()
-            
-            with open(temp_file_path, 'wb') as f:
-                f.write(response.content)
+            # Fetch file (local staged copy or S3) off the event loop
+            temp_file_path = await run_in_threadpool(_fetch_document, request.s3_key)
             
-            # Process the document
-            result = workflow_manager.process_documents(str(temp_file_path))
+            try:
+                # Parsing, embedding and upserts block; keep them off the event loop
+                result = await run_in_threadpool(
+                    workflow_manager.process_documents,
+                    str(temp_file_path),
+                    document_key=request.document_id or request.s3_key,
+                    chunk_size=request.chunk_size,
+                    chunk_overlap=request.chunk_overlap
+                )
+            finally:
+                # Clean up temp file
+                shutil.rmtree(temp_file_path.parent, ignore_errors=True)
             
             # Add S3 key to result
             if result.get("success"):
                 result["s3_key"] = request.s3_key
             
-            # Clean up temp file
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            
             processing_time = time.time() - start_time
             
             if not result["success"]:
@@ -368,6 +546,9 @@ async def process_document(request: DocumentProcessRequest, background_tasks_man
                 document_name=result.get("document_name"),
                 documents_processed=result.get("documents_processed"),
                 chunks_created=result.get("chunks_created"),
+                chunks_added=result.get("chunks_added"),
+                chunks_unchanged=result.get("chunks_unchanged"),
+                chunks_removed=result.get("chunks_removed"),
                 processing_steps=result.get("processing_steps"),
                 processing_time=processing_time,
                 task_id=None,
@@ -380,6 +561,86 @@ async def process_document(request: DocumentProcessRequest, background_tasks_man
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Document processing failed: {str(e)}")
 
+def _run_bulk_ingestion_background(task_id: str):
+    """Background task for bulk ingestion; failures are recorded on the parent task"""
+    try:
+        bulk_ingestion.run(task_id)
+    except Exception as e:
+        # Also covers failures before the run started, e.g. missing state
+        task_manager.mark_task_failed(task_id, str(e))
+        logging.exception(f"Bulk ingestion task {task_id} failed")
+
+@router.post("/documents/bulk", response_model=BulkIngestResponse)
+async def bulk_ingest_documents(request: BulkIngestRequest, background_tasks_manager: BackgroundTasks):
+    """Ingest every document under an S3 prefix as one parent task."""
+    try:
+        task_id = await run_in_threadpool(
+            bulk_ingestion.start, request.prefix, request.chunk_size, request.chunk_overlap, request.workers
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to start bulk ingestion: {str(e)}")
+    
+    _schedule_bulk_ingestion(background_tasks_manager, task_id)
+    
+    return BulkIngestResponse(
+        success=True,
+        message="Bulk ingestion started in background",
+        task_id=task_id,
+        prefix=request.prefix
+    )
+
+@router.post("/documents/bulk/{task_id}/resume", response_model=BulkIngestResponse)
+async def resume_bulk_ingest(task_id: str, background_tasks_manager: BackgroundTasks):
+    """Resume an interrupted bulk ingestion, skipping documents already ingested."""
+    try:
+        config = await run_in_threadpool(bulk_ingestion.prepare_resume, task_id)
+    except GraphMindException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    
+    _schedule_bulk_ingestion(background_tasks_manager, task_id)
+    
+    return BulkIngestResponse(
+        success=True,
+        message="Bulk ingestion resumed in background",
+        task_id=task_id,
+        prefix=config["prefix"]
+    )
+
+@router.get("/documents/bulk/{task_id}")
+async def get_bulk_ingest_status(task_id: str, failed_only: bool = False):
+    """Parent task status and the per-document outcomes of a bulk ingestion."""
+    config = bulk_ingestion.get_config(task_id)
+    if config is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bulk ingestion task {task_id} not found"
+        )
+    
+    documents = bulk_ingestion.get_documents(task_id)
+    if failed_only:
+        documents = {key: outcome for key, outcome in documents.items() if outcome.get("status") == "failed"}
+    
+    return {
+        "task_id": task_id,
+        "prefix": config["prefix"],
+        "task": task_manager.get_task_status(task_id),
+        "documents": documents
+    }
+
+@router.get("/queue/stats")
+async def get_queue_stats():
+    """Get the depth of the ingestion job queue, including dead-lettered jobs"""
+    if not _use_job_queue():
+        return {"mode": settings.INGESTION_EXECUTION_MODE}
+    try:
+        return {"mode": settings.INGESTION_EXECUTION_MODE, "queue": job_queue.name, **job_queue.stats()}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get queue stats: {str(e)}")
+
 @router.get("/tasks/{task_id}", response_model=TaskStatusResponse)
 async def get_task_status(task_id: str):
     """Get status of a background task"""
@@ -401,6 +662,43 @@ async def get_task_status(task_id: str):
         updated_at=task_data.get("updated_at", task_data["created_at"])
     )
 
+@router.get("/tasks/{task_id}/events")
+async def stream_task_status(task_id: str, last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")):
+    """Stream a task's progress as Server-Sent Events until it completes or fails
+    
+    Sends the task as a ``snapshot`` event, then each change as an ``update``
+    event. Clients reconnecting with Last-Event-ID get a new snapshot only if
+    they missed updates.
+    """
+    try:
+        seen = int(last_event_id) if last_event_id else None
+    except ValueError:
+        seen = None
+    events = stream_task_events(task_id, seen)
+    
+    # Pull the first frame eagerly so an unknown task is still answered with 404
+    try:
+        first_frame = await events.__anext__()
+    except TaskNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task {task_id} not found")
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to stream task events: {str(e)}")
+    
+    async def event_stream():
+        yield first_frame
+        async for frame in events:
+            yield frame
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/documents/stats")
 async def get_documents_stats():
     """Get statistics about processed documents"""
@@ -428,15 +726,26 @@ async def get_documents_stats():
         )
 
 @router.get("/tasks")
-async def get_all_tasks():
-    """Get all background tasks"""
+async def get_all_tasks(status_filter: Optional[str] = Query(None, alias="status"), cursor: Optional[str] = None,
+                        limit: int = Query(50, ge=1, le=500)):
+    """List background tasks, most recently updated first
+    
+    Pass the returned ``next_cursor`` as ``cursor`` to get the next page.
+    ``total`` counts every matching task, not just this page.
+    """
     try:
-        tasks = task_manager.get_all_tasks()
+        tasks, next_cursor = task_manager.list_tasks(status=status_filter, cursor=cursor, limit=limit)
         return {
             "success": True,
-            "tasks": tasks,
-            "total": len(tasks)
+            "tasks": {task.get("task_id"): task for task in tasks},
+            "total": task_manager.count_tasks(status_filter),
+            "next_cursor": next_cursor
         }
+    except InvalidTaskCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -471,10 +780,12 @@ async def get_upload_status(task_id: str):
                 detail=f"Upload task {task_id} not found"
             )
         
-        # Get vector store stats to show document count
-        from src.services import get_vector_store
-        vector_store = get_vector_store()
-        stats = vector_store.get_collection_stats()
+        # The document count only changes once the task is done, so Chroma is
+        # not asked on every poll of an unfinished task
+        vector_db_count = None
+        if task_data["status"] == "completed":
+            from src.services import get_vector_store
+            vector_db_count = get_vector_store().get_collection_stats().get("count", 0)
         
         return {
             "task_id": task_id,
@@ -484,7 +795,7 @@ async def get_upload_status(task_id: str):
             "error": task_data.get("error"),
             "created_at": task_data["created_at"],
             "updated_at": task_data.get("updated_at", task_data["created_at"]),
-            "vector_db_count": stats.get("count", 0),
+            "vector_db_count": vector_db_count,
             "ready_for_queries": task_data["status"] == "completed"
         }
         
@@ -0,0 +1,212 @@
+"""
+Bulk ingestion of every document under an S3 prefix.
+
+A bulk run is one parent task in the TaskManager. Its request is kept under
+``bulk:{task_id}:config`` and the outcome of each S3 key under the hash
+``bulk:{task_id}:documents``, both for BULK_INGEST_STATE_TTL. Resuming a run
+replays the same task id and skips every key already recorded as completed, so
+a crash or redeploy only costs the documents that were in flight.
+
+Command line:
+
+    python -m src.components.data_ingestion.bulk_ingestion customers/acme/
+    python -m src.components.data_ingestion.bulk_ingestion --resume <task_id>
+"""
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import json
+import sys
+import threading
+import time
+
+from src.components.data_ingestion.ingestion_pipeline import (
+    DocumentResult, IngestionPipeline, create_s3_ingestion_pipeline, iter_s3_sources
+)
+from src.components.tasks.redis_client import RedisClient, redis_client
+from src.components.tasks.task_manager import TaskManager, task_manager
+from src.config.settings import settings
+from src.config.logging import logging, GraphMindException
+
+# Failed keys listed in the task result; the full list stays in the documents hash
+MAX_REPORTED_FAILURES = 100
+
+
+def _config_key(task_id: str) -> str:
+    return f"bulk:{task_id}:config"
+
+
+def _documents_key(task_id: str) -> str:
+    return f"bulk:{task_id}:documents"
+
+
+class BulkIngestion:
+    """Starts, runs and resumes bulk ingestion tasks."""
+
+    def __init__(self, redis: Optional[RedisClient] = None, tasks: Optional[TaskManager] = None,
+                 pipeline_factory: Optional[Callable[..., IngestionPipeline]] = None,
+                 list_sources: Optional[Callable[[str], Any]] = None) -> None:
+        self.redis = redis or redis_client
+        self.tasks = tasks or task_manager
+        self.pipeline_factory = pipeline_factory or create_s3_ingestion_pipeline
+        self.list_sources = list_sources or iter_s3_sources
+
+    def start(self, prefix: str, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None,
+              workers: Optional[int] = None) -> str:
+        """Create the parent task for a prefix and return its id; call ``run`` to do the work."""
+        config = {
+            "type": "bulk_ingest",
+            "prefix": prefix,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "workers": workers,
+        }
+        task_id = self.tasks.create_task(config)
+        if not self.redis.set_json(_config_key(task_id), config, ttl=settings.BULK_INGEST_STATE_TTL):
+            raise GraphMindException(f"Failed to store bulk ingestion state for task {task_id}")
+        return task_id
+
+    def get_config(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self.redis.get_json(_config_key(task_id))
+
+    def get_documents(self, task_id: str) -> Dict[str, Dict[str, Any]]:
+        """Per-document outcome recorded so far, keyed by S3 key."""
+        return self.redis.get_hash(_documents_key(task_id))
+
+    def prepare_resume(self, task_id: str) -> Dict[str, Any]:
+        """Check a run can be resumed and restore its parent task if it has expired."""
+        config = self.get_config(task_id)
+        if config is None:
+            raise GraphMindException(f"No bulk ingestion state found for task {task_id}")
+        if self.tasks.get_task_status(task_id) is None:
+            self.tasks.create_task(config, task_id=task_id)
+        return config
+
+    def run(self, task_id: str) -> Dict[str, Any]:
+        """Ingest every pending document of the task, recording progress as documents finish."""
+        config = self.get_config(task_id)
+        if config is None:
+            raise GraphMindException(f"No bulk ingestion state found for task {task_id}")
+
+        try:
+            self.tasks.start_task_processing(task_id)
+            done = self.get_documents(task_id)
+            completed = {key for key, outcome in done.items() if outcome.get("status") == "completed"}
+
+            # Listing is cheap next to ingestion; collecting it first gives an exact total
+            sources = list(self.list_sources(config["prefix"]))
+            pending = [key for key in sources if key not in completed]
+            progress = _Progress(self, task_id, total=len(sources), skipped=len(sources) - len(pending))
+            logging.info(
+                f"Bulk ingestion {task_id}: {len(pending)} of {len(sources)} documents "
+                f"under '{config['prefix']}' to ingest"
+            )
+
+            if pending:
+                options: Dict[str, Any] = {
+                    "chunk_size": config.get("chunk_size"),
+                    "chunk_overlap": config.get("chunk_overlap"),
+                }
+                if config.get("workers"):
+                    options["load_workers"] = config["workers"]
+                self.pipeline_factory(**options).run(pending, on_document=progress.record)
+
+            result = progress.summary(config["prefix"])
+            self.tasks.mark_task_completed(task_id, result)
+            return result
+
+        except Exception as e:
+            self.tasks.mark_task_failed(task_id, str(e))
+            logging.exception(f"Bulk ingestion task {task_id} failed")
+            raise
+
+
+class _Progress:
+    """Records document outcomes and throttles parent task updates."""
+
+    def __init__(self, bulk: BulkIngestion, task_id: str, total: int, skipped: int) -> None:
+        self.bulk = bulk
+        self.task_id = task_id
+        self.total = total
+        self.skipped = skipped
+        self.completed = 0
+        self.failed: List[str] = []
+        self._last_update = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, result: DocumentResult) -> None:
+        if result.success:
+            outcome = {"status": "completed", **result.stats}
+        else:
+            outcome = {"status": "failed", "error": result.error}
+        outcome["duration"] = round(result.duration, 3)
+        self.bulk.redis.set_hash_field(
+            _documents_key(self.task_id), result.source, outcome, ttl=settings.BULK_INGEST_STATE_TTL
+        )
+
+        with self._lock:
+            if result.success:
+                self.completed += 1
+            else:
+                self.failed.append(result.source)
+            now = time.time()
+            if now - self._last_update < settings.BULK_INGEST_PROGRESS_INTERVAL:
+                return
+            self._last_update = now
+            counts = self.counts()
+
+        finished = counts["documents_skipped"] + counts["documents_completed"] + counts["documents_failed"]
+        self.bulk.tasks.update_task_progress(
+            self.task_id,
+            round(100 * finished / max(self.total, 1), 1),
+            f"Ingested {finished}/{self.total} documents ({counts['documents_failed']} failed)",
+            **counts
+        )
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "documents_total": self.total,
+            "documents_completed": self.completed,
+            "documents_skipped": self.skipped,
+            "documents_failed": len(self.failed),
+        }
+
+    def summary(self, prefix: str) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "success": not self.failed,
+                "prefix": prefix,
+                **self.counts(),
+                "failed_documents": self.failed[:MAX_REPORTED_FAILURES],
+            }
+
+
+# Singleton instance
+bulk_ingestion = BulkIngestion()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest every document under an S3 prefix.")
+    parser.add_argument("prefix", nargs="?", help="S3 key prefix to ingest")
+    parser.add_argument("--resume", metavar="TASK_ID", help="Resume an interrupted bulk ingestion task")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--chunk-overlap", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Documents downloaded and parsed in parallel")
+    args = parser.parse_args(argv)
+
+    if bool(args.prefix) == bool(args.resume):
+        parser.error("give either a prefix or --resume TASK_ID")
+
+    if args.resume:
+        task_id = args.resume
+        bulk_ingestion.prepare_resume(task_id)
+    else:
+        task_id = bulk_ingestion.start(args.prefix, args.chunk_size, args.chunk_overlap, args.workers)
+    print(f"Bulk ingestion task: {task_id}", file=sys.stderr)
+
+    result = bulk_ingestion.run(task_id)
+    print(json.dumps(result, indent=2))
+    return 0 if result["success"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,13 +6,57 @@ from langchain_community.document_loaders import (
     UnstructuredMarkdownLoader,
 )
 from langchain_core.documents import Document
-from typing import List, Tuple, Dict
+from typing import Any, Iterator, List, Tuple, Dict
 from pathlib import Path
 import os
+import hashlib
+import threading
 from src.config.settings import settings
 from src.config.logging import GraphMindException, logging
 
+# MuPDF is not thread-safe; calls are serialised, but only per page, so
+# concurrent loaders interleave instead of waiting for whole documents
+_PYMUPDF_LOCK = threading.Lock()
+
+
+class PyMuPDFPageLoader:
+    """Loads a PDF with PyMuPDF, yielding one Document per page.
+    
+    The file is opened from disk rather than read into memory, and each page's
+    text is extracted only when the consumer asks for it.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+
+    def lazy_load(self) -> Iterator[Document]:
+        import pymupdf
+
+        with _PYMUPDF_LOCK:
+            pdf = pymupdf.open(self.file_path)
+        try:
+            total_pages = pdf.page_count
+            for page_number in range(total_pages):
+                with _PYMUPDF_LOCK:
+                    text = pdf.load_page(page_number).get_text()
+                yield Document(
+                    page_content=text,
+                    metadata={"source": self.file_path, "page": page_number, "total_pages": total_pages}
+                )
+        finally:
+            with _PYMUPDF_LOCK:
+                pdf.close()
+
+    def load(self) -> List[Document]:
+        return list(self.lazy_load())
+
+
 class DocumentLoader:
+    # Keys _get_file_metadata adds to every page of a file
+    FILE_METADATA_KEYS = (
+        "file_name", "file_path", "file_size", "document_hash", "file_type", "modified_time", "created_time"
+    )
+
     def __init__(self) -> None:
         pass
 
@@ -26,17 +70,7 @@ class DocumentLoader:
             file_metadata = self._get_file_metadata(file_path)
             
             # Load based on file type
-            if file_path.lower().endswith('.pdf'):
-                loader = PyPDFLoader(file_path)
-            elif file_path.lower().endswith('.txt'):
-                loader = TextLoader(file_path, encoding='utf-8')
-            elif file_path.lower().endswith('.docx'):
-                loader = Docx2txtLoader(file_path)
-            elif file_path.lower().endswith('.md'):
-                loader = UnstructuredMarkdownLoader(file_path)
-            else:
-                loader = UnstructuredFileLoader(file_path)
-                
+            loader = self._create_loader(file_path)
             documents = loader.load()
             
             # Add file metadata to each document
@@ -50,6 +84,47 @@ class DocumentLoader:
             logging.error(f"Error loading document {file_path}: {str(e)}")
             raise GraphMindException(f"Error loading document: {e}")
     
+    def lazy_load_documents(self, file_path: str) -> Iterator[Document]:
+        """Yield a document's pages one at a time, with file metadata attached.
+        
+        Only the page being processed is held in memory, so chunks of the first
+        pages can be stored before the rest of a large file is parsed.
+        """
+        try:
+            self._validate_file(file_path)
+            file_metadata = self._get_file_metadata(file_path)
+            
+            page_count = 0
+            for doc in self._create_loader(file_path).lazy_load():
+                doc.metadata.update(file_metadata)
+                page_count += 1
+                yield doc
+            
+            logging.info(f"Loaded {page_count} documents from {file_path}")
+            
+        except GraphMindException:
+            raise
+        except Exception as e:
+            logging.error(f"Error loading document {file_path}: {str(e)}")
+            raise GraphMindException(f"Error loading document: {e}")
+    
+    def _create_loader(self, file_path: str) -> Any:
+        """Pick the loader for a file type; PDFs use PDF_LOADER_BACKEND"""
+        lower_path = file_path.lower()
+        if lower_path.endswith('.pdf'):
+            if settings.PDF_LOADER_BACKEND == "pymupdf":
+                return PyMuPDFPageLoader(file_path)
+            if settings.PDF_LOADER_BACKEND == "pypdf":
+                return PyPDFLoader(file_path)
+            raise GraphMindException(f"Unknown PDF loader backend: {settings.PDF_LOADER_BACKEND}")
+        if lower_path.endswith('.txt'):
+            return TextLoader(file_path, encoding='utf-8')
+        if lower_path.endswith('.docx'):
+            return Docx2txtLoader(file_path)
+        if lower_path.endswith('.md'):
+            return UnstructuredMarkdownLoader(file_path)
+        return UnstructuredFileLoader(file_path)
+    
     def _validate_file(self, file_path: str) -> None:
         """Validate file before processing"""
         if not os.path.exists(file_path):
@@ -63,6 +138,14 @@ class DocumentLoader:
         if file_size > settings.MAX_FILE_SIZE:
             raise GraphMindException(f"File too large: {file_size} bytes (max: {settings.MAX_FILE_SIZE})")
     
+    def _hash_file(self, file_path: str) -> str:
+        """SHA-256 of the file contents, used to derive stable chunk IDs"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
     def _get_file_metadata(self, file_path: str) -> Dict:
         """Extract metadata from file"""
         file_stats = os.stat(file_path)
@@ -72,6 +155,7 @@ class DocumentLoader:
             "file_name": os.path.basename(file_path),
             "file_path": file_path,
             "file_size": file_stats.st_size,
+            "document_hash": self._hash_file(file_path),
             "file_type": file_ext[1:] if file_ext.startswith('.') else file_ext, 
             "modified_time": file_stats.st_mtime,
             "created_time": file_stats.st_ctime
@@ -0,0 +1,411 @@
+"""
+Pipelined bulk ingestion.
+
+Documents flow through independent stages connected by bounded queues:
+
+    fetch + load  ->  chunk + diff  ->  batcher  ->  embed  ->  upsert
+
+Every stage runs its own pool of worker threads, so PDF parsing, embedding and
+network upserts overlap across documents instead of running one after another.
+The bounded queues provide backpressure: a slow stage blocks the stages in
+front of it instead of letting chunks pile up in memory. The batcher packs
+chunks from several documents into upsert-sized batches.
+
+A document is finalised (stale chunks deleted, manifest written) once all of
+its new chunks are upserted; its outcome is reported through ``on_document``.
+Documents sharing a manifest key are planned one at a time, each against the
+manifest the previous one wrote.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, Iterable, List, Optional
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+from langchain_core.documents import Document
+
+from src.components.data_ingestion.doc_loader import DocumentLoader
+from src.components.processing.chunking import create_chunker
+from src.components.processing.chunk_manifest import (
+    ChunkManifestStore, ChunkSyncPlan, finish_document_sync, plan_document_sync
+)
+from src.components.processing.vector_store import VectorStore
+from src.config.settings import settings
+from src.config.logging import logging
+
+# Marks the end of the stream on a queue
+_STOP = object()
+
+
+@dataclass
+class DocumentResult:
+    """Outcome of ingesting one source."""
+
+    source: str
+    document_key: str
+    success: bool
+    stats: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+    duration: float = 0.0
+
+
+@dataclass
+class _DocumentJob:
+    source: str
+    document_key: str
+    started_at: float
+    local_path: Optional[str] = None
+    documents: List[Document] = field(default_factory=list)
+    chunks: Optional[List[Document]] = None
+    plan: Optional[ChunkSyncPlan] = None
+    remaining: int = 0
+    done: bool = False
+    key_lock: Optional[threading.Lock] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class _Stage:
+    """A pool of worker threads reading from one queue and writing to the next.
+
+    ``handle`` returns the items to pass downstream. When every worker has seen
+    the end marker, ``on_close`` may emit final items and the end marker is
+    forwarded once per downstream worker.
+    """
+
+    def __init__(self, name: str, handle: Callable[[Any], Iterable[Any]], workers: int,
+                 inbox: "queue.Queue", outbox: Optional["queue.Queue"], downstream_workers: int,
+                 on_idle: Optional[Callable[[], Iterable[Any]]] = None, idle_timeout: Optional[float] = None,
+                 on_close: Optional[Callable[[], Iterable[Any]]] = None) -> None:
+        self.name = name
+        self.handle = handle
+        self.inbox = inbox
+        self.outbox = outbox
+        self.downstream_workers = downstream_workers
+        self.on_idle = on_idle
+        self.idle_timeout = idle_timeout
+        self.on_close = on_close
+        self._running = max(1, workers)
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._work, name=f"ingest-{name}-{index}", daemon=True)
+            for index in range(self._running)
+        ]
+
+    def start(self) -> None:
+        for thread in self.threads:
+            thread.start()
+
+    def _emit(self, items: Optional[Iterable[Any]]) -> None:
+        if self.outbox is None or items is None:
+            return
+        for item in items:
+            self.outbox.put(item)
+
+    def _work(self) -> None:
+        while True:
+            try:
+                item = self.inbox.get(timeout=self.idle_timeout) if self.on_idle else self.inbox.get()
+            except queue.Empty:
+                self._emit(self.on_idle())  # type: ignore[misc]
+                continue
+            if item is _STOP:
+                break
+            try:
+                self._emit(self.handle(item))
+            except Exception:
+                # Handlers report per-document failures themselves; never kill the stage
+                logging.exception(f"Unexpected error in ingestion stage {self.name}")
+
+        with self._lock:
+            self._running -= 1
+            last = self._running == 0
+        if last:
+            if self.on_close is not None:
+                self._emit(self.on_close())
+            if self.outbox is not None:
+                for _ in range(self.downstream_workers):
+                    self.outbox.put(_STOP)
+
+
+class IngestionPipeline:
+    """Ingests a stream of documents with overlapping load, chunk, embed and upsert stages."""
+
+    def __init__(self, vector_store: VectorStore, manifest_store: ChunkManifestStore,
+                 embedder: Optional[Any] = None,
+                 fetch: Optional[Callable[[str], str]] = None,
+                 cleanup: Optional[Callable[[str], None]] = None,
+                 loader: Optional[DocumentLoader] = None,
+                 parser_pool: Optional[Any] = None,
+                 chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None,
+                 document_key: Optional[Callable[[str], str]] = None,
+                 load_workers: Optional[int] = None, chunk_workers: Optional[int] = None,
+                 embed_workers: Optional[int] = None, upsert_workers: Optional[int] = None,
+                 queue_size: Optional[int] = None, batch_size: Optional[int] = None,
+                 batch_linger: Optional[float] = None) -> None:
+        """
+        Args:
+            vector_store: Store the chunks are upserted into
+            manifest_store: Chunk manifests used to skip unchanged chunks
+            embedder: Optional embedding generator; without one the collection embeds on upsert
+            fetch: Turns a source into a local file path (defaults to treating sources as paths)
+            cleanup: Called with the local path once a source is loaded
+            parser_pool: Optional ParserPool; when given, loading and chunking run in its worker processes
+            document_key: Maps a source to its manifest key (defaults to the source itself,
+                e.g. the full S3 key; file names alone are not unique)
+        """
+        self.vector_store = vector_store
+        self.manifest_store = manifest_store
+        self.embedder = embedder
+        self.fetch = fetch or (lambda source: source)
+        self.cleanup = cleanup
+        self.loader = loader or DocumentLoader()
+        self.parser_pool = parser_pool
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.chunker = create_chunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.document_key = document_key or (lambda source: source)
+        self.load_workers = load_workers or settings.INGESTION_LOAD_WORKERS
+        self.chunk_workers = chunk_workers or settings.INGESTION_CHUNK_WORKERS
+        self.embed_workers = embed_workers or settings.INGESTION_EMBED_WORKERS
+        self.upsert_workers = upsert_workers or settings.INGESTION_UPSERT_WORKERS
+        self.queue_size = queue_size or settings.INGESTION_QUEUE_SIZE
+        self.batch_size = batch_size or settings.INGESTION_BATCH_SIZE
+        self.batch_linger = batch_linger if batch_linger is not None else settings.INGESTION_BATCH_LINGER
+
+    def run(self, sources: Iterable[str],
+            on_document: Optional[Callable[[DocumentResult], None]] = None) -> List[DocumentResult]:
+        """Ingest every source and return one result per source, in completion order."""
+        results: List[DocumentResult] = []
+        results_lock = threading.Lock()
+
+        def report(result: DocumentResult) -> None:
+            with results_lock:
+                results.append(result)
+            if on_document is not None:
+                try:
+                    on_document(result)
+                except Exception as e:
+                    logging.warning(f"Ingestion callback failed for {result.source}: {e}")
+
+        self._report = report
+        self._pending_batch: List[tuple] = []
+        self._batch_lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._key_locks_guard = threading.Lock()
+
+        load_q: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        chunk_q: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        batch_q: "queue.Queue" = queue.Queue(maxsize=self.queue_size * self.batch_size)
+        embed_q: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        upsert_q: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+
+        stages = [
+            _Stage("load", self._load, self.load_workers, load_q, chunk_q, self.chunk_workers),
+            _Stage("chunk", self._chunk, self.chunk_workers, chunk_q, batch_q, 1),
+            _Stage("batch", self._add_to_batch, 1, batch_q, embed_q, self.embed_workers,
+                   on_idle=self._flush_batch, idle_timeout=self.batch_linger, on_close=self._flush_batch),
+            _Stage("embed", self._embed, self.embed_workers, embed_q, upsert_q, self.upsert_workers),
+            _Stage("upsert", self._upsert, self.upsert_workers, upsert_q, None, 0),
+        ]
+        for stage in stages:
+            stage.start()
+
+        started = time.time()
+        count = 0
+        # put() blocks while the loaders are busy, so sources are consumed lazily
+        for source in sources:
+            load_q.put(_DocumentJob(source=source, document_key=self.document_key(source), started_at=time.time()))
+            count += 1
+        for _ in range(self.load_workers):
+            load_q.put(_STOP)
+
+        for stage in stages:
+            for thread in stage.threads:
+                thread.join()
+
+        succeeded = sum(1 for result in results if result.success)
+        logging.info(
+            f"Ingested {succeeded}/{count} documents in {time.time() - started:.1f}s "
+            f"({count - succeeded} failed)"
+        )
+        return results
+
+    # --- Stages ---
+
+    def _load(self, job: _DocumentJob) -> Iterable[_DocumentJob]:
+        try:
+            job.local_path = self.fetch(job.source)
+            try:
+                if self.parser_pool is not None:
+                    parsed = self.parser_pool.parse(job.local_path, self.chunk_size, self.chunk_overlap)
+                    job.chunks = parsed.to_chunks()
+                else:
+                    job.documents, _ = self.loader.load_documents(job.local_path)
+            finally:
+                if self.cleanup is not None:
+                    self.cleanup(job.local_path)
+            return [job]
+        except Exception as e:
+            self._fail([job], e)
+            return []
+
+    def _chunk(self, job: _DocumentJob) -> Iterable[tuple]:
+        try:
+            chunks = job.chunks if job.chunks is not None else self.chunker.chunk_documents(job.documents)
+            job.documents, job.chunks = [], None
+            # Held until the document is finished, so a document with the same key
+            # cannot plan against the manifest this one is about to replace
+            self._acquire_key(job)
+            job.plan = plan_document_sync(self.manifest_store, job.document_key, chunks)
+            job.remaining = len(job.plan.new_chunks)
+            if not job.plan.new_chunks:
+                self._finish(job)
+                return []
+            return [(job, chunk) for chunk in job.plan.new_chunks]
+        except Exception as e:
+            self._fail([job], e)
+            return []
+
+    def _add_to_batch(self, item: tuple) -> Iterable[List[tuple]]:
+        with self._batch_lock:
+            self._pending_batch.append(item)
+            if len(self._pending_batch) < self.batch_size:
+                return []
+            batch, self._pending_batch = self._pending_batch, []
+        return [batch]
+
+    def _flush_batch(self) -> Iterable[List[tuple]]:
+        # Ship partial batches when input pauses so trickling documents are not held back
+        with self._batch_lock:
+            if not self._pending_batch:
+                return []
+            batch, self._pending_batch = self._pending_batch, []
+        return [batch]
+
+    def _embed(self, batch: List[tuple]) -> Iterable[tuple]:
+        batch = [(job, chunk) for job, chunk in batch if not job.done]
+        if not batch:
+            return []
+        if self.embedder is None:
+            return [(batch, None)]
+        try:
+            embeddings = self.embedder.embed_documents([chunk.page_content for _, chunk in batch])
+            return [(batch, embeddings)]
+        except Exception as e:
+            self._fail([job for job, _ in batch], e)
+            return []
+
+    def _upsert(self, item: tuple) -> Iterable[Any]:
+        batch, embeddings = item
+        live = [index for index, (job, _) in enumerate(batch) if not job.done]
+        if not live:
+            return []
+        try:
+            self.vector_store.add_documents(
+                [batch[index][1] for index in live],
+                embeddings=[embeddings[index] for index in live] if embeddings is not None else None
+            )
+        except Exception as e:
+            self._fail([batch[index][0] for index in live], e)
+            return []
+
+        completed: Dict[int, _DocumentJob] = {}
+        for index in live:
+            job = batch[index][0]
+            with job.lock:
+                job.remaining -= 1
+                if job.remaining == 0:
+                    completed[id(job)] = job
+        for job in completed.values():
+            self._finish(job)
+        return []
+
+    # --- Completion ---
+
+    def _acquire_key(self, job: _DocumentJob) -> None:
+        with self._key_locks_guard:
+            key_lock = self._key_locks.setdefault(job.document_key, threading.Lock())
+        key_lock.acquire()
+        job.key_lock = key_lock
+
+    def _release_key(self, job: _DocumentJob) -> None:
+        with job.lock:
+            key_lock, job.key_lock = job.key_lock, None
+        if key_lock is not None:
+            key_lock.release()
+
+    def _finish(self, job: _DocumentJob) -> None:
+        try:
+            assert job.plan is not None
+            stats = finish_document_sync(self.vector_store, self.manifest_store, job.plan)
+        except Exception as e:
+            self._fail([job], e)
+            return
+        with job.lock:
+            if job.done:
+                return
+            job.done = True
+        job.plan = None
+        self._release_key(job)
+        self._report(DocumentResult(
+            source=job.source, document_key=job.document_key, success=True,
+            stats=stats, duration=time.time() - job.started_at
+        ))
+
+    def _fail(self, jobs: Iterable[_DocumentJob], error: Exception) -> None:
+        for job in {id(job): job for job in jobs}.values():
+            with job.lock:
+                if job.done:
+                    continue
+                job.done = True
+            job.plan = None
+            self._release_key(job)
+            logging.error(f"Ingestion failed for {job.source}: {error}")
+            self._report(DocumentResult(
+                source=job.source, document_key=job.document_key, success=False,
+                error=str(error), duration=time.time() - job.started_at
+            ))
+
+
+def iter_s3_sources(prefix: str = "") -> Iterable[str]:
+    """S3 keys under ``prefix`` with an allowed file type, streamed page by page."""
+    from src.config.aws_config import s3_client
+    for key in s3_client.iter_files(prefix):
+        if key.rsplit('.', 1)[-1].lower() in settings.ALLOWED_FILE_TYPES:
+            yield key
+
+
+def fetch_from_s3(s3_key: str) -> str:
+    """Download an S3 object into its own temp directory and return the local path."""
+    from src.config.aws_config import s3_client
+    temp_dir = tempfile.mkdtemp()
+    local_path = os.path.join(temp_dir, s3_key.split('/')[-1])
+    try:
+        s3_client.download_to_path(s3_key, local_path)
+    except Exception:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    return local_path
+
+
+def cleanup_fetched(local_path: str) -> None:
+    """Remove the temp directory created by fetch_from_s3."""
+    shutil.rmtree(os.path.dirname(local_path), ignore_errors=True)
+
+
+def create_s3_ingestion_pipeline(**kwargs: Any) -> IngestionPipeline:
+    """Pipeline wired to the shared vector store and manifests, reading sources from S3."""
+    from src.services import get_vector_store, get_chunk_manifest_store, get_embedding_generator, get_parser_pool
+    if settings.PARSER_EXECUTION_MODE == "process":
+        kwargs.setdefault("parser_pool", get_parser_pool())
+    return IngestionPipeline(
+        vector_store=get_vector_store(),
+        manifest_store=get_chunk_manifest_store(),
+        embedder=get_embedding_generator(),
+        fetch=fetch_from_s3,
+        cleanup=cleanup_fetched,
+        **kwargs
+    )
@@ -0,0 +1,135 @@
+"""
+Out-of-process document parsing.
+
+PDF/DOCX extraction and chunking are CPU-bound and hold the GIL, so running
+them inside the API process slows down request handling. With
+PARSER_EXECUTION_MODE=process they run in a pool of warm worker processes.
+Only a compact payload comes back: the file metadata once, plus each chunk's
+text and the metadata that differs from the file's.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import multiprocessing
+import threading
+
+from langchain_core.documents import Document
+
+from src.config.settings import settings
+from src.config.logging import GraphMindException, logging
+
+
+@dataclass
+class ParsedDocument:
+    """Chunks of one document in a compact, picklable form."""
+
+    page_count: int
+    file_metadata: Dict[str, Any]
+    texts: List[str] = field(default_factory=list)
+    chunk_metadata: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_chunks(self) -> List[Document]:
+        """Rebuild the chunk Documents, identical to chunking in-process."""
+        return [
+            Document(page_content=text, metadata={**self.file_metadata, **metadata})
+            for text, metadata in zip(self.texts, self.chunk_metadata)
+        ]
+
+
+def parse_document(file_path: str, chunk_size: Optional[int] = None,
+                   chunk_overlap: Optional[int] = None, strategy: str = "recursive") -> ParsedDocument:
+    """Load and chunk a document, returning a compact payload (runs in a pool worker)."""
+    from src.components.data_ingestion.doc_loader import DocumentLoader
+    from src.components.processing.chunking import create_chunker
+
+    loader = DocumentLoader()
+    chunker = create_chunker(strategy=strategy, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    parsed = ParsedDocument(page_count=0, file_metadata={})
+    for page in loader.lazy_load_documents(file_path):
+        if not parsed.page_count:
+            parsed.file_metadata = {key: page.metadata[key] for key in DocumentLoader.FILE_METADATA_KEYS}
+        parsed.page_count += 1
+        for chunk in chunker.chunk_documents([page]):
+            parsed.texts.append(chunk.page_content)
+            parsed.chunk_metadata.append({
+                key: value for key, value in chunk.metadata.items() if key not in parsed.file_metadata
+            })
+    return parsed
+
+
+def _warm_worker() -> None:
+    """Import the parsing stack so the first real job does not pay for it."""
+    import src.components.data_ingestion.doc_loader  # noqa: F401
+    import src.components.processing.chunking  # noqa: F401
+    try:
+        import pymupdf  # noqa: F401
+    except ImportError:
+        pass
+
+
+def _ping() -> bool:
+    return True
+
+
+class ParserPool:
+    """A pool of worker processes that load and chunk documents."""
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        self.workers = workers or settings.PARSER_PROCESS_WORKERS
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # Spawn, not fork: the API process has threads and open client connections
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_warm_worker
+                    )
+                    logging.info(f"Started document parser pool with {self.workers} workers")
+        return self._executor
+
+    def warm_up(self) -> None:
+        """Start every worker process now rather than on the first documents."""
+        executor = self._get_executor()
+        for future in [executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def parse(self, file_path: str, chunk_size: Optional[int] = None,
+              chunk_overlap: Optional[int] = None, strategy: str = "recursive") -> ParsedDocument:
+        """Load and chunk a document in a worker process, blocking until it is done."""
+        executor = self._get_executor()
+        try:
+            return executor.submit(parse_document, file_path, chunk_size, chunk_overlap, strategy).result()
+        except BrokenProcessPool as e:
+            # A worker died (e.g. OOM on a pathological file); start fresh for the next job
+            logging.error(f"Document parser pool broke while parsing {file_path}: {e}")
+            self.shutdown(wait=False)
+            raise GraphMindException(f"Document parser worker crashed: {e}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def parse_document_chunks(file_path: str, chunk_size: Optional[int] = None,
+                          chunk_overlap: Optional[int] = None) -> Optional[ParsedDocument]:
+    """Parse through the process pool when PARSER_EXECUTION_MODE is "process".
+
+    Returns None in inline mode, where callers load and chunk in-process.
+    """
+    mode = settings.PARSER_EXECUTION_MODE
+    if mode == "inline":
+        return None
+    if mode != "process":
+        raise GraphMindException(f"Unknown parser execution mode: {mode}")
+
+    from src.services import get_parser_pool
+    return get_parser_pool().parse(file_path, chunk_size, chunk_overlap)
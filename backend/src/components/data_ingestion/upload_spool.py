@@ -0,0 +1,203 @@
+"""
+Local staging spool for uploaded documents.
+
+The worker that receives an upload keeps a copy of the bytes it streamed to S3,
+so its own background task can process the document without downloading it
+again. Files are content-addressed (``<sha256><ext>``) so identical uploads share
+one copy, and the spool is bounded by total size with least-recently-used
+eviction. The key index is process-local: a task that runs on another worker
+simply misses and falls back to S3. Each process spools into its own
+``worker-<pid>`` directory; directories of processes that are gone are removed
+when a spool is first used, so restarts do not accumulate spooled files.
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+
+from src.config.settings import settings
+from src.config.logging import logging
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows; keep its directory
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by another user
+        return True
+    return True
+
+
+class SpoolWriter:
+    """Incrementally writes one upload into the spool while hashing it."""
+
+    def __init__(self, spool: "UploadSpool", s3_key: str, temp_path: Path) -> None:
+        self.spool = spool
+        self.s3_key = s3_key
+        self.temp_path = temp_path
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._file = open(temp_path, 'wb')
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._hash.update(data)
+        self.size += len(data)
+
+    def commit(self) -> None:
+        """Publish the staged file under its content hash and index it by S3 key."""
+        self._file.close()
+        self.spool._commit(self.s3_key, self.temp_path, self._hash.hexdigest(), self.size)
+
+    def abort(self) -> None:
+        """Discard the partially written file."""
+        self._file.close()
+        self.temp_path.unlink(missing_ok=True)
+
+
+class UploadSpool:
+    """Content-addressed, size-bounded local copy of recently uploaded files."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None,
+                 enabled: Optional[bool] = None) -> None:
+        self.enabled = settings.UPLOAD_SPOOL_ENABLED if enabled is None else enabled
+        self.max_bytes = max_bytes if max_bytes is not None else settings.UPLOAD_SPOOL_MAX_BYTES
+        base_dir = directory or settings.UPLOAD_SPOOL_DIR or os.path.join(tempfile.gettempdir(), "graphmind_spool")
+        # One directory per process, since the index that makes files findable is per process
+        self.base_directory = Path(base_dir)
+        self.directory = self.base_directory / f"worker-{os.getpid()}"
+        self._lock = threading.Lock()
+        # s3_key -> content file name; content file name -> size, in LRU order
+        self._keys: Dict[str, str] = {}
+        self._objects: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._prepared = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def open_writer(self, s3_key: str) -> Optional[SpoolWriter]:
+        """Start staging an upload, or return None when the spool is disabled."""
+        if not self.enabled:
+            return None
+        self._prepare()
+        return SpoolWriter(self, s3_key, self.directory / f".incoming-{uuid.uuid4().hex}")
+
+    def checkout(self, s3_key: str, dest_path: str) -> bool:
+        """Place the staged copy of ``s3_key`` at ``dest_path``.
+
+        The file is hardlinked where possible, so the checked-out copy survives
+        eviction and costs no extra disk space. Returns False on a miss.
+        """
+        with self._lock:
+            name = self._keys.get(s3_key)
+            if name is None or name not in self._objects:
+                self._keys.pop(s3_key, None)
+                self.misses += 1
+                return False
+            self._objects.move_to_end(name)
+            source = self.directory / name
+            try:
+                try:
+                    os.link(source, dest_path)
+                except OSError:
+                    # Different filesystem or links unsupported
+                    shutil.copyfile(source, dest_path)
+            except OSError as e:
+                logging.warning(f"Failed to check out spooled upload {s3_key}: {e}")
+                self.misses += 1
+                return False
+            self.hits += 1
+        logging.info(f"Using local staged copy of {s3_key}")
+        return True
+
+    def discard(self, s3_key: str) -> None:
+        """Forget the key; the content file is evicted once no longer recent."""
+        with self._lock:
+            self._keys.pop(s3_key, None)
+
+    def clear(self) -> None:
+        """Remove every staged file."""
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._keys.clear()
+            self._objects.clear()
+            self._total_bytes = 0
+            self._prepared = False
+
+    def stats(self) -> Dict[str, int]:
+        """Get spool usage and hit/miss counters."""
+        return {
+            "files": len(self._objects),
+            "keys": len(self._keys),
+            "total_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    def _prepare(self) -> None:
+        if self._prepared:
+            return
+        with self._lock:
+            if not self._prepared:
+                # Leftovers from a previous process with the same pid are unreachable
+                shutil.rmtree(self.directory, ignore_errors=True)
+                self._remove_stale_directories()
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._prepared = True
+
+    def _remove_stale_directories(self) -> None:
+        """Delete the spools of crashed or restarted workers, whose files nothing can find."""
+        if not self.base_directory.is_dir():
+            return
+        for path in self.base_directory.glob("worker-*"):
+            try:
+                pid = int(path.name[len("worker-"):])
+            except ValueError:
+                continue
+            if pid != os.getpid() and not _pid_alive(pid):
+                logging.info(f"Removing upload spool of exited worker {pid}")
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _commit(self, s3_key: str, temp_path: Path, digest: str, size: int) -> None:
+        name = f"{digest}{Path(s3_key).suffix.lower()}"
+        if size > self.max_bytes:
+            temp_path.unlink(missing_ok=True)
+            return
+        with self._lock:
+            if name in self._objects:
+                temp_path.unlink(missing_ok=True)
+                self._objects.move_to_end(name)
+            else:
+                os.replace(temp_path, self.directory / name)
+                self._objects[name] = size
+                self._total_bytes += size
+            self._keys[s3_key] = name
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used files until the spool fits in max_bytes."""
+        while self._total_bytes > self.max_bytes and self._objects:
+            name, size = self._objects.popitem(last=False)
+            (self.directory / name).unlink(missing_ok=True)
+            self._total_bytes -= size
+            self.evictions += 1
+        live = set(self._objects)
+        for key in [key for key, name in self._keys.items() if name not in live]:
+            del self._keys[key]
+
+
+# Singleton instance
+upload_spool = UploadSpool()
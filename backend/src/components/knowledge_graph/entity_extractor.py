@@ -1,31 +1,26 @@
-from typing import List, Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import List, Dict, Any, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
 import json
 import re
-import hashlib
-from functools import lru_cache
 
 from src.config.settings import settings
 from src.config.logging import GraphMindException, logging
+from src.services import get_llm_client, get_llm_chain, get_extraction_cache
+from .extraction_cache import ExtractionCache, make_cache_key
 
+# Bump whenever the extraction prompt changes so cached results are not reused
+ENTITY_PROMPT_VERSION = "1"
 
 
 class EntityExtractor:
-    def __init__(self) -> None:
-        # Use Gemini for all LLM tasks
-        self.llm = ChatGoogleGenerativeAI(
-            model=settings.LLM_MODEL,
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0,
-            max_retries=5,
-            timeout=settings.LLM_TIMEOUT
-        )
+    def __init__(self, llm: Optional[Any] = None, cache: Optional[ExtractionCache] = None) -> None:
+        # Use the process-wide pooled Gemini client unless one is injected
+        self.llm = llm if llm is not None else get_llm_client(max_retries=5)
         self._setup_prompt()
-        # Cache for storing entity extraction results
-        self._entity_cache: Dict[str, List[Dict[str, Any]]] = {}
+        # Shared cache for entity extraction results (survives across requests)
+        self.cache = cache if cache is not None else get_extraction_cache()
 
     def _setup_prompt(self):
         self.entity_extraction_prompt = ChatPromptTemplate.from_messages([
@@ -52,7 +47,11 @@ class EntityExtractor:
             }}"""),
             ("human", "Extract entities from this text:\n\n{text}")
         ])
-        self.chain = self.entity_extraction_prompt | self.llm | StrOutputParser()
+        self.chain = get_llm_chain(
+            "entity_extraction",
+            self.llm,
+            lambda llm: self.entity_extraction_prompt | llm | StrOutputParser()
+        )
 
     def extract_entities(self, text: str, max_length: int = 4000) -> List[Dict[str, Any]]:
         try:
@@ -62,19 +61,20 @@ class EntityExtractor:
             
             # Check cache first
             cache_key = self._generate_cache_key(text)
-            if cache_key in self._entity_cache:
-                logging.debug(f"Cache hit for entity extraction (key: {cache_key[:10]}...)")
-                return self._entity_cache[cache_key]
+            cached_entities = self.cache.get(cache_key)
+            if cached_entities is not None:
+                logging.debug(f"Cache hit for entity extraction (key: {cache_key[-10:]}...)")
+                return cached_entities
 
             # Extract entities using LLM
-            logging.debug(f"Cache miss for entity extraction, calling LLM (key: {cache_key[:10]}...)")
+            logging.debug(f"Cache miss for entity extraction, calling LLM (key: {cache_key[-10:]}...)")
             response = self.chain.invoke({"text": text})
 
             entity_data = self._parse_json_response(response)
             entities = entity_data.get("entities", [])
             
             # Store in cache
-            self._entity_cache[cache_key] = entities
+            self.cache.set(cache_key, entities)
             logging.info(f"Extracted {len(entities)} entities (cached for future use)")
             
             return entities
@@ -83,10 +83,8 @@ class EntityExtractor:
             raise GraphMindException(f"Error extracting entities: {e}")
 
     def _generate_cache_key(self, text: str) -> str:
-        """Generate a cache key based on text content."""
-        # Create a hash of the text for caching
-        text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
-        return f"entities_{text_hash}"
+        """Generate a cache key based on text content, model and prompt version."""
+        return make_cache_key("entities", text, settings.LLM_MODEL, ENTITY_PROMPT_VERSION)
     
     def _parse_json_response(self, response: str) -> Dict[str, Any]:
         try:
@@ -103,13 +101,10 @@ class EntityExtractor:
     
     def clear_cache(self) -> None:
         """Clear the entity extraction cache."""
-        self._entity_cache.clear()
+        self.cache.clear("entities")
         logging.info("Entity extraction cache cleared")
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        return {
-            "cache_size": len(self._entity_cache),
-            "cached_items": list(self._entity_cache.keys())[:5]  # Show first 5 keys
-        }
+        return self.cache.stats()
 
@@ -0,0 +1,212 @@
+"""
+Shared cache for entity and relationship extraction results.
+
+Entries are keyed by a hash of the extracted content together with the LLM
+model and the prompt version, so a prompt or model change never serves stale
+results. The in-memory tier is a bounded LRU with TTL; the Redis tier lets
+every API worker reuse the same results. The RedisClient fails fast while Redis
+is unreachable, so an outage turns the Redis tier into misses instead of
+delaying extractions.
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+import hashlib
+import threading
+import time
+
+from src.config.settings import settings
+from src.config.logging import GraphMindException, logging
+
+CACHE_KEY_PREFIX = "extraction"
+
+
+def make_cache_key(kind: str, content: str, model: str, prompt_version: str) -> str:
+    """Build a cache key from the content hash, model name and prompt version."""
+    content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    return f"{CACHE_KEY_PREFIX}:{kind}:{model}:{prompt_version}:{content_hash}"
+
+
+class ExtractionCache(ABC):
+    """Interface for extraction result caches."""
+
+    def __init__(self) -> None:
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached result for ``key`` or None."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: List[Dict[str, Any]]) -> None:
+        """Store a result under ``key``."""
+        pass
+
+    @abstractmethod
+    def clear(self, kind: Optional[str] = None) -> None:
+        """Remove cached results, optionally only those of one extraction kind."""
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+    def _record(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+class InMemoryExtractionCache(ExtractionCache):
+    """Process-local LRU cache with TTL and a bounded number of entries."""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[int] = None) -> None:
+        super().__init__()
+        self.max_entries = max_entries or settings.EXTRACTION_CACHE_MAX_ENTRIES
+        self.ttl = ttl if ttl is not None else settings.EXTRACTION_CACHE_TTL
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at and expires_at < time.monotonic():
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+
+        self._record(entry is not None)
+        if entry is None:
+            return None
+        # Hand out copies so callers cannot mutate the cached result
+        return [dict(item) for item in entry[1]]
+
+    def set(self, key: str, value: List[Dict[str, Any]]) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, [dict(item) for item in value])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self, kind: Optional[str] = None) -> None:
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+                return
+            prefix = f"{CACHE_KEY_PREFIX}:{kind}:"
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update({
+            "backend": "memory",
+            "cache_size": len(self._entries),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        })
+        return stats
+
+
+class RedisExtractionCache(ExtractionCache):
+    """Cache tier shared between workers, stored through the RedisClient."""
+
+    def __init__(self, redis_client: Optional[Any] = None, ttl: Optional[int] = None) -> None:
+        super().__init__()
+        if redis_client is None:
+            from src.components.tasks.redis_client import get_redis_client
+            redis_client = get_redis_client()
+        self.redis_client = redis_client
+        self.ttl = ttl if ttl is not None else settings.EXTRACTION_CACHE_TTL
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        value = self.redis_client.get_json(key)
+        self._record(value is not None)
+        return value
+
+    def set(self, key: str, value: List[Dict[str, Any]]) -> None:
+        self.redis_client.set_json(key, value, ttl=self.ttl)
+
+    def clear(self, kind: Optional[str] = None) -> None:
+        prefix = f"{CACHE_KEY_PREFIX}:{kind}:" if kind else f"{CACHE_KEY_PREFIX}:"
+        self.redis_client.delete_by_prefix(prefix)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["backend"] = "redis"
+        return stats
+
+
+class TieredExtractionCache(ExtractionCache):
+    """In-memory LRU in front of the shared Redis tier."""
+
+    def __init__(self, memory: InMemoryExtractionCache, redis: RedisExtractionCache) -> None:
+        super().__init__()
+        self.memory = memory
+        self.redis = redis
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        value = self.memory.get(key)
+        if value is None:
+            value = self.redis.get(key)
+            if value is not None:
+                # Promote shared hits so repeats on this worker stay local
+                self.memory.set(key, value)
+        self._record(value is not None)
+        return value
+
+    def set(self, key: str, value: List[Dict[str, Any]]) -> None:
+        self.memory.set(key, value)
+        self.redis.set(key, value)
+
+    def clear(self, kind: Optional[str] = None) -> None:
+        self.memory.clear(kind)
+        self.redis.clear(kind)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update({
+            "backend": "tiered",
+            "cache_size": self.memory.stats()["cache_size"],
+            "evictions": self.memory.evictions,
+            "memory": self.memory.stats(),
+            "redis": self.redis.stats()
+        })
+        return stats
+
+
+def create_extraction_cache(backend: Optional[str] = None) -> ExtractionCache:
+    """Create the extraction cache configured by EXTRACTION_CACHE_BACKEND.
+    
+    The Redis tier needs REDIS_URL; without it the cache is memory-only.
+    """
+    backend = backend or settings.EXTRACTION_CACHE_BACKEND
+    if backend in ("redis", "tiered") and not settings.REDIS_URL:
+        logging.info("REDIS_URL not set; extraction cache is memory-only")
+        return InMemoryExtractionCache()
+    if backend == "memory":
+        return InMemoryExtractionCache()
+    if backend == "redis":
+        return RedisExtractionCache()
+    if backend == "tiered":
+        return TieredExtractionCache(InMemoryExtractionCache(), RedisExtractionCache())
+    raise GraphMindException(f"Unknown extraction cache backend: {backend}")
@@ -0,0 +1,142 @@
+from typing import List, Dict, Any, Optional, Tuple
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+
+import json
+import re
+
+from src.config.settings import settings
+from src.config.logging import GraphMindException, logging
+from src.services import get_llm_client, get_llm_chain, get_extraction_cache
+from .extraction_cache import ExtractionCache, make_cache_key
+
+# Bump whenever the extraction prompt changes so cached results are not reused
+JOINT_PROMPT_VERSION = "1"
+
+
+class JointExtractor:
+    """Extracts entities and the relationships between them in a single LLM call.
+
+    Halves the round-trips of the two-pass EntityExtractor -> RelationshipExtractor
+    pipeline and sends the text to the model only once. The output has the same
+    shape as the two-pass extractors so KnowledgeGraphBuilder consumes it unchanged.
+    """
+
+    def __init__(self, llm: Optional[Any] = None, cache: Optional[ExtractionCache] = None) -> None:
+        # Use the process-wide pooled Gemini client unless one is injected
+        self.llm = llm if llm is not None else get_llm_client(max_retries=5)
+        self._setup_prompt()
+        # Shared cache for joint extraction results (survives across requests)
+        self.cache = cache if cache is not None else get_extraction_cache()
+
+    def _setup_prompt(self):
+        self.joint_extraction_prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are an expert at building knowledge graphs. Extract all important entities from the text and the relationships between them.
+
+            Entity Types:
+            - PERSON: People, characters, individuals
+            - ORGANIZATION: Companies, institutions, groups
+            - LOCATION: Places, countries, cities
+            - CONCEPT: Ideas, theories, concepts
+            - EVENT: Historical events, occurrences
+            - TECHNOLOGY: Tools, technologies, systems
+
+            Common Relationship Types:
+            - WORKS_FOR, LOCATED_IN, PART_OF, CREATED_BY, USES,
+              STUDIED, DEVELOPED, INFLUENCED_BY, RELATED_TO
+
+            Relationship source and target must be names of extracted entities.
+
+            Return JSON format:
+            {{
+                "entities": [
+                    {{
+                        "name": "entity name",
+                        "type": "ENTITY_TYPE",
+                        "description": "brief description",
+                        "confidence": 0.9
+                    }}
+                ],
+                "relationships": [
+                    {{
+                        "source": "source entity name",
+                        "target": "target entity name",
+                        "type": "RELATIONSHIP_TYPE",
+                        "description": "how they are related",
+                        "confidence": 0.9
+                    }}
+                ]
+            }}"""),
+            ("human", "Extract entities and relationships from this text:\n\n{text}")
+        ])
+        self.chain = get_llm_chain(
+            "joint_extraction",
+            self.llm,
+            lambda llm: self.joint_extraction_prompt | llm | StrOutputParser()
+        )
+
+    def extract(self, text: str, max_length: int = 4000) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        try:
+            # Truncate text if needed
+            if len(text) > max_length:
+                text = text[:max_length] + "...[text truncated]"
+
+            # Check cache first; both halves must be present for a hit
+            entity_key, relationship_key = self._generate_cache_keys(text)
+            cached_entities = self.cache.get(entity_key)
+            cached_relationships = self.cache.get(relationship_key) if cached_entities is not None else None
+            if cached_entities is not None and cached_relationships is not None:
+                logging.debug(f"Cache hit for joint extraction (key: {entity_key[-10:]}...)")
+                return cached_entities, cached_relationships
+
+            logging.debug(f"Cache miss for joint extraction, calling LLM (key: {entity_key[-10:]}...)")
+            response = self.chain.invoke({"text": text})
+
+            graph_data = self._parse_json_response(response)
+            entities = [
+                entity for entity in graph_data.get("entities", [])
+                if isinstance(entity, dict) and entity.get("name") and entity.get("type")
+            ]
+            relationships = [
+                rel for rel in graph_data.get("relationships", [])
+                if isinstance(rel, dict) and rel.get("source") and rel.get("target")
+            ]
+
+            self.cache.set(entity_key, entities)
+            self.cache.set(relationship_key, relationships)
+            logging.info(f"Extracted {len(entities)} entities and {len(relationships)} relationships in one pass")
+
+            return entities, relationships
+        except Exception as e:
+            logging.error(f"Error in joint extraction: {e}")
+            raise GraphMindException(f"Error in joint extraction: {e}")
+
+    def _generate_cache_keys(self, text: str) -> Tuple[str, str]:
+        """Generate cache keys for both halves of the joint result."""
+        return (
+            make_cache_key("joint_entities", text, settings.LLM_MODEL, JOINT_PROMPT_VERSION),
+            make_cache_key("joint_relationships", text, settings.LLM_MODEL, JOINT_PROMPT_VERSION)
+        )
+
+    def _parse_json_response(self, response: str) -> Dict[str, Any]:
+        try:
+            return json.loads(response)
+        except json.JSONDecodeError:
+            json_match = re.search(r'\{.*\}', response, re.DOTALL)
+            if json_match:
+                try:
+                    return json.loads(json_match.group(0))
+                except Exception as inner_e:
+                    logging.error(f"Failed to parse matched JSON: {inner_e}")
+            logging.error(f"Failed to parse JSON from response: {response}")
+            return {"entities": [], "relationships": []}
+
+    def clear_cache(self) -> None:
+        """Clear the joint extraction cache."""
+        self.cache.clear("joint_entities")
+        self.cache.clear("joint_relationships")
+        logging.info("Joint extraction cache cleared")
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return self.cache.stats()
@@ -1,16 +1,43 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.documents import Document
 
+from src.config.settings import settings
 from src.config.logging import GraphMindException, logging
 from .entity_extractor import EntityExtractor
 from .relationship_extractor import RelationshipExtractor
 from .graph_builder import KnowledgeGraphBuilder
+from .joint_extractor import JointExtractor
+
+EXTRACTION_MODES = ("combined", "per_chunk")
+EXTRACTION_STRATEGIES = ("two_pass", "joint")
 
 
 class GraphOrchestrator:
-    def __init__(self) -> None:
-        self.entity_extractor = EntityExtractor()
-        self.relationship_extractor = RelationshipExtractor()
+    def __init__(
+        self,
+        extraction_mode: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        extraction_strategy: Optional[str] = None
+    ) -> None:
+        self.extraction_mode = extraction_mode or settings.KG_EXTRACTION_MODE
+        self.extraction_strategy = extraction_strategy or settings.KG_EXTRACTION_STRATEGY
+        self.max_workers = max_workers or settings.KG_EXTRACTION_MAX_WORKERS
+
+        if self.extraction_mode not in EXTRACTION_MODES:
+            raise GraphMindException(f"Unknown knowledge graph extraction mode: {self.extraction_mode}")
+        if self.extraction_strategy not in EXTRACTION_STRATEGIES:
+            raise GraphMindException(f"Unknown knowledge graph extraction strategy: {self.extraction_strategy}")
+
+        # Only the extractors of the configured strategy are built, with their LLM clients
+        self.entity_extractor: Optional[EntityExtractor] = None
+        self.relationship_extractor: Optional[RelationshipExtractor] = None
+        self.joint_extractor: Optional[JointExtractor] = None
+        if self.extraction_strategy == "joint":
+            self.joint_extractor = JointExtractor()
+        else:
+            self.entity_extractor = EntityExtractor()
+            self.relationship_extractor = RelationshipExtractor()
         self.graph_builder = KnowledgeGraphBuilder()
 
     def build_knowledge_graph(self, documents: List[Document]) -> Dict[str, Any]:
@@ -20,9 +47,11 @@ class GraphOrchestrator:
             if not combined_text.strip():
                 raise GraphMindException("No text content found in Document")
             
-            entities = self.entity_extractor.extract_entities(combined_text)
-
-            relationships = self.relationship_extractor.extract_relationships(combined_text, entities)
+            chunk_texts = [doc.page_content for doc in documents if doc.page_content.strip()]
+            if self.extraction_mode == "per_chunk" and len(chunk_texts) > 1:
+                entities, relationships = self._extract_per_chunk(chunk_texts)
+            else:
+                entities, relationships = self._extract(combined_text)
 
             graph_result = self.graph_builder.build_graph(entities, relationships)
 
@@ -41,16 +70,85 @@ class GraphOrchestrator:
         
         except Exception as e:
             raise GraphMindException(f"Knowledge graph from text failed: {e}")
+
+    def _extract_per_chunk(self, chunk_texts: List[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Map: extract entities and relationships from each chunk concurrently. Reduce: merge them."""
+        max_workers = max(1, min(self.max_workers, len(chunk_texts)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kg-extract") as executor:
+            futures = [executor.submit(self._extract, text) for text in chunk_texts]
+
+        chunk_results = []
+        for index, future in enumerate(futures):
+            try:
+                chunk_results.append(future.result())
+            except Exception as e:
+                # One bad chunk should not sink the whole graph
+                logging.warning(f"Extraction failed for chunk {index + 1}/{len(chunk_texts)}: {e}")
+
+        if not chunk_results:
+            raise GraphMindException("Extraction failed for every chunk")
+
+        logging.info(f"Extracted knowledge graph from {len(chunk_results)}/{len(chunk_texts)} chunks")
+        return self._merge_extractions(chunk_results)
+
+    def _extract(self, text: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Extract entities and relationships from one piece of text with the configured strategy."""
+        if self.joint_extractor is not None:
+            return self.joint_extractor.extract(text)
+
+        assert self.entity_extractor is not None and self.relationship_extractor is not None
+        entities = self.entity_extractor.extract_entities(text)
+
+        relationships = self.relationship_extractor.extract_relationships(text, entities)
+        return entities, relationships
+
+    def _merge_extractions(
+        self, chunk_results: List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Deduplicate entities by name and relationships by (source, target, type), keeping the most confident."""
+        merged_entities: Dict[str, Dict[str, Any]] = {}
+        for entities, _ in chunk_results:
+            for entity in entities:
+                name = str(entity.get("name", "")).strip()
+                if not name:
+                    continue
+                key = name.lower()
+                existing = merged_entities.get(key)
+                if existing is None or entity.get("confidence", 0) > existing.get("confidence", 0):
+                    merged_entities[key] = {**entity, "name": name}
+
+        # Relationships may spell an entity differently from the surviving entity record
+        canonical_names = {key: entity["name"] for key, entity in merged_entities.items()}
+
+        merged_relationships: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        for _, relationships in chunk_results:
+            for rel in relationships:
+                source = canonical_names.get(str(rel.get("source", "")).strip().lower())
+                target = canonical_names.get(str(rel.get("target", "")).strip().lower())
+                if not source or not target:
+                    continue
+                rel_type = str(rel.get("type", "RELATED_TO")).upper()
+                rel_key = (source.lower(), target.lower(), rel_type)
+                existing = merged_relationships.get(rel_key)
+                if existing is None or rel.get("confidence", 0) > existing.get("confidence", 0):
+                    merged_relationships[rel_key] = {**rel, "source": source, "target": target}
+
+        return list(merged_entities.values()), list(merged_relationships.values())
     
     def clear_all_caches(self) -> None:
         """Clear all caches in the knowledge graph pipeline."""
-        self.entity_extractor.clear_cache()
-        self.relationship_extractor.clear_cache()
+        for extractor in (self.entity_extractor, self.relationship_extractor, self.joint_extractor):
+            if extractor is not None:
+                extractor.clear_cache()
         logging.info("All knowledge graph caches cleared")
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics from all components."""
-        return {
-            "entity_extractor": self.entity_extractor.get_cache_stats(),
-            "relationship_extractor": self.relationship_extractor.get_cache_stats()
-        }
+        stats: Dict[str, Any] = {}
+        if self.entity_extractor is not None:
+            stats["entity_extractor"] = self.entity_extractor.get_cache_stats()
+        if self.relationship_extractor is not None:
+            stats["relationship_extractor"] = self.relationship_extractor.get_cache_stats()
+        if self.joint_extractor is not None:
+            stats["joint_extractor"] = self.joint_extractor.get_cache_stats()
+        return stats
@@ -1,28 +1,25 @@
-from typing import List, Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import List, Dict, Any, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
 import json
 import re
-import hashlib
 
 from src.config.settings import settings
 from src.config.logging import GraphMindException, logging
+from src.services import get_llm_client, get_llm_chain, get_extraction_cache
+from .extraction_cache import ExtractionCache, make_cache_key
+
+# Bump whenever the extraction prompt changes so cached results are not reused
+RELATIONSHIP_PROMPT_VERSION = "1"
 
 class RelationshipExtractor:
-    def __init__(self) -> None:
-        # Use Gemini for all LLM tasks
-        self.llm = ChatGoogleGenerativeAI(
-            model=settings.LLM_MODEL,
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0,
-            max_retries=5,
-            timeout=settings.LLM_TIMEOUT
-        )
+    def __init__(self, llm: Optional[Any] = None, cache: Optional[ExtractionCache] = None) -> None:
+        # Use the process-wide pooled Gemini client unless one is injected
+        self.llm = llm if llm is not None else get_llm_client(max_retries=5)
         self._setup_prompt()
-        # Cache for storing relationship extraction results
-        self._relationship_cache: Dict[str, List[Dict[str, Any]]] = {}
+        # Shared cache for relationship extraction results (survives across requests)
+        self.cache = cache if cache is not None else get_extraction_cache()
 
 
     def _setup_prompt(self):
@@ -58,7 +55,11 @@ class RelationshipExtractor:
             
             Text: {text}""")
         ])
-        self.chain = self.relationship_prompt | self.llm | StrOutputParser()
+        self.chain = get_llm_chain(
+            "relationship_extraction",
+            self.llm,
+            lambda llm: self.relationship_prompt | llm | StrOutputParser()
+        )
 
     def extract_relationships(self, text: str, entities: List[Dict[str, Any]], max_length: int = 4000) -> List[Dict[str, Any]]:
         try:
@@ -70,19 +71,20 @@ class RelationshipExtractor:
             
             # Check cache first
             cache_key = self._generate_cache_key(text, entity_str)
-            if cache_key in self._relationship_cache:
-                logging.debug(f"Cache hit for relationship extraction (key: {cache_key[:10]}...)")
-                return self._relationship_cache[cache_key]
+            cached_relationships = self.cache.get(cache_key)
+            if cached_relationships is not None:
+                logging.debug(f"Cache hit for relationship extraction (key: {cache_key[-10:]}...)")
+                return cached_relationships
 
             # Extract relationships using LLM
-            logging.debug(f"Cache miss for relationship extraction, calling LLM (key: {cache_key[:10]}...)")
+            logging.debug(f"Cache miss for relationship extraction, calling LLM (key: {cache_key[-10:]}...)")
             response = self.chain.invoke({"text": text, "entities": entity_str})
 
             relationship_data = self._parse_json_response(response)
             relationships = relationship_data.get("relationships", [])
             
             # Store in cache
-            self._relationship_cache[cache_key] = relationships
+            self.cache.set(cache_key, relationships)
             logging.info(f"Extracted {len(relationships)} relationships (cached for future use)")
             
             return relationships
@@ -91,11 +93,9 @@ class RelationshipExtractor:
             raise GraphMindException(f"Error extracting relationships: {e}")
         
     def _generate_cache_key(self, text: str, entity_str: str) -> str:
-        """Generate a cache key based on text content and entities."""
-        # Create a hash of both text and entities for caching
+        """Generate a cache key based on text content, entities, model and prompt version."""
         combined = f"{text}|{entity_str}"
-        text_hash = hashlib.md5(combined.encode('utf-8')).hexdigest()
-        return f"relationships_{text_hash}"
+        return make_cache_key("relationships", combined, settings.LLM_MODEL, RELATIONSHIP_PROMPT_VERSION)
     
     def _parse_json_response(self, response: str) -> Dict[str, Any]:
         try:
@@ -112,12 +112,9 @@ class RelationshipExtractor:
     
     def clear_cache(self) -> None:
         """Clear the relationship extraction cache."""
-        self._relationship_cache.clear()
+        self.cache.clear("relationships")
         logging.info("Relationship extraction cache cleared")
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        return {
-            "cache_size": len(self._relationship_cache),
-            "cached_items": list(self._relationship_cache.keys())[:5]  # Show first 5 keys
-        }
\ No newline at end of file
+        return self.cache.stats()
\ No newline at end of file
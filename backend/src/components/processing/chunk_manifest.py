@@ -0,0 +1,263 @@
+"""
+Per-document chunk manifests for incremental re-ingestion.
+
+A manifest maps every chunk of a document to the vector ID it was stored
+under. Chunks are keyed by a hash of their content plus an occurrence counter
+(``<sha256>#<n>``), so when a revised document is ingested only chunks whose
+text actually changed are embedded and upserted, and chunks that disappeared
+are deleted from the vector store. Unchanged chunks that moved (or come from a
+revised file) keep their vectors but get their page, offset and document hash
+metadata refreshed, so citations point at the current version.
+
+Manifests are keyed on a caller-supplied document identifier that stays the
+same across re-uploads (the S3 key unless the client passes one).
+"""
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Dict, Any, Optional
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from langchain_core.documents import Document
+
+from src.config.settings import settings
+from src.config.logging import GraphMindException, logging
+from src.components.processing.vector_store import VectorStore, make_chunk_id
+
+MANIFEST_KEY_PREFIX = "chunk_manifest"
+
+
+class _ChunkKeyer:
+    """Assigns content-derived keys to the chunks of one document as they arrive."""
+
+    def __init__(self) -> None:
+        self._seen: Counter = Counter()
+
+    def __call__(self, chunk: Document) -> str:
+        content_hash = hashlib.sha256(chunk.page_content.encode('utf-8')).hexdigest()
+        key = f"{content_hash}#{self._seen[content_hash]}"
+        self._seen[content_hash] += 1
+        return key
+
+
+def chunk_keys(chunks: List[Document]) -> List[str]:
+    """Content-derived keys for the chunks of one document, in order."""
+    keyer = _ChunkKeyer()
+    return [keyer(chunk) for chunk in chunks]
+
+
+class ChunkManifestStore(ABC):
+    """Interface for chunk manifest storage."""
+
+    @abstractmethod
+    def get(self, document_key: str) -> Optional[Dict[str, str]]:
+        """Return the chunk key -> vector ID mapping for a document, or None."""
+        pass
+
+    @abstractmethod
+    def set(self, document_key: str, manifest: Dict[str, str]) -> None:
+        """Store the manifest of a document."""
+        pass
+
+
+class RedisChunkManifestStore(ChunkManifestStore):
+    """Manifests shared between workers, stored through the RedisClient."""
+
+    def __init__(self, redis_client: Optional[Any] = None, ttl: Optional[int] = None) -> None:
+        if redis_client is None:
+            from src.components.tasks.redis_client import get_redis_client
+            redis_client = get_redis_client()
+        self.redis_client = redis_client
+        self.ttl = ttl if ttl is not None else settings.CHUNK_MANIFEST_TTL
+
+    def _key(self, document_key: str) -> str:
+        return f"{MANIFEST_KEY_PREFIX}:{document_key}"
+
+    def get(self, document_key: str) -> Optional[Dict[str, str]]:
+        return self.redis_client.get_json(self._key(document_key))
+
+    def set(self, document_key: str, manifest: Dict[str, str]) -> None:
+        if not self.redis_client.set_json(self._key(document_key), manifest, ttl=self.ttl):
+            logging.warning(f"Could not store chunk manifest for {document_key}; next ingest will be a full upsert")
+
+
+class LocalChunkManifestStore(ChunkManifestStore):
+    """Manifests stored as JSON files, for deployments without Redis."""
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = Path(
+            directory or settings.CHUNK_MANIFEST_DIR or os.path.join(tempfile.gettempdir(), "graphmind_manifests")
+        )
+        self._lock = threading.Lock()
+
+    def _path(self, document_key: str) -> Path:
+        digest = hashlib.sha256(document_key.encode('utf-8')).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, document_key: str) -> Optional[Dict[str, str]]:
+        path = self._path(document_key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable chunk manifest {path}: {e}")
+            return None
+
+    def set(self, document_key: str, manifest: Dict[str, str]) -> None:
+        path = self._path(document_key)
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(".tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            os.replace(temp_path, path)
+
+
+def create_chunk_manifest_store(backend: Optional[str] = None) -> ChunkManifestStore:
+    """Create the manifest store configured by CHUNK_MANIFEST_BACKEND."""
+    backend = backend or settings.CHUNK_MANIFEST_BACKEND
+    if backend == "auto":
+        backend = "redis" if settings.REDIS_URL else "local"
+    if backend == "redis":
+        return RedisChunkManifestStore()
+    if backend == "local":
+        return LocalChunkManifestStore()
+    raise GraphMindException(f"Unknown chunk manifest backend: {backend}")
+
+
+@dataclass
+class ChunkSyncPlan:
+    """What has to change in the vector store to match a document's current chunks."""
+
+    document_key: str
+    manifest: Dict[str, str]
+    new_chunks: List[Document]
+    removed_ids: List[str]
+    unchanged: int = 0
+    added: Optional[int] = None  # Set when new chunks were upserted while streaming
+    # Vector ID -> current metadata of unchanged chunks whose metadata moved
+    refreshed: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "chunks_added": self.added if self.added is not None else len(self.new_chunks),
+            "chunks_unchanged": self.unchanged,
+            "chunks_removed": len(self.removed_ids)
+        }
+
+
+def plan_document_sync(manifest_store: ChunkManifestStore, document_key: str,
+                       chunks: List[Document]) -> ChunkSyncPlan:
+    """Diff a document's chunks against its previous manifest.
+
+    Unchanged chunks keep their existing vector IDs; new or edited chunks get
+    fresh deterministic IDs. Without a previous manifest every chunk is new.
+    """
+    previous = manifest_store.get(document_key) or {}
+
+    manifest: Dict[str, str] = {}
+    new_chunks: List[Document] = []
+    refreshed: Dict[str, Dict[str, Any]] = {}
+    for key, chunk in zip(chunk_keys(chunks), chunks):
+        if key in previous:
+            manifest[key] = previous[key]
+            _track_moved_chunk(refreshed, previous[key], chunk)
+        else:
+            manifest[key] = make_chunk_id(chunk)
+            new_chunks.append(chunk)
+
+    retained_ids = set(manifest.values())
+    removed_ids = sorted({vector_id for vector_id in previous.values() if vector_id not in retained_ids})
+    return ChunkSyncPlan(
+        document_key, manifest, new_chunks, removed_ids,
+        unchanged=len(chunks) - len(new_chunks), refreshed=refreshed
+    )
+
+
+def _track_moved_chunk(refreshed: Dict[str, Dict[str, Any]], vector_id: str, chunk: Document) -> None:
+    """Queue a metadata refresh when an unchanged chunk no longer matches its stored ID."""
+    # The stored ID encodes the document hash, page and offset it was created with
+    if make_chunk_id(chunk) != vector_id:
+        refreshed[vector_id] = dict(chunk.metadata or {})
+
+
+def _refresh_metadata(vector_store: VectorStore, refreshed: Dict[str, Dict[str, Any]]) -> None:
+    if refreshed:
+        vector_store.update_metadata(ids=list(refreshed), metadatas=list(refreshed.values()))
+
+
+def finish_document_sync(vector_store: VectorStore, manifest_store: ChunkManifestStore,
+                         plan: ChunkSyncPlan) -> Dict[str, int]:
+    """Delete removed chunks and record the new manifest once new chunks are upserted."""
+    _refresh_metadata(vector_store, plan.refreshed)
+    # Delete only after the upsert so the document is never missing from search
+    if plan.removed_ids:
+        vector_store.delete_documents(ids=plan.removed_ids)
+    manifest_store.set(plan.document_key, plan.manifest)
+
+    stats = plan.stats
+    logging.info(
+        f"Synced chunks for {plan.document_key}: {stats['chunks_added']} added, "
+        f"{stats['chunks_unchanged']} unchanged, {stats['chunks_removed']} removed"
+    )
+    return stats
+
+
+def sync_document_chunks(vector_store: VectorStore, manifest_store: ChunkManifestStore,
+                         document_key: str, chunks: Iterable[Document],
+                         batch_size: Optional[int] = None) -> Dict[str, int]:
+    """Bring the vector store in line with the current chunks of a document.
+
+    Unchanged chunks keep their existing vectors (with refreshed metadata if
+    they moved), new or edited chunks are upserted (and therefore embedded), and
+    chunks no longer present are deleted. Without a previous manifest every
+    chunk is upserted.
+
+    ``chunks`` may be a lazy iterator: new chunks are upserted every
+    ``batch_size`` chunks while it is consumed, so only one batch is held in
+    memory and the first chunks are searchable before the document is fully parsed.
+
+    Returns:
+        Counts of added, unchanged and removed chunks
+    """
+    batch_size = batch_size or settings.VECTOR_UPSERT_BATCH_SIZE * max(1, settings.VECTOR_UPSERT_CONCURRENCY)
+    previous = manifest_store.get(document_key) or {}
+
+    keyer = _ChunkKeyer()
+    manifest: Dict[str, str] = {}
+    pending: List[Document] = []
+    refreshed: Dict[str, Dict[str, Any]] = {}
+    added = unchanged = 0
+    for chunk in chunks:
+        key = keyer(chunk)
+        if key in previous:
+            manifest[key] = previous[key]
+            unchanged += 1
+            _track_moved_chunk(refreshed, previous[key], chunk)
+            if len(refreshed) >= batch_size:
+                _refresh_metadata(vector_store, refreshed)
+                refreshed = {}
+            continue
+        manifest[key] = make_chunk_id(chunk)
+        pending.append(chunk)
+        added += 1
+        if len(pending) >= batch_size:
+            vector_store.add_documents(pending)
+            pending = []
+    if pending:
+        vector_store.add_documents(pending)
+
+    retained_ids = set(manifest.values())
+    removed_ids = sorted({vector_id for vector_id in previous.values() if vector_id not in retained_ids})
+    plan = ChunkSyncPlan(
+        document_key, manifest, [], removed_ids, unchanged=unchanged, added=added, refreshed=refreshed
+    )
+    return finish_document_sync(vector_store, manifest_store, plan)
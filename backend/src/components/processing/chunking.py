@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import Iterable, Iterator, List, Optional, Dict, Any
 from langchain_text_splitters import (
     RecursiveCharacterTextSplitter, 
     TokenTextSplitter,
@@ -14,32 +14,35 @@ class SplitterFactory(ABC):
     """Abstract Factory interface for creating text splitters."""
 
     @abstractmethod
-    def create_splitter(self):
+    def create_splitter(self, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None):
         pass
 
 
 # --- Concrete Factories ---
 class RecursiveSplitterFactory(SplitterFactory):
-    def create_splitter(self):
+    def create_splitter(self, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None):
         return RecursiveCharacterTextSplitter(
-            chunk_size=settings.CHUNK_SIZE,
-            chunk_overlap=settings.CHUNK_OVERLAP,
+            chunk_size=chunk_size or settings.CHUNK_SIZE,
+            chunk_overlap=chunk_overlap if chunk_overlap is not None else settings.CHUNK_OVERLAP,
             length_function=len,
             separators=["\n\n", "\n", " ", ""],
             is_separator_regex=False,
+            # Chunk offsets make vector IDs deterministic across re-processing
+            add_start_index=True,
         )
 
 
 class TokenSplitterFactory(SplitterFactory):
-    def create_splitter(self):
+    def create_splitter(self, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None):
         if not settings.EMBEDDING_MODEL:
             raise GraphMindException(
                 "Token-based chunking requires EMBEDDING_MODEL to be configured (local tiktoken usage)."
             )
         return TokenTextSplitter(
-            chunk_size=settings.CHUNK_SIZE,
-            chunk_overlap=settings.CHUNK_OVERLAP,
+            chunk_size=chunk_size or settings.CHUNK_SIZE,
+            chunk_overlap=chunk_overlap if chunk_overlap is not None else settings.CHUNK_OVERLAP,
             model_name=settings.EMBEDDING_MODEL,
+            add_start_index=True,
         )
 
 
@@ -48,8 +51,12 @@ class TokenSplitterFactory(SplitterFactory):
 class Chunker:
     """Chunker uses a factory to obtain the appropriate text splitter."""
 
-    def __init__(self, factory: SplitterFactory):
-        self.splitter: Any = factory.create_splitter()
+    def __init__(self, factory: SplitterFactory, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None):
+        size = chunk_size or settings.CHUNK_SIZE
+        overlap = chunk_overlap if chunk_overlap is not None else settings.CHUNK_OVERLAP
+        if overlap >= size:
+            raise GraphMindException(f"chunk_overlap ({overlap}) must be smaller than chunk_size ({size})")
+        self.splitter: Any = factory.create_splitter(chunk_size=size, chunk_overlap=overlap)
 
     def chunk_documents(self, documents: List[Document], **kwargs) -> List[Document]:
         try:
@@ -61,6 +68,19 @@ class Chunker:
             logging.error(f"Error chunking documents: {str(e)}")
             raise GraphMindException(f"Error chunking documents: {e}")
 
+    def chunk_documents_lazy(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """Chunk documents one at a time as they arrive, e.g. pages of a lazily loaded PDF.
+        
+        Yields the same chunks as chunk_documents without holding every page in memory.
+        """
+        for document in documents:
+            try:
+                chunks = self.splitter.split_documents([document])
+            except Exception as e:
+                logging.error(f"Error chunking documents: {str(e)}")
+                raise GraphMindException(f"Error chunking documents: {e}")
+            yield from chunks
+
     def chunk_text(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> List[Document]:
         try:
             if not text or not text.strip():
@@ -75,7 +95,8 @@ class Chunker:
 
 
 # --- Factory Selector / Utility ---
-def create_chunker(strategy: str = "recursive") -> Chunker:
+def create_chunker(strategy: str = "recursive", chunk_size: Optional[int] = None,
+                   chunk_overlap: Optional[int] = None) -> Chunker:
     factories = {
         "recursive": RecursiveSplitterFactory(),
         "token": TokenSplitterFactory(),
@@ -84,6 +105,6 @@ def create_chunker(strategy: str = "recursive") -> Chunker:
     if strategy not in factories:
         raise GraphMindException(f"Unknown chunking strategy: {strategy}")
 
-    return Chunker(factory=factories[strategy])
+    return Chunker(factory=factories[strategy], chunk_size=chunk_size, chunk_overlap=chunk_overlap)
 
 
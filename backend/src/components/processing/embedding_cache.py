@@ -0,0 +1,135 @@
+"""
+Embedding cache for the local EmbeddingGenerator.
+
+Embeddings are keyed by model name, embedding kind (document or query) and a
+hash of the text, so boilerplate that repeats across documents (headers,
+footers, disclaimers) is embedded once. A bounded in-memory LRU sits in front
+of a SQLite store holding float32 vectors, which survives restarts and is
+shared by the workers on a host. The memory tier also holds float32 arrays, so
+an entry costs about the vector's raw size rather than a list of Python floats.
+"""
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Sequence
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+
+import numpy as np
+
+from src.config.settings import settings
+from src.config.logging import logging
+
+
+class EmbeddingCache:
+    """Memory LRU in front of a SQLite store of float32 embeddings."""
+
+    def __init__(self, model_name: str, path: Optional[str] = None, max_memory_entries: Optional[int] = None) -> None:
+        self.model_name = model_name
+        self.path = path or settings.EMBEDDING_CACHE_PATH or os.path.join(
+            tempfile.gettempdir(), "graphmind_embeddings.sqlite"
+        )
+        self.max_memory_entries = max_memory_entries or settings.EMBEDDING_CACHE_MEMORY_ENTRIES
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            # WAL lets several workers read while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    def make_key(self, text: str, kind: str = "document") -> str:
+        text_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return f"{self.model_name}:{kind}:{text_hash}"
+
+    def get_many(self, texts: Sequence[str], kind: str = "document") -> List[Optional[List[float]]]:
+        """Return cached embeddings in input order, None for misses."""
+        keys = [self.make_key(text, kind) for text in texts]
+        results: Dict[str, np.ndarray] = {}
+        # Keys not in memory -> how often they occur in ``keys``
+        missing: Dict[str, int] = {}
+
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    results[key] = vector
+                else:
+                    missing[key] = missing.get(key, 0) + 1
+
+            missing_keys = list(missing)
+            for start in range(0, len(missing_keys), 500):
+                batch = missing_keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    results[key] = vector
+                    self._remember(key, vector)
+
+            missed = sum(missing.values())
+            disk_hits = sum(count for key, count in missing.items() if key in results)
+            self.memory_hits += len(keys) - missed
+            self.disk_hits += disk_hits
+            self.misses += missed - disk_hits
+
+        vectors = {key: vector.tolist() for key, vector in results.items()}
+        return [vectors.get(key) for key in keys]
+
+    def set_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]], kind: str = "document") -> None:
+        """Store embeddings for the given texts."""
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = self.make_key(text, kind)
+                array = np.asarray(vector, dtype=np.float32)
+                self._remember(key, array)
+                rows.append((key, int(array.shape[0]), array.tobytes()))
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)", rows
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                # The memory tier still holds the vectors; persisting is best effort
+                logging.warning(f"Failed to persist {len(rows)} embeddings to {self.path}: {e}")
+
+    def clear(self) -> None:
+        """Remove every cached embedding for this model."""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM embeddings WHERE key LIKE ?", (f"{self.model_name}:%",))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "memory_size": len(self._memory),
+            "max_memory_entries": self.max_memory_entries,
+            "path": self.path
+        }
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        # Caller holds the lock
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
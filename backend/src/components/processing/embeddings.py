@@ -11,12 +11,13 @@ This is only needed for:
 
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.embeddings import Embeddings
-from typing import List, Union
+from typing import List, Union, Optional, Dict, Any
 from src.config.settings import settings
 from src.config.logging import GraphMindException, logging
+from src.components.processing.embedding_cache import EmbeddingCache
 
 class EmbeddingGenerator(Embeddings):
-    def __init__(self) -> None:
+    def __init__(self, cache: Optional[EmbeddingCache] = None) -> None:
         # If Chromadb cloud is enabled or embedding model is not configured,
         # building a local embedding generator is unnecessary and should not run.
         if settings.CHROMA_USE_CLOUD:
@@ -35,13 +36,18 @@ class EmbeddingGenerator(Embeddings):
             }
         )
         logging.info(f"Initialized HuggingFaceEmbeddings with model: {model_name}")
+        
+        # Repeated texts (headers, footers, disclaimers) are only embedded once
+        if cache is None and settings.EMBEDDING_CACHE_ENABLED:
+            cache = EmbeddingCache(model_name)
+        self.cache = cache
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Embed a list of documents."""
+        """Embed a list of documents, computing only those not already cached."""
         try:
             if not texts:
                 return []
-            return self.embedding_model.embed_documents(texts)
+            return self._embed_with_cache(texts, self.embedding_model.embed_documents)
         except Exception as e:
             logging.error(f"Error embedding documents: {str(e)}")
             raise GraphMindException(f"Error embedding documents: {e}")
@@ -51,7 +57,14 @@ class EmbeddingGenerator(Embeddings):
         try:
             if not query:
                 return []
-            return self.embedding_model.embed_query(query)
+            if self.cache is None:
+                return self.embedding_model.embed_query(query)
+            cached = self.cache.get_many([query], kind="query")[0]
+            if cached is not None:
+                return cached
+            embedding = self.embedding_model.embed_query(query)
+            self.cache.set_many([query], [embedding], kind="query")
+            return embedding
         except Exception as e:
             logging.error(f"Error embedding query: {str(e)}")
             raise GraphMindException(f"Error embedding query: {e}")
@@ -92,18 +105,43 @@ class EmbeddingGenerator(Embeddings):
             raise GraphMindException(f"Error in async embed_query: {e}")
 
     def embed_documents_batch(self, texts: List[str], batch_size: int) -> List[List[float]]:
-        """Process embeddings in batches to manage memory usage"""
+        """Process embeddings in batches to manage memory usage.
+        
+        Cached texts are resolved up front so only cache misses are batched and
+        sent to the model.
+        """
         try:
             if batch_size is None:
                 batch_size = settings.EMBEDDING_BATCH_SIZE
-                
-            all_embeddings = []
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-                batch_embeddings = self.embed_documents(batch)
-                all_embeddings.extend(batch_embeddings)
-                logging.info(f"Processed batch {i//batch_size + 1}/{(len(texts)-1)//batch_size + 1}")
-            return all_embeddings
+            
+            def embed_in_batches(pending: List[str]) -> List[List[float]]:
+                embeddings = []
+                for i in range(0, len(pending), batch_size):
+                    batch = pending[i:i + batch_size]
+                    embeddings.extend(self.embedding_model.embed_documents(batch))
+                    logging.info(f"Processed batch {i//batch_size + 1}/{(len(pending)-1)//batch_size + 1}")
+                return embeddings
+            
+            return self._embed_with_cache(texts, embed_in_batches)
         except Exception as e:
             logging.error(f"Error in batch embedding: {str(e)}")
-            raise GraphMindException(f"Error in batch embedding: {e}")
\ No newline at end of file
+            raise GraphMindException(f"Error in batch embedding: {e}")
+    
+    def _embed_with_cache(self, texts: List[str], embed: Any) -> List[List[float]]:
+        """Resolve texts from the cache and embed the distinct misses with ``embed``."""
+        if self.cache is None:
+            return embed(texts)
+        
+        cached = self.cache.get_many(texts)
+        pending = list(dict.fromkeys(text for text, embedding in zip(texts, cached) if embedding is None))
+        by_text: Dict[str, List[float]] = {}
+        if pending:
+            computed = embed(pending)
+            self.cache.set_many(pending, computed)
+            by_text = dict(zip(pending, computed))
+        logging.debug(f"Embedded {len(pending)} of {len(texts)} texts ({len(texts) - len(pending)} served from cache)")
+        return [embedding if embedding is not None else by_text[text] for text, embedding in zip(texts, cached)]
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get embedding cache statistics."""
+        return self.cache.stats() if self.cache is not None else {"enabled": False}
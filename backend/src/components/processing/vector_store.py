@@ -1,4 +1,8 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import time
 import chromadb
 from langchain_core.documents import Document
 from abc import ABC, abstractmethod
@@ -7,10 +11,26 @@ from src.config.settings import settings
 from src.config.logging import GraphMindException, logging
 
 
+def make_chunk_id(document: Document) -> str:
+    """Deterministic vector ID for a chunk.
+    
+    Chunks from the document loader are identified by the source file hash, page
+    and character offset, so re-processing the same file overwrites its vectors
+    instead of duplicating them. Other chunks fall back to a hash of their
+    content and metadata.
+    """
+    metadata = document.metadata or {}
+    document_hash = metadata.get("document_hash")
+    if document_hash and "start_index" in metadata:
+        return f"{document_hash}:{metadata.get('page', 0)}:{metadata['start_index']}"
+    payload = json.dumps({"content": document.page_content, "metadata": metadata}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
 class VectorStore(ABC):
     @abstractmethod
-    def add_documents(self, documents: List[Document]) -> None:
-        """Add documents to the vector store."""
+    def add_documents(self, documents: List[Document], embeddings: Optional[List[List[float]]] = None) -> List[str]:
+        """Upsert documents (optionally with precomputed embeddings) and return their IDs."""
         pass
 
     @abstractmethod
@@ -22,6 +42,16 @@ class VectorStore(ABC):
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the collection."""
         pass
+    
+    @abstractmethod
+    def delete_documents(self, ids: Optional[List[str]] = None, where: Optional[dict] = None) -> None:
+        """Delete documents by ID or metadata filter."""
+        pass
+    
+    @abstractmethod
+    def update_metadata(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Replace the metadata of stored documents without re-embedding them."""
+        pass
 
 
 class ChromaVectorStore(VectorStore):
@@ -29,12 +59,16 @@ class ChromaVectorStore(VectorStore):
     
     client: Optional[Any] = None
     vector_store: Optional[Any] = None
+    collection: Optional[Any] = None
     
     def __init__(self) -> None:
         """Initialize ChromaDB Cloud vector store."""
         self.collection_name = settings.CHROMA_COLLECTION_NAME
         self.client = None
         self.vector_store = None
+        self.collection = None
+        # Called after every successful write so caches can invalidate
+        self._change_listeners: List[Callable[[], None]] = []
         
         if not settings.CHROMA_USE_CLOUD:
             raise GraphMindException("Only ChromaDB Cloud mode is supported in production")
@@ -60,6 +94,8 @@ class ChromaVectorStore(VectorStore):
                 database=settings.CHROMA_DATABASE
             )
             logging.info(f"Connected to ChromaDB Cloud - Tenant: {settings.CHROMA_TENANT}, Database: {settings.CHROMA_DATABASE}")
+            # Resolved once; every direct collection call reuses it
+            self.collection = self.client.get_or_create_collection(self.collection_name)
             
             try:
                 from langchain_chroma import Chroma  # type: ignore
@@ -81,9 +117,28 @@ class ChromaVectorStore(VectorStore):
             # Reset client and vector_store on failure
             self.client = None
             self.vector_store = None
+            self.collection = None
             logging.error(f"Error initializing ChromaDB Cloud: {e}")
             raise GraphMindException(f"Error initializing ChromaDB Cloud: {e}")
 
+    def add_change_listener(self, listener: Callable[[], None]) -> None:
+        """Register a callback run after documents are added or deleted."""
+        self._change_listeners.append(listener)
+    
+    def _notify_change(self) -> None:
+        for listener in self._change_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logging.warning(f"Vector store change listener failed: {e}")
+
+    def _get_collection(self) -> Any:
+        """The Chroma collection, resolved on first use if initialization did not."""
+        assert self.client is not None
+        if self.collection is None:
+            self.collection = self.client.get_or_create_collection(self.collection_name)
+        return self.collection
+
     def _check_client_initialized(self) -> None:
         """Ensure the ChromaDB client is initialized. LangChain wrapper may be optional."""
         if self.client is None:
@@ -91,7 +146,15 @@ class ChromaVectorStore(VectorStore):
             raise GraphMindException("ChromaDB client is not initialized. Please check CHROMA_API_KEY, CHROMA_TENANT and network connectivity.")
     
 
-    def add_documents(self, documents: List[Document]) -> None:
+    def add_documents(self, documents: List[Document], embeddings: Optional[List[List[float]]] = None) -> List[str]:
+        """Upsert documents under deterministic IDs, in batches with retries.
+        
+        Re-adding the same chunks overwrites their vectors rather than duplicating
+        them. Batches of VECTOR_UPSERT_BATCH_SIZE keep requests under the server
+        size limits and up to VECTOR_UPSERT_CONCURRENCY batches are sent at once.
+        When ``embeddings`` are given they are stored as-is instead of letting the
+        collection embed the text.
+        """
         self._check_client_initialized()
         if self.vector_store is None:
             raise GraphMindException(
@@ -100,14 +163,93 @@ class ChromaVectorStore(VectorStore):
         try:
             if not documents:
                 logging.warning("No documents to add")
-                return
-                
-            self.vector_store.add_documents(documents)
-            logging.info(f"Added {len(documents)} documents to ChromaDB (collection: {self.collection_name}).")
+                return []
+            
+            if embeddings is not None and len(embeddings) != len(documents):
+                raise GraphMindException(f"Got {len(embeddings)} embeddings for {len(documents)} documents")
+            
+            # Chroma rejects duplicate IDs within one upsert; the last occurrence wins
+            unique: Dict[str, Document] = {}
+            unique_embeddings: Dict[str, List[float]] = {}
+            for index, document in enumerate(documents):
+                chunk_id = make_chunk_id(document)
+                unique[chunk_id] = document
+                if embeddings is not None:
+                    unique_embeddings[chunk_id] = embeddings[index]
+            ids = list(unique)
+            
+            def batch_embeddings(batch_ids: List[str]) -> Optional[List[List[float]]]:
+                return [unique_embeddings[i] for i in batch_ids] if embeddings is not None else None
+            
+            batch_size = max(1, settings.VECTOR_UPSERT_BATCH_SIZE)
+            batches = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+            concurrency = max(1, min(settings.VECTOR_UPSERT_CONCURRENCY, len(batches)))
+            
+            if concurrency == 1:
+                for batch_ids in batches:
+                    self._upsert_batch([unique[i] for i in batch_ids], batch_ids, batch_embeddings(batch_ids))
+            else:
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    futures = [
+                        executor.submit(
+                            self._upsert_batch, [unique[i] for i in batch_ids], batch_ids, batch_embeddings(batch_ids)
+                        )
+                        for batch_ids in batches
+                    ]
+                    for future in futures:
+                        future.result()
+            
+            logging.info(
+                f"Upserted {len(ids)} documents in {len(batches)} batches to ChromaDB (collection: {self.collection_name})."
+            )
+            self._notify_change()
+            return ids
             
         except Exception as e:
             logging.error(f"Error adding documents to ChromaDB: {e}")
             raise GraphMindException(f"Error adding documents to ChromaDB: {e}")
+    
+    def _upsert_batch(self, documents: List[Document], ids: List[str],
+                      embeddings: Optional[List[List[float]]] = None) -> None:
+        """Upsert one batch, retrying with exponential backoff."""
+        assert self.vector_store is not None and self.client is not None
+        attempts = max(1, settings.VECTOR_UPSERT_MAX_RETRIES + 1)
+        for attempt in range(1, attempts + 1):
+            try:
+                if embeddings is not None:
+                    # Precomputed vectors go straight to the collection
+                    self._upsert_with_embeddings(documents, ids, embeddings)
+                else:
+                    # langchain_chroma upserts when IDs are given
+                    self.vector_store.add_documents(documents, ids=ids)
+                return
+            except Exception as e:
+                if attempt == attempts:
+                    raise
+                delay = settings.VECTOR_UPSERT_RETRY_BACKOFF * (2 ** (attempt - 1))
+                logging.warning(f"Upsert of {len(ids)} documents failed (attempt {attempt}/{attempts}), retrying in {delay:.1f}s: {e}")
+                time.sleep(delay)
+
+    def _upsert_with_embeddings(self, documents: List[Document], ids: List[str],
+                                embeddings: List[List[float]]) -> None:
+        """Upsert precomputed vectors, leaving metadata out for documents that have none."""
+        collection = self._get_collection()
+        # Chroma rejects empty metadata dicts, so documents without metadata go in a separate call
+        with_metadata = [i for i, document in enumerate(documents) if document.metadata]
+        without_metadata = [i for i, document in enumerate(documents) if not document.metadata]
+        if with_metadata:
+            collection.upsert(
+                ids=[ids[i] for i in with_metadata],
+                embeddings=[embeddings[i] for i in with_metadata],
+                documents=[documents[i].page_content for i in with_metadata],
+                metadatas=[documents[i].metadata for i in with_metadata]
+            )
+        if without_metadata:
+            collection.upsert(
+                ids=[ids[i] for i in without_metadata],
+                embeddings=[embeddings[i] for i in without_metadata],
+                documents=[documents[i].page_content for i in without_metadata]
+            )
 
     def query(self, query: str, top_k: int = 5, filter: Optional[dict] = None) -> List[Document]:
         self._check_client_initialized()
@@ -180,10 +322,30 @@ class ChromaVectorStore(VectorStore):
 
             # Persistence is handled automatically in newer versions
             logging.info(f"Deleted documents from ChromaDB (collection: {self.collection_name}).")
+            self._notify_change()
 
         except Exception as e:
             raise GraphMindException(f"Error deleting documents: {e}")
 
+    def update_metadata(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Replace the metadata of stored documents in batches, keeping their vectors."""
+        self._check_client_initialized()
+        assert self.client is not None
+        if not ids:
+            return
+        try:
+            collection = self._get_collection()
+            batch_size = max(1, settings.VECTOR_UPSERT_BATCH_SIZE)
+            for start in range(0, len(ids), batch_size):
+                collection.update(
+                    ids=ids[start:start + batch_size],
+                    metadatas=metadatas[start:start + batch_size]
+                )
+            logging.info(f"Updated metadata of {len(ids)} documents in ChromaDB (collection: {self.collection_name}).")
+            self._notify_change()
+        except Exception as e:
+            raise GraphMindException(f"Error updating document metadata: {e}")
+
     def health_check(self) -> Dict[str, Any]:
         """Check the health of the ChromaDB Cloud vector store."""
         try:
@@ -0,0 +1,306 @@
+"""
+Redis-backed job queue for ingestion work.
+
+Keys, for a queue named ``<name>``:
+
+    queue:<name>:ready       list of job ids waiting to run
+    queue:<name>:processing  list of job ids leased by a worker
+    queue:<name>:deadlines   zset job id -> lease expiry (unix time)
+    queue:<name>:delayed     zset job id -> time a retry becomes ready
+    queue:<name>:dead        list of job ids that used up their attempts
+    queue:<name>:jobs        hash job id -> JSON job record
+    queue:<name>:orphans     zset job id -> when it was first seen processing without a lease
+
+``reserve`` atomically moves a job from ready to processing (BLMOVE), so a job
+is never lost between the pop and the worker picking it up. A worker must
+``ack`` or ``fail`` the job before its lease expires, extending it with
+``touch`` for long jobs; otherwise ``reap`` hands the job to another worker.
+The lease is written just after the move; a job whose worker died in between
+stays processing without a lease, and ``reap`` requeues it once it has been
+seen that way for a visibility timeout.
+Failed jobs are retried with exponential backoff and dead-lettered after
+``max_attempts``.
+"""
+from dataclasses import dataclass, asdict, field
+from typing import Any, Callable, Dict, List, Optional
+import json
+import time
+import uuid
+
+import redis
+
+from src.config.settings import settings
+from src.config.logging import GraphMindException, logging
+
+
+@dataclass
+class Job:
+    """A unit of queued work and its delivery bookkeeping."""
+
+    id: str
+    type: str
+    payload: Dict[str, Any]
+    attempts: int = 0
+    max_attempts: int = 3
+    enqueued_at: float = field(default_factory=time.time)
+    last_error: Optional[str] = None
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, data: str) -> "Job":
+        return cls(**json.loads(data))
+
+
+class JobQueue:
+    """Reliable queue with visibility timeouts, retries and a dead-letter list."""
+
+    # Ids moved per reap or promote pass
+    SWEEP_BATCH = 100
+
+    def __init__(self, name: Optional[str] = None, connection: Optional[redis.Redis] = None,
+                 visibility_timeout: Optional[float] = None, max_attempts: Optional[int] = None,
+                 retry_backoff: Optional[float] = None, retry_backoff_max: Optional[float] = None,
+                 on_dead_letter: Optional[Callable[[Job], None]] = None) -> None:
+        """
+        Args:
+            name: Queue name, used as the key namespace
+            connection: Redis connection (decode_responses=True); defaults to the shared RedisClient's
+            visibility_timeout: Seconds a reserved job stays leased before it is handed out again
+            max_attempts: Deliveries before a job is dead-lettered
+            retry_backoff: Delay before the first retry; doubles on every further attempt
+            retry_backoff_max: Upper bound on the retry delay
+            on_dead_letter: Called when ``reserve`` dead-letters a job whose leases kept expiring
+        """
+        self.name = name or settings.JOB_QUEUE_NAME
+        self._connection = connection
+        self.visibility_timeout = visibility_timeout or settings.JOB_VISIBILITY_TIMEOUT
+        self.max_attempts = max_attempts or settings.JOB_MAX_ATTEMPTS
+        self.retry_backoff = retry_backoff if retry_backoff is not None else settings.JOB_RETRY_BACKOFF
+        self.retry_backoff_max = retry_backoff_max or settings.JOB_RETRY_BACKOFF_MAX
+        self.on_dead_letter = on_dead_letter
+
+        prefix = f"queue:{self.name}"
+        self.ready_key = f"{prefix}:ready"
+        self.processing_key = f"{prefix}:processing"
+        self.deadlines_key = f"{prefix}:deadlines"
+        self.delayed_key = f"{prefix}:delayed"
+        self.dead_key = f"{prefix}:dead"
+        self.jobs_key = f"{prefix}:jobs"
+        self.orphans_key = f"{prefix}:orphans"
+
+    @property
+    def redis(self) -> redis.Redis:
+        if self._connection is None:
+            from src.components.tasks.redis_client import redis_client
+            if not redis_client._ensure_connection() or redis_client.redis_client is None:
+                raise GraphMindException("Redis unavailable, cannot use the job queue")
+            self._connection = redis_client.redis_client
+        return self._connection
+
+    # --- Producer ---
+
+    def enqueue(self, job_type: str, payload: Dict[str, Any], max_attempts: Optional[int] = None) -> str:
+        """Queue a job and return its id."""
+        job = Job(id=str(uuid.uuid4()), type=job_type, payload=payload,
+                  max_attempts=max_attempts or self.max_attempts)
+        pipe = self.redis.pipeline()
+        pipe.hset(self.jobs_key, job.id, job.to_json())
+        pipe.lpush(self.ready_key, job.id)
+        pipe.execute()
+        logging.info(f"Enqueued {job_type} job {job.id} on {self.name}")
+        return job.id
+
+    # --- Consumer ---
+
+    def reserve(self, timeout: float = 2.0) -> Optional[Job]:
+        """Lease the next ready job, waiting up to ``timeout`` seconds for one.
+
+        Keep ``timeout`` below the connection's socket timeout.
+        """
+        self.promote_due()
+        self.reap()
+
+        while True:
+            job_id = self.redis.blmove(self.ready_key, self.processing_key, timeout, "RIGHT", "LEFT")
+            if job_id is None:
+                return None
+
+            data = self.redis.hget(self.jobs_key, job_id)
+            if data is None:
+                # Acked by a worker whose lease had already expired; nothing left to run
+                self._release(job_id)
+                continue
+
+            job = Job.from_json(data)  # type: ignore[arg-type]
+            if job.attempts >= job.max_attempts:
+                # Its leases kept expiring, e.g. the job crashes the worker every time
+                job.last_error = job.last_error or "Lease expired on every attempt"
+                pipe = self.redis.pipeline()
+                pipe.lrem(self.processing_key, 1, job.id)
+                pipe.zrem(self.deadlines_key, job.id)
+                pipe.hset(self.jobs_key, job.id, job.to_json())
+                pipe.lpush(self.dead_key, job.id)
+                pipe.execute()
+                logging.error(f"Job {job.id} dead-lettered after {job.attempts} expired attempts")
+                if self.on_dead_letter is not None:
+                    self.on_dead_letter(job)
+                continue
+
+            job.attempts += 1
+            pipe = self.redis.pipeline()
+            pipe.zadd(self.deadlines_key, {job.id: time.time() + self.visibility_timeout})
+            pipe.hset(self.jobs_key, job.id, job.to_json())
+            pipe.execute()
+            return job
+
+    def touch(self, job: Job) -> None:
+        """Extend the lease of a job that is still being worked on."""
+        self.redis.zadd(self.deadlines_key, {job.id: time.time() + self.visibility_timeout}, xx=True)
+
+    def ack(self, job: Job) -> None:
+        """Remove a finished job from the queue."""
+        pipe = self.redis.pipeline()
+        pipe.lrem(self.processing_key, 1, job.id)
+        pipe.zrem(self.deadlines_key, job.id)
+        pipe.hdel(self.jobs_key, job.id)
+        pipe.execute()
+
+    def fail(self, job: Job, error: str) -> bool:
+        """Record a failed attempt; retry later or dead-letter.
+
+        Returns:
+            True if the job will be retried, False if it was dead-lettered
+        """
+        job.last_error = error
+        retry = job.attempts < job.max_attempts
+        pipe = self.redis.pipeline()
+        pipe.lrem(self.processing_key, 1, job.id)
+        pipe.zrem(self.deadlines_key, job.id)
+        pipe.hset(self.jobs_key, job.id, job.to_json())
+        if retry:
+            pipe.zadd(self.delayed_key, {job.id: time.time() + self.backoff(job.attempts)})
+        else:
+            pipe.lpush(self.dead_key, job.id)
+        pipe.execute()
+
+        if retry:
+            logging.warning(f"Job {job.id} failed (attempt {job.attempts}/{job.max_attempts}), retrying: {error}")
+        else:
+            logging.error(f"Job {job.id} dead-lettered after {job.attempts} attempts: {error}")
+        return retry
+
+    def backoff(self, attempts: int) -> float:
+        return min(self.retry_backoff * (2 ** max(attempts - 1, 0)), self.retry_backoff_max)
+
+    # --- Housekeeping ---
+
+    def promote_due(self) -> int:
+        """Move retries whose backoff has elapsed back onto the ready list."""
+        return self._move_due(self.delayed_key, self.ready_key)
+
+    def reap(self) -> int:
+        """Requeue jobs whose lease expired, i.e. whose worker died or stalled."""
+        expired = self._move_due(self.deadlines_key, self.ready_key, remove_from=self.processing_key)
+        if expired:
+            logging.warning(f"Requeued {expired} jobs with expired leases on {self.name}")
+        orphaned = self._requeue_orphans()
+        if orphaned:
+            logging.warning(f"Requeued {orphaned} jobs that were never leased on {self.name}")
+        return expired + orphaned
+
+    def _requeue_orphans(self) -> int:
+        # A processing job without a deadline is normally between BLMOVE and the
+        # lease write of a live reserve; only after a visibility timeout is its
+        # worker known to have died there
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(self.processing_key, self.deadlines_key, self.orphans_key)
+                processing = pipe.lrange(self.processing_key, 0, -1)
+                leases = pipe.zmscore(self.deadlines_key, processing) if processing else []
+                unleased = {job_id for job_id, lease in zip(processing, leases) if lease is None}  # type: ignore[arg-type]
+                seen = dict(pipe.zrange(self.orphans_key, 0, -1, withscores=True))  # type: ignore[arg-type]
+
+                now = time.time()
+                due = [job_id for job_id in unleased if job_id in seen and seen[job_id] <= now - self.visibility_timeout]
+                new = [job_id for job_id in unleased if job_id not in seen]
+                settled = [job_id for job_id in seen if job_id not in unleased]
+                if not (due or new or settled):
+                    return 0
+
+                pipe.multi()
+                if due or settled:
+                    pipe.zrem(self.orphans_key, *due, *settled)
+                if new:
+                    pipe.zadd(self.orphans_key, {job_id: now for job_id in new})
+                for job_id in due:
+                    pipe.lrem(self.processing_key, 1, job_id)
+                if due:
+                    pipe.lpush(self.ready_key, *due)
+                pipe.execute()
+                return len(due)
+            except redis.WatchError:
+                return 0
+
+    def _move_due(self, schedule_key: str, target_key: str, remove_from: Optional[str] = None) -> int:
+        # WATCH makes the move atomic across competing workers: if another worker
+        # touches the schedule meanwhile, this pass is abandoned and retried next time
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(schedule_key)
+                due = pipe.zrangebyscore(schedule_key, "-inf", time.time(), start=0, num=self.SWEEP_BATCH)
+                if not due:
+                    return 0
+                pipe.multi()
+                pipe.zrem(schedule_key, *due)
+                if remove_from is not None:
+                    for job_id in due:
+                        pipe.lrem(remove_from, 1, job_id)
+                pipe.lpush(target_key, *due)
+                pipe.execute()
+                return len(due)
+            except redis.WatchError:
+                return 0
+
+    def _release(self, job_id: str) -> None:
+        pipe = self.redis.pipeline()
+        pipe.lrem(self.processing_key, 1, job_id)
+        pipe.zrem(self.deadlines_key, job_id)
+        pipe.execute()
+
+    # --- Inspection ---
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        data = self.redis.hget(self.jobs_key, job_id)
+        return Job.from_json(data) if data else None  # type: ignore[arg-type]
+
+    def dead_letters(self, limit: int = 100) -> List[Job]:
+        job_ids = self.redis.lrange(self.dead_key, 0, limit - 1)
+        records = self.redis.hmget(self.jobs_key, job_ids) if job_ids else []  # type: ignore[arg-type]
+        return [Job.from_json(data) for data in records if data]  # type: ignore[union-attr]
+
+    def requeue_dead(self, job_id: str) -> bool:
+        """Give a dead-lettered job a fresh set of attempts."""
+        job = self.get_job(job_id)
+        if job is None or not self.redis.lrem(self.dead_key, 1, job_id):
+            return False
+        job.attempts = 0
+        pipe = self.redis.pipeline()
+        pipe.hset(self.jobs_key, job.id, job.to_json())
+        pipe.lpush(self.ready_key, job.id)
+        pipe.execute()
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        pipe = self.redis.pipeline()
+        pipe.llen(self.ready_key)
+        pipe.llen(self.processing_key)
+        pipe.zcard(self.delayed_key)
+        pipe.llen(self.dead_key)
+        ready, processing, delayed, dead = pipe.execute()
+        return {"ready": ready, "processing": processing, "delayed": delayed, "dead": dead}
+
+
+# Singleton instance; connects to Redis on first use
+job_queue = JobQueue()
@@ -1,10 +1,88 @@
 import redis
 import json
+import math
+import threading
 import time
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
 from src.config.settings import settings
-from src.config.logging import logging
+from src.config.logging import GraphMindException, logging
+
+# Task ids are indexed in sorted sets scored by the time of their last write:
+# one over all tasks and one per status. Index entries do not expire with their
+# task; readers drop entries whose task is gone and prune_task_index trims the rest.
+TASK_INDEX_KEY = "tasks:index:all"
+TASK_STATUS_INDEX_PREFIX = "tasks:index:status:"
+TASK_STATUSES = ("pending", "processing", "completed", "failed")
+
+# Every write to a task bumps its ``event_seq`` field and publishes the written
+# fields, tagged with the new sequence number, on the task's events channel.
+TASK_EVENTS_CHANNEL_PREFIX = "tasks:events:"
+
+# Atomically update fields of a task hash without touching its TTL, move it to
+# its new status index and publish the update. Publishing from the script keeps
+# events in sequence order.
+# KEYS[1]: task key
+# KEYS[2]: index of all tasks
+# KEYS[3]: index of the new status
+# KEYS[4..]: indexes of the other statuses
+# ARGV[1]: new TTL in seconds, or 0 to keep the current one
+# ARGV[2]: "1" to skip the update if the task already completed or failed
+# ARGV[3]: task id
+# ARGV[4]: index score (unix time of the update)
+# ARGV[5]: events channel
+# ARGV[6]: the updated fields as a JSON object, published with the sequence number
+# ARGV[7..]: field, JSON value, field, JSON value, ...
+# Returns the new event sequence number if updated, 0 if the task is missing or
+# finished, -1 for a legacy JSON string task
+UPDATE_TASK_SCRIPT = """
+local kind = redis.call('TYPE', KEYS[1])
+kind = type(kind) == 'table' and kind.ok or kind
+if kind == 'none' then return 0 end
+if kind ~= 'hash' then return -1 end
+if ARGV[2] == '1' then
+    local status = redis.call('HGET', KEYS[1], 'status')
+    if status == '"completed"' or status == '"failed"' then return 0 end
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 7))
+local seq = redis.call('HINCRBY', KEYS[1], 'event_seq', 1)
+local ttl = tonumber(ARGV[1])
+if ttl > 0 then redis.call('EXPIRE', KEYS[1], ttl) end
+redis.call('ZADD', KEYS[2], ARGV[4], ARGV[3])
+redis.call('ZADD', KEYS[3], ARGV[4], ARGV[3])
+for i = 4, #KEYS do redis.call('ZREM', KEYS[i], ARGV[3]) end
+redis.call('PUBLISH', ARGV[5], '{"seq": ' .. seq .. ', ' .. string.sub(ARGV[6], 2))
+return seq
+"""
+
+
+class InvalidTaskCursor(GraphMindException):
+    """The cursor passed to list_tasks was not issued by list_tasks."""
+
+
+def _parse_task_cursor(cursor: str) -> Tuple[float, str]:
+    """Split a list_tasks cursor into the score and id of the last task returned."""
+    score, separator, last_id = cursor.partition(":")
+    try:
+        last_score = float(score)
+    except ValueError:
+        last_score = math.nan
+    if not separator or not last_id or not math.isfinite(last_score):
+        raise InvalidTaskCursor(f"Invalid task cursor: {cursor!r}")
+    return last_score, last_id
+
+
+def _status_index_key(status: str) -> str:
+    return f"{TASK_STATUS_INDEX_PREFIX}{status}"
+
+
+def task_events_channel(task_id: str) -> str:
+    return f"{TASK_EVENTS_CHANNEL_PREFIX}{task_id}"
+
+
+def _status_index_keys(status: str) -> List[str]:
+    """The index of ``status`` followed by the indexes the task must leave."""
+    return [_status_index_key(status)] + [_status_index_key(other) for other in TASK_STATUSES if other != status]
 
 
 class RedisClient:
@@ -12,7 +90,14 @@ class RedisClient:
 
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
+        self._update_task_script: Optional[Any] = None
+        self._update_task_script_connection: Optional[redis.Redis] = None
+        # Until this time calls fail fast instead of reaching Redis (circuit open)
+        self._skip_until = 0.0
+        self._reconnect_lock = threading.Lock()
         self._connect()
+        if self.redis_client is None and getattr(settings, "REDIS_URL", None):
+            self._open_circuit()
 
     def _connect(self, retries: int = 5, delay: float = 1.0):
         """Initialize Redis connection with retry logic and error handling."""
@@ -50,13 +135,47 @@ class RedisClient:
         self.redis_client = None
 
     def _ensure_connection(self) -> bool:
-        """Ensure Redis connection is available."""
-        if self.redis_client is None:
-            self._connect()
-        return self.redis_client is not None
+        """Ensure Redis connection is available.
+        
+        While Redis is unreachable callers fail fast: for REDIS_RETRY_INTERVAL
+        every call returns False at once, then one caller makes a single
+        connection attempt while the others keep failing fast.
+        """
+        if time.monotonic() < self._skip_until:
+            return False
+        if self.redis_client is not None:
+            return True
+        if not self._reconnect_lock.acquire(blocking=False):
+            return False
+        try:
+            self._connect(retries=1, delay=0)
+            if self.redis_client is None:
+                self._open_circuit()
+                return False
+            return True
+        finally:
+            self._reconnect_lock.release()
+
+    def _open_circuit(self) -> None:
+        self._skip_until = time.monotonic() + settings.REDIS_RETRY_INTERVAL
+        logging.warning(f"Redis unavailable; failing Redis calls fast for {settings.REDIS_RETRY_INTERVAL}s")
+
+    def _on_error(self, e: Exception) -> None:
+        """Open the circuit when an operation shows Redis is unreachable."""
+        if isinstance(e, (redis.ConnectionError, redis.TimeoutError)):
+            self._open_circuit()
+
+    @staticmethod
+    def _encode_fields(data: Dict[str, Any]) -> Dict[str, str]:
+        """Encode each task field as JSON so nested values round-trip through a hash."""
+        return {field: json.dumps(value, default=str) for field, value in data.items()}
+
+    @staticmethod
+    def _decode_fields(data: Dict[str, str]) -> Dict[str, Any]:
+        return {field: json.loads(value) for field, value in data.items()}
 
     def set_task(self, task_id: str, task_data: Dict[str, Any], ttl: int = 3600) -> bool:
-        """Store task data in Redis with TTL."""
+        """Store task data in Redis as a hash with TTL."""
         if not self._ensure_connection() or self.redis_client is None:
             logging.warning("Redis unavailable, cannot store task.")
             return False
@@ -64,16 +183,31 @@ class RedisClient:
         try:
             task_data_copy = task_data.copy()
             task_data_copy["updated_at"] = datetime.utcnow().isoformat()
+            task_data_copy["event_seq"] = 1
             key = f"task:{task_id}"
 
-            result = self.redis_client.setex(key, ttl, json.dumps(task_data_copy, default=str))
-            if result:
-                logging.info(f"Stored task {task_id} in Redis.")
-            return bool(result)
+            pipe = self.redis_client.pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=self._encode_fields(task_data_copy))  # type: ignore[arg-type]
+            pipe.expire(key, ttl)
+            self._index_task(pipe, task_id, task_data_copy.get("status", "pending"), time.time())
+            pipe.publish(task_events_channel(task_id), json.dumps({"seq": 1, **task_data_copy}, default=str))
+            pipe.execute()
+            logging.info(f"Stored task {task_id} in Redis.")
+            return True
         except Exception as e:
             logging.error(f"Error storing task {task_id}: {e}")
             return False
 
+    @staticmethod
+    def _index_task(pipe: Any, task_id: str, status: str, score: float) -> None:
+        """Queue the index writes that file a task under its status."""
+        status_key, *other_keys = _status_index_keys(status)
+        pipe.zadd(TASK_INDEX_KEY, {task_id: score})
+        pipe.zadd(status_key, {task_id: score})
+        for other_key in other_keys:
+            pipe.zrem(other_key, task_id)
+
     def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve task data from Redis."""
         if not self._ensure_connection() or self.redis_client is None:
@@ -81,40 +215,89 @@ class RedisClient:
 
         try:
             key = f"task:{task_id}"
-            data = self.redis_client.get(key)
-            if data and isinstance(data, str):
-                return json.loads(data)
+            try:
+                data = self.redis_client.hgetall(key)
+            except redis.ResponseError:
+                # Task written before tasks were stored as hashes
+                legacy = self.redis_client.get(key)
+                return json.loads(legacy) if legacy and isinstance(legacy, str) else None
+            if data and isinstance(data, dict):
+                return self._decode_fields(data)
             return None
         except Exception as e:
             logging.error(f"Error retrieving task {task_id}: {e}")
             return None
 
-    def update_task_status(self, task_id: str, status: str, **kwargs) -> bool:
-        """Update task status and additional fields."""
+    def update_task_status(self, task_id: str, status: str, ttl: Optional[int] = None,
+                           only_if_active: bool = False, **kwargs) -> bool:
+        """Update task status and additional fields in one atomic round trip.
+
+        Only the given fields are written, so concurrent writers never lose each
+        other's fields, and the task keeps its TTL unless ``ttl`` is given. With
+        ``only_if_active`` the update is skipped once the task completed or failed.
+        """
         if not self._ensure_connection() or self.redis_client is None:
             return False
 
         try:
-            task_data = self.get_task(task_id)
-            if not task_data:
-                logging.warning(f"Task {task_id} not found for update.")
-                return False
+            fields = dict(kwargs)
+            fields["status"] = status
+            fields["updated_at"] = datetime.utcnow().isoformat()
+            event = json.dumps({"task_id": task_id, **fields}, default=str)
+            args = [ttl or 0, "1" if only_if_active else "0", task_id, time.time(), task_events_channel(task_id), event]
+            for field, value in self._encode_fields(fields).items():
+                args.extend([field, value])
 
-            task_data.update(kwargs)
-            task_data["status"] = status
-            task_data["updated_at"] = datetime.utcnow().isoformat()
-            return self.set_task(task_id, task_data)
+            key = f"task:{task_id}"
+            keys = [key, TASK_INDEX_KEY] + _status_index_keys(status)
+            result = self._get_update_task_script()(keys=keys, args=args)
+            if result == -1:
+                self._migrate_legacy_task(key)
+                result = self._get_update_task_script()(keys=keys, args=args)
+            if result == 0 and not only_if_active:
+                logging.warning(f"Task {task_id} not found for update.")
+            return result > 0
         except Exception as e:
             logging.error(f"Error updating task {task_id}: {e}")
             return False
 
+    def _get_update_task_script(self) -> Any:
+        # Scripts are bound to a connection; re-register after a reconnect
+        if self._update_task_script is None or self._update_task_script_connection is not self.redis_client:
+            self._update_task_script = self.redis_client.register_script(UPDATE_TASK_SCRIPT)  # type: ignore[union-attr]
+            self._update_task_script_connection = self.redis_client
+        return self._update_task_script
+
+    def _migrate_legacy_task(self, key: str) -> None:
+        """Rewrite a JSON string task as a hash, keeping its remaining TTL."""
+        assert self.redis_client is not None
+        with self.redis_client.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                data = pipe.get(key)
+                ttl_ms = pipe.pttl(key)
+                if not data or not isinstance(data, str):
+                    return
+                pipe.multi()
+                pipe.delete(key)
+                pipe.hset(key, mapping=self._encode_fields(json.loads(data)))  # type: ignore[arg-type]
+                if isinstance(ttl_ms, int) and ttl_ms > 0:
+                    pipe.pexpire(key, ttl_ms)
+                pipe.execute()
+            except redis.WatchError:
+                # Another writer migrated it first
+                pass
+
     def delete_task(self, task_id: str) -> bool:
         """Delete a task from Redis."""
         if not self._ensure_connection() or self.redis_client is None:
             return False
 
         try:
-            result = self.redis_client.delete(f"task:{task_id}")
+            pipe = self.redis_client.pipeline()
+            pipe.delete(f"task:{task_id}")
+            self._unindex_tasks(pipe, [task_id])
+            result = pipe.execute()[0]
             if result:
                 logging.info(f"Deleted task {task_id} from Redis.")
             return bool(result)
@@ -122,50 +305,301 @@ class RedisClient:
             logging.error(f"Error deleting task {task_id}: {e}")
             return False
 
+    @staticmethod
+    def _unindex_tasks(pipe: Any, task_ids: List[str]) -> None:
+        pipe.zrem(TASK_INDEX_KEY, *task_ids)
+        for status in TASK_STATUSES:
+            pipe.zrem(_status_index_key(status), *task_ids)
+
+    def list_tasks(self, status: Optional[str] = None, cursor: Optional[str] = None,
+                   limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List tasks, most recently updated first, one page at a time.
+
+        Args:
+            status: Only list tasks with this status
+            cursor: ``next_cursor`` of the previous page
+            limit: Maximum tasks per page
+
+        Returns:
+            The page of tasks and the cursor of the next page, or None on the last page
+
+        Raises:
+            InvalidTaskCursor: If ``cursor`` is malformed
+        """
+        if not self._ensure_connection() or self.redis_client is None:
+            return [], None
+
+        index_key = _status_index_key(status) if status else TASK_INDEX_KEY
+        # The cursor is the score and id of the last task returned. Tasks sharing a
+        # score are ordered by id, descending, so the next page resumes at that score
+        # and skips the ids up to and including the last one
+        last_score: Optional[float] = None
+        last_id = ""
+        if cursor:
+            last_score, last_id = _parse_task_cursor(cursor)
+        upper = repr(last_score) if last_score is not None else "+inf"
+
+        entries: List[Tuple[str, float]] = []
+        offset = 0
+        while len(entries) < limit:
+            batch = self.redis_client.zrevrangebyscore(
+                index_key, upper, "-inf", start=offset, num=limit, withscores=True
+            )
+            offset += len(batch)  # type: ignore[arg-type]
+            for task_id, score in batch:  # type: ignore[union-attr]
+                if score == last_score and task_id >= last_id:
+                    continue
+                entries.append((task_id, score))
+            if len(batch) < limit:  # type: ignore[arg-type]
+                break
+        entries = entries[:limit]
+        if not entries:
+            return [], None
+
+        task_ids = [task_id for task_id, _ in entries]  # type: ignore[union-attr]
+        pipe = self.redis_client.pipeline(transaction=False)
+        for task_id in task_ids:
+            pipe.hgetall(f"task:{task_id}")
+        records = pipe.execute(raise_on_error=False)
+
+        tasks = []
+        expired = []
+        for task_id, record in zip(task_ids, records):
+            if isinstance(record, redis.ResponseError):
+                task = self.get_task(task_id)
+            else:
+                task = self._decode_fields(record) if record else None
+            if task is None:
+                expired.append(task_id)
+            else:
+                tasks.append(task)
+
+        if expired:
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._unindex_tasks(pipe, expired)
+            pipe.execute()
+
+        next_cursor = f"{entries[-1][1]!r}:{entries[-1][0]}" if len(entries) == limit else None
+        return tasks, next_cursor
+
     def get_all_tasks(self) -> Dict[str, Dict[str, Any]]:
-        """Retrieve all tasks stored in Redis."""
+        """Retrieve all tasks stored in Redis, paging through the task index."""
         if not self._ensure_connection() or self.redis_client is None:
             return {}
 
         try:
             tasks = {}
-            for key in self.redis_client.scan_iter("task:*"):
-                if isinstance(key, str):
-                    task_id = key.split("task:")[-1]
-                    data = self.redis_client.get(key)
-                    if data and isinstance(data, str):
-                        tasks[task_id] = json.loads(data)
-            return tasks
+            cursor = None
+            while True:
+                page, cursor = self.list_tasks(cursor=cursor, limit=500)
+                for task in page:
+                    tasks[task.get("task_id")] = task
+                if cursor is None:
+                    return tasks
         except Exception as e:
             logging.error(f"Error retrieving all tasks: {e}")
             return {}
 
-    def cleanup_completed_tasks(self, older_than_hours: int = 24) -> int:
+    def count_tasks(self, status: Optional[str] = None) -> int:
+        """Number of indexed tasks, optionally with one status, from the index size alone.
+
+        Tasks that expired since the last prune are still counted.
+        """
+        if not self._ensure_connection() or self.redis_client is None:
+            return 0
+
+        index_key = _status_index_key(status) if status else TASK_INDEX_KEY
+        return int(self.redis_client.zcard(index_key))  # type: ignore[arg-type]
+
+    def count_tasks_by_status(self) -> Dict[str, int]:
+        """Number of indexed tasks per status, from the index sizes alone.
+
+        Tasks that expired since the last prune are still counted.
+        """
+        if not self._ensure_connection() or self.redis_client is None:
+            return {}
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for status in TASK_STATUSES:
+            pipe.zcard(_status_index_key(status))
+        return dict(zip(TASK_STATUSES, pipe.execute()))
+
+    def prune_task_index(self) -> int:
+        """Drop index entries of tasks that must have expired by now.
+
+        No task outlives its last write by more than the longer task TTL.
+        """
+        if not self._ensure_connection() or self.redis_client is None:
+            return 0
+
+        cutoff = time.time() - max(settings.TASK_TTL, settings.TASK_RESULT_TTL)
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.zremrangebyscore(TASK_INDEX_KEY, "-inf", cutoff)
+        for status in TASK_STATUSES:
+            pipe.zremrangebyscore(_status_index_key(status), "-inf", cutoff)
+        return pipe.execute()[0]
+
+    def cleanup_completed_tasks(self, older_than_hours: int = 24, batch_size: int = 500) -> int:
         """Clean up completed/failed tasks older than a given time."""
         if not self._ensure_connection() or self.redis_client is None:
             return 0
 
         try:
-            cutoff = datetime.utcnow() - timedelta(hours=older_than_hours)
+            cutoff = time.time() - older_than_hours * 3600
             deleted_count = 0
 
-            for task_id, task_data in self.get_all_tasks().items():
-                if task_data.get("status") in ("completed", "failed"):
-                    updated_at = task_data.get("updated_at")
-                    if updated_at:
-                        try:
-                            dt = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
-                            if dt < cutoff and self.delete_task(task_id):
-                                deleted_count += 1
-                        except ValueError:
-                            continue
+            for status in ("completed", "failed"):
+                index_key = _status_index_key(status)
+                while True:
+                    task_ids = self.redis_client.zrangebyscore(index_key, "-inf", cutoff, start=0, num=batch_size)
+                    if not task_ids:
+                        break
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    pipe.delete(*[f"task:{task_id}" for task_id in task_ids])  # type: ignore[union-attr]
+                    self._unindex_tasks(pipe, task_ids)  # type: ignore[arg-type]
+                    deleted_count += pipe.execute()[0]
 
+            self.prune_task_index()
             logging.info(f"Cleaned up {deleted_count} old completed tasks.")
             return deleted_count
         except Exception as e:
             logging.error(f"Error cleaning up tasks: {e}")
             return 0
 
+    def ensure_task_index(self) -> int:
+        """Build the task index if it does not exist yet, e.g. after upgrading.
+
+        Returns:
+            Number of tasks indexed
+        """
+        if not self._ensure_connection() or self.redis_client is None:
+            return 0
+        if self.redis_client.exists(TASK_INDEX_KEY):
+            return 0
+        return self.rebuild_task_index()
+
+    def rebuild_task_index(self) -> int:
+        """Index every stored task by scanning its keys; a one-off migration step."""
+        if not self._ensure_connection() or self.redis_client is None:
+            return 0
+
+        indexed = 0
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in self.redis_client.scan_iter("task:*", count=1000):
+            task_id = key.split("task:", 1)[-1]  # type: ignore[union-attr]
+            task = self.get_task(task_id)
+            if not task:
+                continue
+            self._index_task(pipe, task_id, task.get("status", "pending"), self._task_score(task))
+            indexed += 1
+            if len(pipe) >= 1000:
+                pipe.execute()
+        pipe.execute()
+        logging.info(f"Indexed {indexed} tasks.")
+        return indexed
+
+    @staticmethod
+    def _task_score(task: Dict[str, Any]) -> float:
+        try:
+            # updated_at is written as naive UTC
+            updated_at = datetime.fromisoformat(task["updated_at"].replace("Z", "+00:00"))
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            return updated_at.timestamp()
+        except (KeyError, AttributeError, ValueError):
+            return time.time()
+
+    def get_json(self, key: str) -> Optional[Any]:
+        """Retrieve a JSON-encoded cache value."""
+        if not self._ensure_connection() or self.redis_client is None:
+            return None
+
+        try:
+            data = self.redis_client.get(key)
+            if data and isinstance(data, str):
+                return json.loads(data)
+            return None
+        except Exception as e:
+            self._on_error(e)
+            logging.error(f"Error retrieving cache key {key}: {e}")
+            return None
+
+    def set_json(self, key: str, value: Any, ttl: int = 3600) -> bool:
+        """Store a JSON-encodable cache value with TTL."""
+        if not self._ensure_connection() or self.redis_client is None:
+            return False
+
+        try:
+            return bool(self.redis_client.setex(key, ttl, json.dumps(value, default=str)))
+        except Exception as e:
+            self._on_error(e)
+            logging.error(f"Error storing cache key {key}: {e}")
+            return False
+
+    def incr(self, key: str) -> Optional[int]:
+        """Atomically increment an integer counter, creating it at 1."""
+        if not self._ensure_connection() or self.redis_client is None:
+            return None
+
+        try:
+            return int(self.redis_client.incr(key))  # type: ignore[arg-type]
+        except Exception as e:
+            self._on_error(e)
+            logging.error(f"Error incrementing counter {key}: {e}")
+            return None
+
+    def set_hash_field(self, key: str, field: str, value: Any, ttl: int = 3600) -> bool:
+        """Store a JSON-encodable value in one field of a hash and refresh the hash TTL."""
+        if not self._ensure_connection() or self.redis_client is None:
+            return False
+
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.hset(key, field, json.dumps(value, default=str))
+            pipe.expire(key, ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            self._on_error(e)
+            logging.error(f"Error storing field {field} of hash {key}: {e}")
+            return False
+
+    def get_hash(self, key: str) -> Dict[str, Any]:
+        """Retrieve every field of a hash, JSON-decoded."""
+        if not self._ensure_connection() or self.redis_client is None:
+            return {}
+
+        try:
+            data = self.redis_client.hgetall(key)
+            if not isinstance(data, dict):
+                return {}
+            return {field: json.loads(value) for field, value in data.items()}
+        except Exception as e:
+            self._on_error(e)
+            logging.error(f"Error retrieving hash {key}: {e}")
+            return {}
+
+    def delete_by_prefix(self, prefix: str) -> int:
+        """Delete all keys starting with the given prefix."""
+        if not self._ensure_connection() or self.redis_client is None:
+            return 0
+
+        try:
+            deleted_count = 0
+            batch = []
+            for key in self.redis_client.scan_iter(f"{prefix}*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted_count += int(self.redis_client.delete(*batch))  # type: ignore[arg-type]
+                    batch = []
+            if batch:
+                deleted_count += int(self.redis_client.delete(*batch))  # type: ignore[arg-type]
+            return deleted_count
+        except Exception as e:
+            self._on_error(e)
+            logging.error(f"Error deleting keys with prefix {prefix}: {e}")
+            return 0
+
     def health_check(self) -> Dict[str, Any]:
         """Perform a Redis health check."""
         if not self._ensure_connection() or self.redis_client is None:
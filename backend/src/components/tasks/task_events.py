@@ -0,0 +1,110 @@
+"""
+Server-Sent Events stream of a task's progress.
+
+Every task write publishes the written fields on ``tasks:events:<task_id>``
+tagged with the task's new ``event_seq`` (see RedisClient). A stream subscribes
+to that channel, then sends the stored task as a ``snapshot`` event, then
+forwards each later update as an ``update`` event until the task completes or
+fails. The sequence number is the SSE event id: a client reconnecting with
+Last-Event-ID gets a fresh snapshot only if it missed updates, since the
+stored task already folds in every update it missed.
+"""
+from typing import Any, AsyncIterator, Dict, Optional
+import json
+
+import redis
+import redis.asyncio as aioredis
+
+from src.components.tasks.redis_client import RedisClient, task_events_channel
+from src.config.settings import settings
+from src.config.logging import GraphMindException, logging
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+_async_redis: Optional[aioredis.Redis] = None
+
+
+class TaskNotFound(GraphMindException):
+    """The task does not exist, or has expired."""
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Shared asyncio Redis client; each open stream borrows one pooled connection."""
+    global _async_redis
+    if _async_redis is None:
+        if not settings.REDIS_URL:
+            raise GraphMindException("Redis unavailable, cannot stream task events")
+        _async_redis = aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=5,
+            health_check_interval=30,
+        )
+    return _async_redis
+
+
+async def _load_task(connection: aioredis.Redis, task_id: str) -> Optional[Dict[str, Any]]:
+    key = f"task:{task_id}"
+    try:
+        data = await connection.hgetall(key)
+    except redis.ResponseError:
+        # Task written before tasks were stored as hashes
+        legacy = await connection.get(key)
+        return json.loads(legacy) if legacy else None
+    return RedisClient._decode_fields(data) if data else None
+
+
+def format_task_event(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Serialize a task event as a Server-Sent Events frame"""
+    frame = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{frame}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_task_events(task_id: str, last_event_id: Optional[int] = None,
+                             connection: Optional[aioredis.Redis] = None) -> AsyncIterator[str]:
+    """Yield SSE frames for a task until it completes or fails.
+
+    Raises TaskNotFound before the first frame if the task does not exist.
+    """
+    connection = connection or get_async_redis()
+    pubsub = connection.pubsub()
+    # Subscribe before reading the task so no update falls between the two
+    await pubsub.subscribe(task_events_channel(task_id))
+    try:
+        task = await _load_task(connection, task_id)
+        if task is None:
+            raise TaskNotFound(f"Task {task_id} not found")
+
+        yield f"retry: {settings.TASK_EVENTS_RETRY_MS}\n\n"
+        seq = int(task.get("event_seq", 0))
+        if seq != last_event_id:
+            yield format_task_event("snapshot", task, seq)
+        if task.get("status") in TERMINAL_STATUSES:
+            return
+
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=settings.TASK_EVENTS_KEEPALIVE_INTERVAL
+            )
+            if message is None:
+                if not await connection.exists(f"task:{task_id}"):
+                    yield format_task_event("expired", {"task_id": task_id})
+                    return
+                yield ": keep-alive\n\n"
+                continue
+
+            update = json.loads(message["data"])
+            update_seq = update.pop("seq")
+            if update_seq <= seq:
+                # Already part of the snapshot
+                continue
+            seq = update_seq
+            yield format_task_event("update", update, seq)
+            if update.get("status") in TERMINAL_STATUSES:
+                return
+    finally:
+        try:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+        except Exception as e:
+            logging.warning(f"Error closing task event subscription for {task_id}: {e}")
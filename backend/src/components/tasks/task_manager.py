@@ -1,7 +1,10 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import threading
+import time
 import uuid
 from datetime import datetime
-from src.components.tasks.redis_client import redis_client
+from src.components.tasks.redis_client import redis_client, InvalidTaskCursor
+from src.config.settings import settings
 from src.config.logging import logging, GraphMindException
 
 
@@ -10,11 +13,17 @@ class TaskManager:
     
     def __init__(self):
         self.redis_client = redis_client
+        # Progress updates arriving within TASK_PROGRESS_MIN_INTERVAL of the last
+        # write are merged and flushed by a timer, so only the latest one is written
+        self._progress_lock = threading.Lock()
+        self._last_progress_write: Dict[str, float] = {}
+        self._pending_progress: Dict[str, Dict[str, Any]] = {}
+        self._progress_timers: Dict[str, threading.Timer] = {}
     
-    def create_task(self, task_data: Dict[str, Any]) -> str:
-        """Create a new background task"""
+    def create_task(self, task_data: Dict[str, Any], task_id: Optional[str] = None) -> str:
+        """Create a new background task, optionally re-creating one under a known id"""
         try:
-            task_id = str(uuid.uuid4())
+            task_id = task_id or str(uuid.uuid4())
             
             task_info = {
                 "task_id": task_id,
@@ -27,8 +36,8 @@ class TaskManager:
                 "error": None
             }
             
-            # Store task in Redis with 1 hour TTL
-            success = self.redis_client.set_task(task_id, task_info, ttl=3600)
+            # Unfinished tasks live for TASK_TTL; finishing shortens it to TASK_RESULT_TTL
+            success = self.redis_client.set_task(task_id, task_info, ttl=settings.TASK_TTL)
             
             if not success:
                 raise GraphMindException("Failed to store task in Redis")
@@ -66,25 +75,70 @@ class TaskManager:
             logging.error(f"Error getting task status {task_id}: {e}")
             return None
     
-    def update_task_progress(self, task_id: str, progress: float, message: Optional[str] = None) -> bool:
-        """Update task progress"""
+    def update_task_progress(self, task_id: str, progress: float, message: Optional[str] = None,
+                             **details: Any) -> bool:
+        """Update task progress, with optional extra fields such as counters
+        
+        Updates closer together than TASK_PROGRESS_MIN_INTERVAL are coalesced;
+        the latest values are written when the interval has passed.
+        """
         try:
-            kwargs: Dict[str, Any] = {"progress": progress}
+            kwargs: Dict[str, Any] = {"progress": progress, **details}
             if message:
                 kwargs["message"] = message
             
-            return self.redis_client.update_task_status(task_id, "processing", **kwargs)
+            with self._progress_lock:
+                now = time.monotonic()
+                wait = self._last_progress_write.get(task_id, float("-inf")) + settings.TASK_PROGRESS_MIN_INTERVAL - now
+                if wait > 0:
+                    self._pending_progress.setdefault(task_id, {}).update(kwargs)
+                    if task_id not in self._progress_timers:
+                        timer = threading.Timer(wait, self._flush_progress, args=(task_id,))
+                        timer.daemon = True
+                        self._progress_timers[task_id] = timer
+                        timer.start()
+                    return True
+                self._last_progress_write[task_id] = now
+            
+            return self._write_progress(task_id, kwargs)
             
         except Exception as e:
             logging.error(f"Error updating task progress {task_id}: {e}")
             return False
     
+    def _write_progress(self, task_id: str, fields: Dict[str, Any]) -> bool:
+        # Never let a late progress write reopen a finished task
+        return self.redis_client.update_task_status(task_id, "processing", only_if_active=True, **fields)
+    
+    def _flush_progress(self, task_id: str) -> None:
+        with self._progress_lock:
+            self._progress_timers.pop(task_id, None)
+            fields = self._pending_progress.pop(task_id, None)
+            if not fields:
+                return
+            self._last_progress_write[task_id] = time.monotonic()
+        try:
+            self._write_progress(task_id, fields)
+        except Exception as e:
+            logging.error(f"Error flushing task progress {task_id}: {e}")
+    
+    def _discard_progress(self, task_id: str) -> None:
+        """Drop coalesced progress for a task that is finishing."""
+        with self._progress_lock:
+            timer = self._progress_timers.pop(task_id, None)
+            if timer is not None:
+                timer.cancel()
+            self._pending_progress.pop(task_id, None)
+            self._last_progress_write.pop(task_id, None)
+    
     def mark_task_completed(self, task_id: str, result: Dict[str, Any]) -> bool:
         """Mark task as completed with result"""
         try:
+            self._discard_progress(task_id)
             return self.redis_client.update_task_status(
                 task_id, 
                 "completed", 
+                ttl=settings.TASK_RESULT_TTL,
                 result=result, 
                 progress=100,
                 completed_at=datetime.now().isoformat()
@@ -97,9 +151,11 @@ class TaskManager:
     def mark_task_failed(self, task_id: str, error: str) -> bool:
         """Mark task as failed with error"""
         try:
+            self._discard_progress(task_id)
             return self.redis_client.update_task_status(
                 task_id, 
                 "failed", 
+                ttl=settings.TASK_RESULT_TTL,
                 error=error,
                 completed_at=datetime.now().isoformat()
             )
@@ -108,6 +164,22 @@ class TaskManager:
             logging.error(f"Error marking task failed {task_id}: {e}")
             return False
     
+    def mark_task_retrying(self, task_id: str, error: str, attempts: int) -> bool:
+        """Mark a failed attempt that will be retried from the job queue"""
+        try:
+            self._discard_progress(task_id)
+            return self.redis_client.update_task_status(
+                task_id,
+                "pending",
+                error=error,
+                attempts=attempts,
+                message=f"Attempt {attempts} failed, retrying"
+            )
+            
+        except Exception as e:
+            logging.error(f"Error marking task retrying {task_id}: {e}")
+            return False
+    
     def start_task_processing(self, task_id: str) -> bool:
         """Mark task as started"""
         try:
@@ -130,6 +202,25 @@ class TaskManager:
             logging.error(f"Error getting all tasks: {e}")
             return {}
     
+    def list_tasks(self, status: Optional[str] = None, cursor: Optional[str] = None,
+                   limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List one page of tasks, most recently updated first, and the next page's cursor"""
+        try:
+            return self.redis_client.list_tasks(status=status, cursor=cursor, limit=limit)
+        except InvalidTaskCursor:
+            raise
+        except Exception as e:
+            logging.error(f"Error listing tasks: {e}")
+            raise GraphMindException(f"Task listing failed: {e}")
+    
+    def count_tasks(self, status: Optional[str] = None) -> int:
+        """Number of tasks, optionally with one status"""
+        try:
+            return self.redis_client.count_tasks(status)
+        except Exception as e:
+            logging.error(f"Error counting tasks: {e}")
+            raise GraphMindException(f"Task count failed: {e}")
+    
     def cleanup_old_tasks(self, hours: int = 24) -> int:
         """Clean up old completed/failed tasks"""
         try:
@@ -142,25 +233,14 @@ class TaskManager:
         """Check task manager health"""
         try:
             redis_health = self.redis_client.health_check()
-            tasks = self.get_all_tasks()
-            
-            task_counts = {
-                "pending": 0,
-                "processing": 0,
-                "completed": 0,
-                "failed": 0
-            }
-            
-            for task_data in tasks.values():
-                status = task_data.get("status", "unknown")
-                if status in task_counts:
-                    task_counts[status] += 1
+            task_counts = {"pending": 0, "processing": 0, "completed": 0, "failed": 0}
+            task_counts.update(self.redis_client.count_tasks_by_status())
             
             return {
                 "status": "healthy" if redis_health["status"] == "healthy" else "unhealthy",
                 "redis": redis_health,
                 "task_counts": task_counts,
-                "total_tasks": len(tasks)
+                "total_tasks": sum(task_counts.values())
             }
             
         except Exception as e:
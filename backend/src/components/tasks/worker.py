@@ -0,0 +1,177 @@
+"""
+Standalone ingestion worker consuming the Redis job queue.
+
+Run as many of these as needed, independently of the API pods:
+
+    python -m src.components.tasks.worker [--concurrency N] [--queue NAME]
+
+The API enqueues jobs when INGESTION_EXECUTION_MODE is "queue". Each job runs
+the existing ingestion workflow and reports through the TaskManager. SIGTERM
+lets in-flight jobs finish; a worker that dies mid-job loses only its lease and
+the job is redelivered to another worker.
+"""
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import signal
+import threading
+
+from src.components.tasks.job_queue import Job, JobQueue
+from src.components.tasks.task_manager import task_manager
+from src.config.settings import settings
+from src.config.logging import GraphMindException, logging
+
+JOB_PROCESS_DOCUMENT = "process_document"
+JOB_BULK_INGEST = "bulk_ingest"
+
+
+def process_document_job(job: Job, workflow_manager: Any) -> None:
+    """Download one document from S3 and run it through the ingestion workflow."""
+    from src.components.data_ingestion.ingestion_pipeline import fetch_from_s3, cleanup_fetched
+
+    task_id = job.payload["task_id"]
+    s3_key = job.payload["s3_key"]
+
+    task_manager.start_task_processing(task_id)
+    task_manager.update_task_progress(task_id, 20, "Downloading file from S3...")
+    local_path = fetch_from_s3(s3_key)
+    try:
+        task_manager.update_task_progress(task_id, 30, "File downloaded, processing document...")
+        result = workflow_manager.process_documents(
+            local_path,
+            document_key=job.payload.get("document_id") or s3_key,
+            chunk_size=job.payload.get("chunk_size"),
+            chunk_overlap=job.payload.get("chunk_overlap")
+        )
+    finally:
+        cleanup_fetched(local_path)
+
+    if not result.get("success"):
+        raise GraphMindException(result.get("error", "Document processing failed"))
+    result["s3_key"] = s3_key
+    task_manager.mark_task_completed(task_id, result)
+
+
+def bulk_ingest_job(job: Job, workflow_manager: Any) -> None:
+    """Run (or resume) a bulk ingestion; completed documents are skipped on retries."""
+    from src.components.data_ingestion.bulk_ingestion import bulk_ingestion
+    bulk_ingestion.run(job.payload["task_id"])
+
+
+DEFAULT_HANDLERS: Dict[str, Callable[[Job, Any], None]] = {
+    JOB_PROCESS_DOCUMENT: process_document_job,
+    JOB_BULK_INGEST: bulk_ingest_job,
+}
+
+
+class IngestionWorker:
+    """Reserves jobs from the queue and runs them, heartbeating their leases."""
+
+    def __init__(self, queue: Optional[JobQueue] = None,
+                 handlers: Optional[Dict[str, Callable[[Job, Any], None]]] = None,
+                 workflow_manager: Optional[Any] = None, concurrency: Optional[int] = None,
+                 poll_timeout: float = 2.0) -> None:
+        self.queue = queue or JobQueue(on_dead_letter=self._on_dead_letter)
+        self.handlers = handlers or DEFAULT_HANDLERS
+        self._workflow_manager = workflow_manager
+        self.concurrency = concurrency or settings.WORKER_CONCURRENCY
+        self.poll_timeout = poll_timeout
+        self._stopping = threading.Event()
+
+    @property
+    def workflow_manager(self) -> Any:
+        if self._workflow_manager is None:
+            from src.workflows.flow_manager import WorkflowManager
+            self._workflow_manager = WorkflowManager()
+        return self._workflow_manager
+
+    def run(self) -> None:
+        """Process jobs until ``stop`` is called."""
+        logging.info(f"Ingestion worker started on queue {self.queue.name} with concurrency {self.concurrency}")
+        threads = [
+            threading.Thread(target=self._loop, name=f"ingest-worker-{index}", daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logging.info("Ingestion worker stopped")
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = self.queue.reserve(timeout=self.poll_timeout)
+            except Exception as e:
+                logging.error(f"Failed to reserve a job: {e}")
+                self._stopping.wait(self.poll_timeout)
+                continue
+            if job is not None:
+                self.run_job(job)
+
+    def run_job(self, job: Job) -> bool:
+        """Run one reserved job, then ack it or record the failure. Returns True on success."""
+        handler = self.handlers.get(job.type)
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, heartbeat_stop), daemon=True)
+        heartbeat.start()
+        try:
+            if handler is None:
+                raise GraphMindException(f"No handler for job type {job.type}")
+            handler(job, self.workflow_manager)
+        except Exception as e:
+            heartbeat_stop.set()
+            logging.exception(f"Job {job.id} ({job.type}) failed")
+            self._on_failure(job, str(e))
+            return False
+        heartbeat_stop.set()
+        self.queue.ack(job)
+        return True
+
+    def _heartbeat(self, job: Job, stop: threading.Event) -> None:
+        interval = max(self.queue.visibility_timeout / 3, 1.0)
+        while not stop.wait(interval):
+            try:
+                self.queue.touch(job)
+            except Exception as e:
+                logging.warning(f"Failed to extend lease of job {job.id}: {e}")
+
+    def _on_failure(self, job: Job, error: str) -> None:
+        retrying = self.queue.fail(job, error)
+        task_id = job.payload.get("task_id")
+        if not task_id:
+            return
+        if retrying:
+            task_manager.mark_task_retrying(task_id, error, job.attempts)
+        else:
+            task_manager.mark_task_failed(task_id, error)
+
+    def _on_dead_letter(self, job: Job) -> None:
+        task_id = job.payload.get("task_id")
+        if task_id:
+            task_manager.mark_task_failed(task_id, job.last_error or "Job dead-lettered")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a GraphMind ingestion worker.")
+    parser.add_argument("--concurrency", type=int, default=None, help="Jobs run at once by this process")
+    parser.add_argument("--queue", default=None, help="Queue name (defaults to JOB_QUEUE_NAME)")
+    args = parser.parse_args(argv)
+
+    worker = IngestionWorker(concurrency=args.concurrency)
+    if args.queue:
+        worker.queue = JobQueue(name=args.queue, on_dead_letter=worker._on_dead_letter)
+
+    def shutdown(signum: int, frame: Any) -> None:
+        logging.info("Shutdown requested; finishing in-flight jobs")
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,10 @@ AWS S3 Configuration for GraphMind
 Handles file uploads, downloads, and presigned URL generation
 """
 
+import os
+from typing import Iterator
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from src.config.settings import settings
 import logging
@@ -23,6 +26,11 @@ class S3Client:
             region_name=settings.AWS_REGION
         )
         self.bucket_name = settings.S3_BUCKET_NAME
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=settings.S3_MAX_CONCURRENCY
+        )
         logger.info(f"S3 Client initialized for bucket: {self.bucket_name}")
         
     def upload_file(self, file_path: str, object_name: str | None = None) -> str:
@@ -96,6 +104,207 @@ class S3Client:
             logger.error(f"Error uploading file object to S3: {e}")
             raise
             
+    def put_object(self, data: bytes, object_name: str, content_type: str = 'application/pdf') -> str:
+        """
+        Upload a small in-memory object with a single PUT
+        
+        Args:
+            data: Object body
+            object_name: S3 object name
+            content_type: MIME type of file
+            
+        Returns:
+            Public URL of uploaded file
+            
+        Raises:
+            ClientError: If upload fails
+        """
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=object_name,
+                Body=data,
+                ContentType=content_type,
+                ServerSideEncryption='AES256'
+            )
+            
+            url = f"https://{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/{object_name}"
+            logger.info(f"Object uploaded successfully: {url}")
+            return url
+            
+        except ClientError as e:
+            logger.error(f"Error uploading object to S3: {e}")
+            raise
+            
+    def create_multipart_upload(self, object_name: str, content_type: str = 'application/pdf') -> str:
+        """
+        Start a multipart upload
+        
+        Args:
+            object_name: S3 object name
+            content_type: MIME type of file
+            
+        Returns:
+            Upload ID to pass to upload_part and complete_multipart_upload
+            
+        Raises:
+            ClientError: If the upload cannot be started
+        """
+        try:
+            response = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_name,
+                ContentType=content_type,
+                ServerSideEncryption='AES256'
+            )
+            return response['UploadId']
+            
+        except ClientError as e:
+            logger.error(f"Error starting multipart upload: {e}")
+            raise
+            
+    def upload_part(self, object_name: str, upload_id: str, part_number: int, data: bytes) -> dict:
+        """
+        Upload one part of a multipart upload
+        
+        Args:
+            object_name: S3 object name
+            upload_id: ID returned by create_multipart_upload
+            part_number: 1-based part number
+            data: Part body (at least 5 MB except for the last part)
+            
+        Returns:
+            Part descriptor for complete_multipart_upload
+            
+        Raises:
+            ClientError: If upload fails
+        """
+        try:
+            response = self.s3_client.upload_part(
+                Bucket=self.bucket_name,
+                Key=object_name,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=data
+            )
+            return {'PartNumber': part_number, 'ETag': response['ETag']}
+            
+        except ClientError as e:
+            logger.error(f"Error uploading part {part_number} of {object_name}: {e}")
+            raise
+            
+    def complete_multipart_upload(self, object_name: str, upload_id: str, parts: list) -> str:
+        """
+        Assemble the uploaded parts into the final object
+        
+        Args:
+            object_name: S3 object name
+            upload_id: ID returned by create_multipart_upload
+            parts: Part descriptors returned by upload_part, in order
+            
+        Returns:
+            Public URL of uploaded file
+            
+        Raises:
+            ClientError: If the upload cannot be completed
+        """
+        try:
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_name,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+            
+            url = f"https://{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/{object_name}"
+            logger.info(f"Multipart upload completed ({len(parts)} parts): {url}")
+            return url
+            
+        except ClientError as e:
+            logger.error(f"Error completing multipart upload: {e}")
+            raise
+            
+    def abort_multipart_upload(self, object_name: str, upload_id: str) -> None:
+        """
+        Abort a multipart upload and discard its parts
+        
+        Args:
+            object_name: S3 object name
+            upload_id: ID returned by create_multipart_upload
+        """
+        try:
+            self.s3_client.abort_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_name,
+                UploadId=upload_id
+            )
+            logger.info(f"Multipart upload aborted: {object_name}")
+            
+        except ClientError as e:
+            logger.error(f"Error aborting multipart upload: {e}")
+            
+    def download_to_path(self, object_name: str, file_path: str) -> int:
+        """
+        Download an object from S3 straight to a local file
+        
+        Uses boto3's managed transfer, so the body is written to disk in chunks
+        and large objects are fetched as concurrent ranged GETs. Memory use stays
+        bounded by the transfer config regardless of the object size.
+        
+        Args:
+            object_name: S3 object name
+            file_path: Local path to write the object to
+            
+        Returns:
+            Number of bytes downloaded
+            
+        Raises:
+            ClientError: If download fails
+        """
+        try:
+            self.s3_client.download_file(
+                self.bucket_name,
+                object_name,
+                file_path,
+                Config=self.transfer_config
+            )
+            size = os.path.getsize(file_path)
+            logger.info(f"File downloaded successfully: {object_name} ({size} bytes)")
+            return size
+            
+        except ClientError as e:
+            logger.error(f"Error downloading file from S3: {e}")
+            raise
+            
+    def stream_object(self, object_name: str, chunk_size: int | None = None) -> Iterator[bytes]:
+        """
+        Stream an object from S3 in fixed-size chunks
+        
+        Args:
+            object_name: S3 object name
+            chunk_size: Bytes per chunk, defaults to S3_STREAM_CHUNK_SIZE
+            
+        Yields:
+            Chunks of the object body
+            
+        Raises:
+            ClientError: If the object cannot be fetched
+        """
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=object_name
+            )
+        except ClientError as e:
+            logger.error(f"Error streaming file from S3: {e}")
+            raise
+            
+        body = response['Body']
+        try:
+            yield from body.iter_chunks(chunk_size or settings.S3_STREAM_CHUNK_SIZE)
+        finally:
+            body.close()
+            
     def generate_presigned_url(self, object_name: str, expiration: int = 3600) -> str:
         """
         Generate a presigned URL for secure access
@@ -164,6 +373,27 @@ class S3Client:
         except ClientError:
             return False
             
+    def iter_files(self, prefix: str = '', page_size: int = 1000) -> Iterator[str]:
+        """
+        Iterate over every key under a prefix, following list pagination
+        
+        Args:
+            prefix: Filter results by prefix
+            page_size: Keys requested per list_objects_v2 call (S3 caps this at 1000)
+            
+        Yields:
+            Object keys, in S3 listing order
+        """
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=prefix,
+            PaginationConfig={'PageSize': page_size}
+        )
+        for page in pages:
+            for obj in page.get('Contents', []):
+                yield obj['Key']
+    
     def list_files(self, prefix: str = '') -> list:
         """
         List files in S3 bucket
@@ -175,15 +405,7 @@ class S3Client:
             List of file names
         """
         try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix
-            )
-            
-            if 'Contents' not in response:
-                return []
-                
-            return [obj['Key'] for obj in response['Contents']]
+            return list(self.iter_files(prefix))
             
         except ClientError as e:
             logger.error(f"Error listing files from S3: {e}")
@@ -18,6 +18,32 @@ class Settings(BaseSettings):
     CHUNK_OVERLAP: int = 200
     MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50 MB
     ALLOWED_FILE_TYPES: list[str] = ["pdf", "docx", "txt", "md", "html"]
+    PDF_LOADER_BACKEND: str = "pymupdf"  # "pymupdf" (faster, page-streaming) or "pypdf"
+    PARSER_EXECUTION_MODE: str = "inline"  # "inline" or "process" (load and chunk in worker processes)
+    PARSER_PROCESS_WORKERS: int = 2
+    
+    # Pipelined bulk ingestion: worker threads per stage and bounded queue sizes
+    INGESTION_LOAD_WORKERS: int = 4
+    INGESTION_CHUNK_WORKERS: int = 2
+    INGESTION_EMBED_WORKERS: int = 1
+    INGESTION_UPSERT_WORKERS: int = 2
+    INGESTION_QUEUE_SIZE: int = 8
+    INGESTION_BATCH_SIZE: int = 64  # Chunks per embed/upsert batch, across documents
+    INGESTION_BATCH_LINGER: float = 0.5  # Seconds to wait before shipping a partial batch
+    
+    # Bulk ingestion of an S3 prefix
+    BULK_INGEST_STATE_TTL: int = 7 * 24 * 3600  # How long per-document progress is kept for resuming
+    BULK_INGEST_PROGRESS_INTERVAL: float = 2.0  # Minimum seconds between parent task progress writes
+    
+    # Where ingestion runs: "background" (FastAPI BackgroundTasks in the API process)
+    # or "queue" (Redis job queue consumed by `python -m src.components.tasks.worker`)
+    INGESTION_EXECUTION_MODE: str = "background"
+    JOB_QUEUE_NAME: str = "ingestion"
+    JOB_VISIBILITY_TIMEOUT: float = 300.0  # Seconds a job stays leased without a heartbeat
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF: float = 10.0  # Seconds before the first retry, doubled per attempt
+    JOB_RETRY_BACKOFF_MAX: float = 600.0
+    WORKER_CONCURRENCY: int = 1  # Jobs each worker process runs at once
     
     # LLM Model settings
     LLM_MODEL: str = "gemini-2.5-flash"
@@ -34,10 +60,28 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str | None = None
     EMBEDDING_DEVICE: str | None = None
     EMBEDDING_BATCH_SIZE: int = 16
+    # Cache of computed embeddings keyed by model and text hash (memory LRU + SQLite)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: str = ""  # Defaults to <tmp>/graphmind_embeddings.sqlite
+    EMBEDDING_CACHE_MEMORY_ENTRIES: int = 10000
     
     # Timeout settings (in seconds)
     REQUEST_TIMEOUT: int = 300  # 5 minutes for query processing
     LLM_TIMEOUT: int = 120   # 2 minutes for LLM API calls
+
+    # Knowledge graph extraction settings
+    KG_EXTRACTION_MODE: str = "combined"  # combined (one truncated blob) or per_chunk (map-reduce over chunks)
+    KG_EXTRACTION_MAX_WORKERS: int = 4  # Concurrent chunk extractions in per_chunk mode
+    KG_EXTRACTION_STRATEGY: str = "two_pass"  # two_pass (entities then relationships) or joint (one LLM call)
+    
+    # Extraction cache settings
+    EXTRACTION_CACHE_BACKEND: str = "tiered"  # memory, redis or tiered (memory in front of redis)
+    EXTRACTION_CACHE_MAX_ENTRIES: int = 1024  # In-memory LRU capacity
+    EXTRACTION_CACHE_TTL: int = 24 * 3600  # 24 hours
+    
+    # Query concurrency settings
+    MAX_CONCURRENT_QUERIES: int = 4  # Workflow runs executing at once per worker
+    QUERY_QUEUE_SIZE: int = 8  # Queries allowed to wait for a slot before returning 429
     
     # Storage settings
     DATA_DIR: str = "./data"
@@ -48,6 +92,15 @@ class Settings(BaseSettings):
     CHROMA_DATABASE: str = ""
     CHROMA_COLLECTION_NAME: str = "graphmind_collection"
     CHROMA_USE_CLOUD: bool = True  # Production uses ChromaDB Cloud only  
+    # Vector upserts are sent in batches with per-batch retries
+    VECTOR_UPSERT_BATCH_SIZE: int = 100
+    VECTOR_UPSERT_CONCURRENCY: int = 1
+    VECTOR_UPSERT_MAX_RETRIES: int = 3
+    VECTOR_UPSERT_RETRY_BACKOFF: float = 0.5  # seconds, doubled on every retry
+    # Chunk manifests for incremental re-ingestion: "redis", "local" or "auto"
+    CHUNK_MANIFEST_BACKEND: str = "auto"
+    CHUNK_MANIFEST_DIR: str = ""  # Defaults to <tmp>/graphmind_manifests
+    CHUNK_MANIFEST_TTL: int = 90 * 24 * 3600
     
     # LLM API Keys
     GOOGLE_API_KEY: str = ""  # Gemini API key
@@ -57,9 +110,36 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str = ""
     AWS_REGION: str = "ap-south-1"
     S3_BUCKET_NAME: str = ""
+    # Managed transfer: objects above the threshold are fetched as parallel ranged GETs
+    S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    S3_MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024
+    S3_MAX_CONCURRENCY: int = 4
+    S3_STREAM_CHUNK_SIZE: int = 1024 * 1024
+    # Local copy of uploads so the receiving worker skips downloading them again
+    UPLOAD_SPOOL_ENABLED: bool = True
+    UPLOAD_SPOOL_DIR: str = ""  # Defaults to <tmp>/graphmind_spool
+    UPLOAD_SPOOL_MAX_BYTES: int = 1024 * 1024 * 1024  # 1 GB
 
     # Redis settings
     REDIS_URL: str = ""
+    REDIS_RETRY_INTERVAL: float = 30.0  # Seconds Redis calls fail fast after Redis was unreachable
+    
+    # Background task records (Redis hashes)
+    TASK_TTL: int = 24 * 3600  # Lifetime of a task that has not finished yet
+    TASK_RESULT_TTL: int = 3600  # Lifetime of a task after it completes or fails
+    TASK_PROGRESS_MIN_INTERVAL: float = 1.0  # Progress updates closer together than this are coalesced
+    TASK_EVENTS_KEEPALIVE_INTERVAL: float = 15.0  # Seconds between keep-alive comments on idle task event streams
+    TASK_EVENTS_RETRY_MS: int = 3000  # Reconnect delay suggested to task event stream clients
+
+    # Query result cache (Redis); entries are invalidated whenever the collection changes
+    QUERY_CACHE_ENABLED: bool = True
+    QUERY_CACHE_TTL: int = 3600
+    # Semantic cache reuses answers for paraphrased queries (in-memory, per worker).
+    # Off by default: without a local EMBEDDING_MODEL it downloads Chroma's default ONNX model.
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 512
+    SEMANTIC_CACHE_TTL: int = 3600
   
 
 settings = Settings()
\ No newline at end of file
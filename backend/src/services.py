@@ -1,14 +1,136 @@
 """
 Singleton services for GraphMind components.
-Provides centralized, thread-safe access to expensive resources like embedding generators and vector stores.
+Provides centralized, thread-safe access to expensive resources like embedding generators, vector stores and LLM clients.
 """
-from typing import Optional, Any
+from typing import Optional, Any, Callable, Dict, Tuple
 import threading
+from langchain_core.callbacks import BaseCallbackHandler
 from src.components.processing.vector_store import ChromaVectorStore
 
 from src.config.logging import logging, GraphMindException
 
 
+class _LLMCallCounter(BaseCallbackHandler):
+    """Callback handler counting LLM calls made through pooled clients."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+    
+    def on_chat_model_start(self, serialized, messages, **kwargs) -> None:
+        with self._lock:
+            self.calls += 1
+    
+    def on_llm_start(self, serialized, prompts, **kwargs) -> None:
+        with self._lock:
+            self.calls += 1
+    
+    def on_llm_error(self, error, **kwargs) -> None:
+        with self._lock:
+            self.errors += 1
+    
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.errors = 0
+
+
+class LLMClientPool:
+    """Process-wide pool of lazily created LLM clients and prompt chains.
+    
+    Clients are keyed by their configuration so every component asking for the
+    same settings shares one instance (and its underlying HTTP connections).
+    Chains built on top of a pooled client are cached by name as well.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple, Any] = {}
+        # id(client) -> key of every pooled client, maintained with _clients under the lock
+        self._client_keys: Dict[int, Tuple] = {}
+        self._chains: Dict[Tuple, Any] = {}
+        self._call_counter = _LLMCallCounter()
+        self._clients_created = 0
+        self._chains_created = 0
+    
+    def get_client(self, temperature: float = 0, max_retries: Optional[int] = None):
+        """Get a shared chat model client for the configured LLM."""
+        from src.config.settings import settings
+        
+        key = (settings.LLM_PROVIDER, settings.LLM_MODEL, temperature, max_retries)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    logging.info(f"Initializing pooled LLM client for {settings.LLM_MODEL} (temperature={temperature}, max_retries={max_retries})")
+                    try:
+                        # Import lazily so modules that never call the LLM do not pay for it
+                        from langchain_google_genai import ChatGoogleGenerativeAI
+                        
+                        client_kwargs: Dict[str, Any] = {
+                            "model": settings.LLM_MODEL,
+                            "google_api_key": settings.GOOGLE_API_KEY,
+                            "temperature": temperature,
+                            "timeout": settings.LLM_TIMEOUT,
+                            "callbacks": [self._call_counter],
+                        }
+                        if max_retries is not None:
+                            client_kwargs["max_retries"] = max_retries
+                        client = ChatGoogleGenerativeAI(**client_kwargs)
+                    except Exception as e:
+                        logging.error(f"Failed to initialize LLM client: {e}")
+                        raise GraphMindException(f"Failed to initialize LLM client: {e}")
+                    self._clients[key] = client
+                    self._client_keys[id(client)] = key
+                    self._clients_created += 1
+        return client
+    
+    def get_chain(self, name: str, llm: Any, builder: Callable[[Any], Any]):
+        """Get a named chain built on ``llm``, reusing it when ``llm`` is a pooled client.
+        
+        Chains over clients that did not come from this pool (e.g. test doubles)
+        are built fresh and never cached.
+        """
+        client_key = self._client_keys.get(id(llm))
+        # The id of a client dropped by reset() may since belong to another object
+        if client_key is None or self._clients.get(client_key) is not llm:
+            return builder(llm)
+        
+        key = (name, client_key)
+        chain = self._chains.get(key)
+        if chain is None:
+            with self._lock:
+                chain = self._chains.get(key)
+                if chain is None:
+                    chain = builder(llm)
+                    self._chains[key] = chain
+                    self._chains_created += 1
+        return chain
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get construction and usage counters for the pool."""
+        return {
+            "clients": len(self._clients),
+            "clients_created": self._clients_created,
+            "chains": len(self._chains),
+            "chains_created": self._chains_created,
+            "llm_calls": self._call_counter.calls,
+            "llm_errors": self._call_counter.errors
+        }
+    
+    def reset(self) -> None:
+        """Drop all pooled clients and chains and zero the counters."""
+        with self._lock:
+            self._clients.clear()
+            self._client_keys.clear()
+            self._chains.clear()
+            self._clients_created = 0
+            self._chains_created = 0
+        self._call_counter.reset()
+
+
 class GraphMindServices:
     """Singleton container for shared GraphMind services."""
     
@@ -31,6 +153,18 @@ class GraphMindServices:
         self._vector_store: Optional[ChromaVectorStore] = None
         self._embedding_lock = threading.Lock()
         self._vector_store_lock = threading.Lock()
+        self._llm_pool = LLMClientPool()
+        self._extraction_cache: Optional[Any] = None
+        self._extraction_cache_lock = threading.Lock()
+        self._chunk_manifest_store: Optional[Any] = None
+        self._chunk_manifest_lock = threading.Lock()
+        self._query_cache: Optional[Any] = None
+        self._query_cache_initialized = False
+        self._query_cache_lock = threading.Lock()
+        self._semantic_cache: Optional[Any] = None
+        self._semantic_cache_initialized = False
+        self._parser_pool: Optional[Any] = None
+        self._parser_pool_lock = threading.Lock()
         self._initialized = True
     
     def get_embedding_generator(self):
@@ -66,18 +200,102 @@ class GraphMindServices:
                     logging.info("Initializing singleton ChromaDB Cloud vector store")
                     try:
                         from src.components.processing.vector_store import create_vector_store
-                        self._vector_store = create_vector_store()
+                        vector_store = create_vector_store()
+                        # Any ingest or delete invalidates cached query responses
+                        vector_store.add_change_listener(self._on_collection_changed)
+                        self._vector_store = vector_store
                     except Exception as e:
                         logging.error(f"Failed to initialize ChromaVectorStore: {e}")
                         raise GraphMindException(f"Failed to initialize ChromaVectorStore: {e}")
         return self._vector_store
     
+    def get_extraction_cache(self):
+        """Get the thread-safe singleton cache for entity/relationship extraction results."""
+        if self._extraction_cache is None:
+            with self._extraction_cache_lock:
+                if self._extraction_cache is None:
+                    logging.info("Initializing singleton extraction cache")
+                    from src.components.knowledge_graph.extraction_cache import create_extraction_cache
+                    self._extraction_cache = create_extraction_cache()
+        return self._extraction_cache
+    
+    def get_query_cache(self):
+        """Get the singleton query response cache, or None when it is disabled."""
+        if not self._query_cache_initialized:
+            with self._query_cache_lock:
+                if not self._query_cache_initialized:
+                    from src.workflows.query_cache import create_query_cache
+                    self._query_cache = create_query_cache()
+                    self._query_cache_initialized = True
+                    logging.info(f"Query cache {'enabled' if self._query_cache else 'disabled'}")
+        return self._query_cache
+    
+    def get_semantic_cache(self):
+        """Get the singleton semantic query cache, or None when it is disabled."""
+        if not self._semantic_cache_initialized:
+            with self._query_cache_lock:
+                if not self._semantic_cache_initialized:
+                    from src.workflows.semantic_cache import create_semantic_cache
+                    try:
+                        self._semantic_cache = create_semantic_cache()
+                    except Exception as e:
+                        logging.error(f"Failed to initialize semantic cache, continuing without it: {e}")
+                        self._semantic_cache = None
+                    self._semantic_cache_initialized = True
+                    logging.info(f"Semantic cache {'enabled' if self._semantic_cache else 'disabled'}")
+        return self._semantic_cache
+    
+    def _on_collection_changed(self) -> None:
+        query_cache = self.get_query_cache()
+        if query_cache is not None:
+            query_cache.bump_collection_version()
+        # The semantic cache is per worker; other workers fall back to their TTL
+        if self._semantic_cache is not None:
+            self._semantic_cache.clear()
+    
+    def get_chunk_manifest_store(self):
+        """Get the thread-safe singleton store for per-document chunk manifests."""
+        if self._chunk_manifest_store is None:
+            with self._chunk_manifest_lock:
+                if self._chunk_manifest_store is None:
+                    logging.info("Initializing singleton chunk manifest store")
+                    from src.components.processing.chunk_manifest import create_chunk_manifest_store
+                    self._chunk_manifest_store = create_chunk_manifest_store()
+        return self._chunk_manifest_store
+    
+    def get_parser_pool(self):
+        """Get the singleton pool of document parser processes."""
+        if self._parser_pool is None:
+            with self._parser_pool_lock:
+                if self._parser_pool is None:
+                    from src.components.data_ingestion.parser_pool import ParserPool
+                    self._parser_pool = ParserPool()
+        return self._parser_pool
+    
+    def shutdown_parser_pool(self) -> None:
+        """Stop the parser worker processes, if they were started."""
+        with self._parser_pool_lock:
+            parser_pool, self._parser_pool = self._parser_pool, None
+        if parser_pool is not None:
+            parser_pool.shutdown()
+    
+    def get_llm_pool(self) -> LLMClientPool:
+        """Get the process-wide LLM client pool."""
+        return self._llm_pool
+    
     def reset(self):
         """Reset all services (useful for testing or reinitialization)."""
         with self._embedding_lock, self._vector_store_lock:
             logging.info("Resetting GraphMind services")
             self._embedding_generator = None
             self._vector_store = None
+            self._extraction_cache = None
+            self._chunk_manifest_store = None
+            self._query_cache = None
+            self._query_cache_initialized = False
+            self._semantic_cache = None
+            self._semantic_cache_initialized = False
+            self._llm_pool.reset()
     
     def health_check(self) -> dict:
         """Perform health checks on all services."""
@@ -98,6 +316,8 @@ class GraphMindServices:
             if self._vector_store is not None:
                 vs_health = self._vector_store.health_check()
                 health_status["vector_store"] = vs_health.get("status", "unknown")
+            
+            health_status["llm_clients"] = "initialized" if self._llm_pool.stats()["clients"] else "not_initialized"
         except Exception as e:
             logging.error(f"Health check failed: {e}")
             health_status["error"] = str(e)
@@ -117,6 +337,42 @@ def get_vector_store():
     """Get the singleton vector store instance."""
     return _services.get_vector_store()
 
+def get_extraction_cache():
+    """Get the singleton extraction result cache."""
+    return _services.get_extraction_cache()
+
+def get_chunk_manifest_store():
+    """Get the chunk manifest store singleton."""
+    return _services.get_chunk_manifest_store()
+
+def get_query_cache():
+    """Get the query response cache singleton (None when disabled)."""
+    return _services.get_query_cache()
+
+def get_semantic_cache():
+    """Get the semantic query cache singleton (None when disabled)."""
+    return _services.get_semantic_cache()
+
+def get_parser_pool():
+    """Get the document parser process pool singleton."""
+    return _services.get_parser_pool()
+
+def shutdown_parser_pool() -> None:
+    """Stop the document parser processes, if they were started."""
+    _services.shutdown_parser_pool()
+
+def get_llm_client(temperature: float = 0, max_retries: Optional[int] = None):
+    """Get a pooled LLM client shared across the process."""
+    return _services.get_llm_pool().get_client(temperature=temperature, max_retries=max_retries)
+
+def get_llm_chain(name: str, llm: Any, builder: Callable[[Any], Any]):
+    """Get a named chain over ``llm``, cached when ``llm`` is a pooled client."""
+    return _services.get_llm_pool().get_chain(name, llm, builder)
+
+def get_llm_pool_stats() -> dict:
+    """Get construction and call counters of the LLM client pool."""
+    return _services.get_llm_pool().stats()
+
 def get_services() -> GraphMindServices:
     """Get the services container instance."""
     return _services
@@ -1,55 +1,93 @@
-from typing import Dict, Any, Optional, cast
+import asyncio
+import time
+from typing import Dict, Any, Optional, AsyncIterator, List, Tuple, cast
+from langchain_core.documents import Document
 from src.workflows.kg_workflow import kg_workflow
-from src.workflows.state import GraphState
+from src.workflows.state import GraphState, PipelineConfig
+from src.config.settings import settings
+from src.services import get_query_cache, get_semantic_cache
 from src.config.logging import GraphMindException, logging
 
+
+class QueryCapacityExceeded(GraphMindException):
+    """Raised when the worker already has the maximum number of queries in flight and queued."""
+    pass
+
+
 class WorkflowManager:
-    def __init__(self):
+    def __init__(self, max_concurrent_queries: Optional[int] = None, query_queue_size: Optional[int] = None,
+                 query_cache: Optional[Any] = None, semantic_cache: Optional[Any] = None):
         self.workflow = kg_workflow
+        # Response cache for repeated queries; None when disabled or Redis is not configured
+        self.query_cache = query_cache if query_cache is not None else get_query_cache()
+        # Similarity-based cache for paraphrased queries; None when disabled
+        self.semantic_cache = semantic_cache if semantic_cache is not None else get_semantic_cache()
+        self.max_concurrent_queries = max_concurrent_queries or settings.MAX_CONCURRENT_QUERIES
+        self.query_queue_size = query_queue_size if query_queue_size is not None else settings.QUERY_QUEUE_SIZE
+        # Admission bookkeeping is only touched from the event loop thread
+        self._admitted_queries = 0
+        self._query_semaphore: Optional[asyncio.Semaphore] = None
     
-    def process_query(self, query: str, file_path: Optional[str] = None, ) -> Dict[str, Any]:
+    def process_query(self, query: str, file_path: Optional[str] = None, top_k: Optional[int] = None) -> Dict[str, Any]:
         """Process a query through the complete workflow"""
         try:
+            pipeline_config = PipelineConfig.from_overrides(top_k=top_k)
+            cached, collection_version = self._get_cached_response(query, file_path, pipeline_config)
+            if cached is not None:
+                return cached
+            
             # Initialize state
-            initial_state = GraphState(query=query, file_path=file_path)
+            initial_state = GraphState(
+                query=query,
+                file_path=file_path,
+                pipeline_config=pipeline_config
+            )
             
             # Execute workflow
             result = self.workflow.invoke(initial_state)
+            response = self._format_query_result(result)
+            self._cache_response(query, file_path, pipeline_config, response, collection_version)
+            return response
             
-            if result is None:
-                raise GraphMindException("Workflow returned None - workflow execution failed")
-            
-            # Check if result is a dict (error case) or GraphState
-            if isinstance(result, dict):
-                if result.get("error"):
-                    raise GraphMindException(f"Workflow failed: {result.get('error')}")
-                # Convert dict to GraphState if needed
-                final_state = GraphState(**result)
-            else:
-                final_state = cast(GraphState, result)
-
-            if hasattr(final_state, 'error') and final_state.error:
-                raise GraphMindException(f"Workflow failed: {final_state.error}")
-            
-            # Convert Document objects to dict format for API response
-            relevant_chunks_formatted = []
-            if hasattr(final_state, 'relevant_chunks') and final_state.relevant_chunks:
-                for chunk in final_state.relevant_chunks:
-                    relevant_chunks_formatted.append({
-                        "content": chunk.page_content,
-                        "metadata": chunk.metadata or {}
-                    })
-            
+        except Exception as e:
+            logging.error(f"Workflow execution failed: {str(e)}")
             return {
-                "success": True,
-                "summary": final_state.summary,
-                "knowledge_graph": final_state.knowledge_graph,
-                "visualization_data": final_state.visualizations_data,
-                "entities": final_state.entities,
-                "relationships": final_state.relationships,
-                "relevant_chunks": relevant_chunks_formatted,
-                "processing_steps": [final_state.current_step] if final_state.current_step else []
+                "success": False,
+                "error": str(e),
+                "summary": None,
+                "knowledge_graph": None
             }
+    
+    async def aprocess_query(self, query: str, file_path: Optional[str] = None, top_k: Optional[int] = None) -> Dict[str, Any]:
+        """Process a query without blocking the event loop.
+
+        At most ``max_concurrent_queries`` workflow runs execute at once and up to
+        ``query_queue_size`` more wait for a slot. Anything beyond that raises
+        QueryCapacityExceeded so the API can shed load instead of piling up requests.
+        Cached responses are returned before admission and never take a slot.
+        """
+        pipeline_config = PipelineConfig.from_overrides(top_k=top_k)
+        cached, collection_version = await asyncio.to_thread(
+            self._get_cached_response, query, file_path, pipeline_config
+        )
+        if cached is not None:
+            return cached
+        
+        self._admit_query()
+        try:
+            async with self._get_query_semaphore():
+                initial_state = GraphState(
+                    query=query,
+                    file_path=file_path,
+                    pipeline_config=pipeline_config
+                )
+                # LangGraph runs the synchronous nodes in the loop's thread pool
+                result = await self.workflow.ainvoke(initial_state)
+            response = self._format_query_result(result)
+            await asyncio.to_thread(
+                self._cache_response, query, file_path, pipeline_config, response, collection_version
+            )
+            return response
             
         except Exception as e:
             logging.error(f"Workflow execution failed: {str(e)}")
@@ -59,11 +97,224 @@ class WorkflowManager:
                 "summary": None,
                 "knowledge_graph": None
             }
+        finally:
+            self._admitted_queries -= 1
+    
+    async def astream_query(self, query: str, file_path: Optional[str] = None,
+                            top_k: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream query results as each workflow stage completes.
+        
+        Yields ``{"event": name, "data": payload}`` dicts: ``started`` once the query
+        is admitted, ``relevant_chunks`` after retrieval, then - interleaved, as the
+        parallel branches progress - ``knowledge_graph``, ``summary_token`` for every
+        streamed LLM token and ``summary`` with the full text, and finally ``done``.
+        Failures are reported as an ``error`` event.
+        Admission is checked on the first iteration and raises QueryCapacityExceeded.
+        """
+        self._admit_query()
+        start_time = time.time()
+        try:
+            yield {"event": "started", "data": {"query": query}}
+            
+            async with self._get_query_semaphore():
+                initial_state = GraphState(
+                    query=query,
+                    file_path=file_path,
+                    pipeline_config=PipelineConfig.from_overrides(top_k=top_k)
+                )
+                steps: List[str] = []
+                # With several stream modes LangGraph yields (mode, chunk) pairs
+                stream = self.workflow.astream(initial_state, stream_mode=["updates", "messages"])
+                async for mode, chunk in cast(AsyncIterator[Tuple[str, Any]], stream):
+                    if mode == "messages":
+                        message, metadata = chunk
+                        if metadata.get("langgraph_node") == "generate_summary" and message.content:
+                            yield {"event": "summary_token", "data": {"token": message.content}}
+                        continue
+                    
+                    for node_name, update in chunk.items():
+                        update = dict(update) if isinstance(update, GraphState) else (update or {})
+                        if update.get("error"):
+                            yield {"event": "error", "data": {"error": update["error"]}}
+                            return
+                        if update.get("current_step"):
+                            steps.append(update["current_step"])
+                        
+                        event = self._stage_event(node_name, update)
+                        if event is not None:
+                            yield event
+            
+            yield {
+                "event": "done",
+                "data": {
+                    "processing_steps": steps,
+                    "processing_time": time.time() - start_time
+                }
+            }
+        
+        except Exception as e:
+            logging.error(f"Streaming workflow execution failed: {str(e)}")
+            yield {"event": "error", "data": {"error": str(e)}}
+        finally:
+            self._admitted_queries -= 1
+    
+    def _stage_event(self, node_name: str, update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Map a workflow node update to the event streamed to the client."""
+        if node_name == "retrieve_relevant_context":
+            return {
+                "event": "relevant_chunks",
+                "data": {"relevant_chunks": self._format_chunks(update.get("relevant_chunks"))}
+            }
+        if node_name == "generate_knowledge_graph":
+            return {
+                "event": "knowledge_graph",
+                "data": {
+                    "knowledge_graph": update.get("knowledge_graph"),
+                    "entities": update.get("entities"),
+                    "relationships": update.get("relationships"),
+                    "visualization_data": update.get("visualizations_data")
+                }
+            }
+        if node_name == "generate_summary":
+            return {"event": "summary", "data": {"summary": update.get("summary")}}
+        return None
+    
+    def _get_cached_response(self, query: str, file_path: Optional[str],
+                             pipeline_config: PipelineConfig) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """Look up an exact, then a semantic, cached response; cache failures are treated as misses.
+        
+        Returns the cached response (or None) and the collection version it was
+        looked up under. A miss must be stored under that same version: the
+        collection may change while the workflow runs. The version is None when
+        it could not be read, and the response is then not cached.
+        """
+        if self.query_cache is None and self.semantic_cache is None:
+            return None, None
+        try:
+            collection_version = self._collection_version()
+        except Exception as e:
+            logging.warning(f"Collection version lookup failed: {e}")
+            return None, None
+        
+        params = {"top_k": pipeline_config.top_k, "file_path": file_path}
+        for name, cache in (("Query", self.query_cache), ("Semantic", self.semantic_cache)):
+            if cache is None:
+                continue
+            try:
+                cached = cache.get(query, collection_version=collection_version, **params)
+            except Exception as e:
+                logging.warning(f"{name} cache lookup failed: {e}")
+                continue
+            if cached is not None:
+                return dict(cached, cached=True), collection_version
+        return None, collection_version
+    
+    def _cache_response(self, query: str, file_path: Optional[str], pipeline_config: PipelineConfig,
+                        response: Dict[str, Any], collection_version: Optional[int]) -> None:
+        """Store a response under the collection version read before the workflow ran."""
+        if collection_version is None:
+            return
+        params = {"top_k": pipeline_config.top_k, "file_path": file_path}
+        if self.query_cache is not None:
+            try:
+                self.query_cache.set(query, response, collection_version=collection_version, **params)
+            except Exception as e:
+                logging.warning(f"Query cache store failed: {e}")
+        if self.semantic_cache is not None:
+            try:
+                self.semantic_cache.set(query, response, collection_version=collection_version, **params)
+            except Exception as e:
+                logging.warning(f"Semantic cache store failed: {e}")
+    
+    def _collection_version(self) -> int:
+        """Shared collection version, so semantic entries go stale on every worker after an ingest."""
+        return self.query_cache.collection_version() if self.query_cache is not None else 0
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get statistics for the query caches (None for disabled caches)."""
+        return {
+            "query_cache": self.query_cache.stats() if self.query_cache is not None else None,
+            "semantic_cache": self.semantic_cache.stats() if self.semantic_cache is not None else None
+        }
+    
+    def _admit_query(self) -> None:
+        """Reserve a running or queued query slot, or raise when the worker is saturated."""
+        if self._admitted_queries >= self.max_concurrent_queries + self.query_queue_size:
+            raise QueryCapacityExceeded(
+                f"Query capacity exceeded: {self.max_concurrent_queries} running, "
+                f"{self.query_queue_size} queued"
+            )
+        self._admitted_queries += 1
+    
+    def get_query_load(self) -> Dict[str, int]:
+        """Get current query admission counters."""
+        return {
+            "admitted": self._admitted_queries,
+            "max_concurrent": self.max_concurrent_queries,
+            "queue_size": self.query_queue_size
+        }
+    
+    def _get_query_semaphore(self) -> asyncio.Semaphore:
+        """Create the semaphore lazily so it binds to the serving event loop."""
+        if self._query_semaphore is None:
+            self._query_semaphore = asyncio.Semaphore(self.max_concurrent_queries)
+        return self._query_semaphore
+    
+    def _format_query_result(self, result: Any) -> Dict[str, Any]:
+        """Convert the final workflow state into the query response payload"""
+        if result is None:
+            raise GraphMindException("Workflow returned None - workflow execution failed")
+        
+        # Check if result is a dict (error case) or GraphState
+        if isinstance(result, dict):
+            if result.get("error"):
+                raise GraphMindException(f"Workflow failed: {result.get('error')}")
+            # Values were validated when the nodes produced them; skip re-validation
+            final_state = GraphState.model_construct(**result)
+        else:
+            final_state = cast(GraphState, result)
+
+        if hasattr(final_state, 'error') and final_state.error:
+            raise GraphMindException(f"Workflow failed: {final_state.error}")
+        
+        # Convert Document objects to dict format for API response
+        relevant_chunks_formatted = self._format_chunks(final_state.relevant_chunks)
+        
+        return {
+            "success": True,
+            "summary": final_state.summary,
+            "knowledge_graph": final_state.knowledge_graph,
+            "visualization_data": final_state.visualizations_data,
+            "entities": final_state.entities,
+            "relationships": final_state.relationships,
+            "relevant_chunks": relevant_chunks_formatted,
+            "processing_steps": [final_state.current_step] if final_state.current_step else []
+        }
+    
+    def _format_chunks(self, chunks: Optional[List[Any]]) -> List[Dict[str, Any]]:
+        """Convert retrieved chunks (Documents or their dumps) to response dicts"""
+        formatted_chunks = []
+        for chunk in chunks or []:
+            if isinstance(chunk, Document):
+                formatted_chunks.append({"content": chunk.page_content, "metadata": chunk.metadata or {}})
+            else:
+                formatted_chunks.append({"content": chunk.get("page_content"), "metadata": chunk.get("metadata") or {}})
+        return formatted_chunks
     
-    def process_documents(self, file_path: str) -> Dict[str, Any]:
-        """Process documents through the workflow"""
+    def process_documents(self, file_path: str, document_key: Optional[str] = None,
+                          chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None) -> Dict[str, Any]:
+        """Process documents through the workflow.
+        
+        ``document_key`` identifies the document across re-uploads so only changed
+        chunks are re-embedded; it defaults to the file's absolute path. ``chunk_size`` and
+        ``chunk_overlap`` override the configured chunking for this document.
+        """
         try:
-            initial_state = GraphState(file_path=file_path)
+            initial_state = GraphState(
+                file_path=file_path,
+                document_key=document_key,
+                pipeline_config=PipelineConfig.from_overrides(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+            )
             result = self.workflow.invoke(initial_state)
             
             if result is None:
@@ -73,18 +324,21 @@ class WorkflowManager:
             if isinstance(result, dict):
                 if result.get("error"):
                     raise GraphMindException(f"Workflow failed: {result.get('error')}")
-                # Convert dict to GraphState if needed
-                final_state = GraphState(**result)
+                # Values were validated when the nodes produced them; skip re-validation
+                final_state = GraphState.model_construct(**result)
             else:
                 final_state = cast(GraphState, result)
             
             if hasattr(final_state, 'error') and final_state.error:
                 raise GraphMindException(f"Document processing failed: {final_state.error}")
             
+            # Pages and chunks are streamed rather than kept in the state; their
+            # counts arrive in ingestion_stats and override these defaults
             return {
                 "success": True,
                 "documents_processed": len(final_state.documents or []),
                 "chunks_created": len(final_state.chunks or []),
+                **(final_state.ingestion_stats or {}),
                 "processing_steps": [final_state.current_step] if final_state.current_step else []
             }
             
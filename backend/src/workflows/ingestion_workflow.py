@@ -1,12 +1,15 @@
+from typing import Optional
+import os
 from langgraph.graph import StateGraph, END
 from src.workflows.state import GraphState
 from src.components.data_ingestion.doc_loader import DocumentLoader
 from src.components.processing.chunking import create_chunker, Chunker
-from src.services import get_vector_store
+from src.components.processing.chunk_manifest import sync_document_chunks
+from src.services import get_vector_store, get_chunk_manifest_store
 from src.config.settings import settings
 from src.config.logging import logging, GraphMindException
 
-def ingestion_workflow(file_path: str, query: str) -> GraphState:
+def ingestion_workflow(file_path: str, query: str, document_key: Optional[str] = None) -> GraphState:
     """Process documents and store them in the vector database."""
     
     document_loader = DocumentLoader()
@@ -16,14 +19,19 @@ def ingestion_workflow(file_path: str, query: str) -> GraphState:
     chunker: Chunker = create_chunker(strategy="recursive")
     chunked_docs = chunker.chunk_documents(documents)
 
-    # Use singleton vector store to add documents
-    vector_store = get_vector_store()
-    vector_store.add_documents(chunked_docs)
+    # Go through the manifest so re-ingesting only embeds changed chunks and
+    # removes the ones that disappeared, like the main document workflow
+    ingestion_stats = sync_document_chunks(
+        get_vector_store(), get_chunk_manifest_store(),
+        document_key or os.path.abspath(file_path), chunked_docs
+    )
 
     return GraphState(
         file_path=file_path,
+        document_key=document_key,
         query=query,        
         documents=documents,
         chunks=chunked_docs,
+        ingestion_stats=ingestion_stats,
         current_step="documents_processed"  # Fixed: align with kg_workflow expectations
     )
@@ -1,3 +1,4 @@
+from typing import Dict, Any, List, Union
 from langgraph.graph import StateGraph, END
 from src.workflows.state import GraphState
 from src.workflows.node.document_processing import process_documents
@@ -7,7 +8,7 @@ from src.workflows.node.summarization import generate_summary
 from src.config.logging import logging, GraphMindException
 
 
-def decide_next_step(state: GraphState) -> str:
+def decide_next_step(state: GraphState) -> Union[str, List[str]]:
     """Main workflow to process documents, retrieve context, generate knowledge graph, and summarize"""
     
     if state.error:
@@ -23,15 +24,19 @@ def decide_next_step(state: GraphState) -> str:
         return "retrieve_relevant_context"  
     
     if state.current_step == "context_retrieved":
-        return "generate_knowledge_graph"
-    
-    if state.current_step == "knowledge_graph_generated":
-        return "generate_summary"
+        # Both branches only read the retrieved context, so they run in parallel
+        return ["generate_knowledge_graph", "generate_summary"]
     return "end"
     
-def workflow_error(state: GraphState) -> GraphState:
+def join_results(state: GraphState) -> Dict[str, Any]:
+    """Join point for the parallel knowledge graph and summary branches"""
+    if state.error:
+        return {"current_step": "error"}
+    return {"current_step": "completed"}
+    
+def workflow_error(state: GraphState) -> Dict[str, Any]:
     logging.error(f"Workflow encountered an error: {state.error}")
-    return state
+    return {}
 
 # Define the state graph
 workflow = StateGraph(GraphState)
@@ -41,6 +46,7 @@ workflow.add_node("process_documents", process_documents)
 workflow.add_node("retrieve_relevant_context", retrieve_relevant_context)
 workflow.add_node("generate_knowledge_graph", generate_knowledge_graph)
 workflow.add_node("generate_summary", generate_summary)
+workflow.add_node("join_results", join_results)
 workflow.add_node("error", workflow_error)
 
 # Define graph structure
@@ -63,23 +69,17 @@ workflow.add_conditional_edges(
     decide_next_step,
     {
         "generate_knowledge_graph": "generate_knowledge_graph",
+        "generate_summary": "generate_summary",
         "error": "error",
         "end": END
     }
 )
 
-workflow.add_conditional_edges(
-    "generate_knowledge_graph",
-    decide_next_step,
-    {
-        "generate_summary": "generate_summary",
-        "error": "error", 
-        "end": END
-    }
-)
+# Wait for both parallel branches before deciding how to finish
+workflow.add_edge(["generate_knowledge_graph", "generate_summary"], "join_results")
 
 workflow.add_conditional_edges(
-    "generate_summary",
+    "join_results",
     decide_next_step,
     {
         "error": "error",
@@ -1,34 +1,63 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterable, Iterator
+import os
 from src.components.data_ingestion.doc_loader import DocumentLoader
 from src.components.processing.chunking import create_chunker
-from src.services import get_vector_store
+from src.components.processing.chunk_manifest import sync_document_chunks
+from src.components.data_ingestion.parser_pool import parse_document_chunks
+from src.services import get_vector_store, get_chunk_manifest_store
 from src.workflows.state import GraphState
 from src.config.logging import logging, GraphMindException
 
 
-def process_documents(state: GraphState) -> GraphState:
+class _PageCounter:
+    """Counts pages as they stream past on their way to the chunker."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, pages: Iterable[Any]) -> Iterator[Any]:
+        for page in pages:
+            self.count += 1
+            yield page
+
+
+def process_documents(state: GraphState) -> Dict[str, Any]:
     """Process documents: load, chunk, and store in vector database"""
     try:
         if state.file_path:
-            document_loader = DocumentLoader()
-            documents, _ = document_loader.load_documents(state.file_path)
-
-            chunker = create_chunker()
-            chunks = chunker.chunk_documents(documents)
+            chunk_size = state.pipeline_config.chunk_size
+            chunk_overlap = state.pipeline_config.chunk_overlap
+            count_pages = _PageCounter()
+            
+            # In process mode a parser worker loads and chunks the file off the GIL
+            parsed = parse_document_chunks(state.file_path, chunk_size, chunk_overlap)
+            if parsed is not None:
+                count_pages.count = parsed.page_count
+                chunks: Iterable[Any] = parsed.to_chunks()
+            else:
+                # Pages are loaded, chunked and upserted as a stream, so memory stays
+                # bounded by one upsert batch however large the file is
+                document_loader = DocumentLoader()
+                pages = count_pages(document_loader.lazy_load_documents(state.file_path))
+                chunker = create_chunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+                chunks = chunker.chunk_documents_lazy(pages)
             
-            # Store chunks in vector database for later retrieval
-            vector_store = get_vector_store()
-            vector_store.add_documents(chunks)
+            # Store new or changed chunks in the vector database and drop removed ones.
+            # Callers pass the document ID (the S3 key by default); the file name alone
+            # is not unique, and keying on it would let one document's ingest delete
+            # another's vectors.
+            document_key = state.document_key or os.path.abspath(state.file_path)
+            ingestion_stats = sync_document_chunks(
+                get_vector_store(), get_chunk_manifest_store(), document_key, chunks
+            )
+            ingestion_stats["documents_processed"] = count_pages.count
+            ingestion_stats["chunks_created"] = ingestion_stats["chunks_added"] + ingestion_stats["chunks_unchanged"]
 
-            state_data = state.model_dump()
-            state_data.update({
-                "documents": documents,
-                "chunks": chunks,
+            # Return only the changed fields; LangGraph merges them into the state
+            return {
+                "ingestion_stats": ingestion_stats,
                 "current_step": "documents_processed"
-            })
-            return GraphState(**state_data)
-        return state
+            }
+        return {}
     except Exception as e:
-        state_data = state.model_dump()
-        state_data.update({"error": f"Document processing failed: {e}", "current_step": "error"})
-        return GraphState(**state_data)
\ No newline at end of file
+        return {"error": f"Document processing failed: {e}", "current_step": "error"}
\ No newline at end of file
@@ -5,34 +5,34 @@ from src.workflows.state import GraphState
 from src.config.logging import logging
 
 
-def generate_knowledge_graph(state: GraphState) -> GraphState:
-    """Generate knowledge graph from content"""
+def generate_knowledge_graph(state: GraphState) -> Dict[str, Any]:
+    """Generate knowledge graph from content.
+
+    Runs in parallel with generate_summary, so it only returns the fields it
+    owns; writing the whole state would collide with the summary branch.
+    """
     try:
         if state.combined_context:
             kg_orchestrator = GraphOrchestrator()
-            kg_result = kg_orchestrator.build_graph_from_text(state.combined_context)
+            if state.relevant_chunks:
+                # Hand over the individual chunks so per-chunk extraction can fan out
+                kg_result = kg_orchestrator.build_knowledge_graph(state.relevant_chunks)
+            else:
+                kg_result = kg_orchestrator.build_graph_from_text(state.combined_context)
 
-            state_data = state.model_dump()
-            state_data.update({
+            return {
                 "entities": kg_result.get("entities", []),
                 "relationships": kg_result.get("relationships", []),
                 "knowledge_graph": kg_result,
-                "visualizations_data": kg_result.get("visualization", {}),
-                "current_step": "knowledge_graph_generated"
-            })
-            return GraphState(**state_data)
+                "visualizations_data": kg_result.get("visualization", {})
+            }
         else:
             # No context to build knowledge graph from, mark as completed with empty results
-            state_data = state.model_dump()
-            state_data.update({
+            return {
                 "entities": [],
                 "relationships": [],
                 "knowledge_graph": {"nodes": [], "edges": []},
-                "visualizations_data": {},
-                "current_step": "knowledge_graph_generated"
-            })
-            return GraphState(**state_data)
+                "visualizations_data": {}
+            }
     except Exception as e:
-        state_data = state.model_dump()
-        state_data.update({"error": f"Knowledge graph generation failed: {e}", "current_step": "error"})
-        return GraphState(**state_data)
\ No newline at end of file
+        return {"error": f"Knowledge graph generation failed: {e}"}
\ No newline at end of file
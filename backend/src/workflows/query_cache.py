@@ -0,0 +1,97 @@
+"""
+Response cache for the /query pipeline.
+
+Entries are keyed by the normalised query, the request parameters and a
+collection version counter. Every write to the vector store bumps the version,
+so answers computed against an older collection are never served again and
+simply expire. Callers read the version once before running the workflow and
+store the answer under that version: an ingest landing mid-query then makes
+the answer stale instead of filing it under the newer version.
+"""
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import re
+import threading
+
+from src.config.settings import settings
+from src.config.logging import logging
+
+QUERY_CACHE_PREFIX = "query_cache"
+COLLECTION_VERSION_KEY = f"{QUERY_CACHE_PREFIX}:collection_version"
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, without trailing punctuation."""
+    return re.sub(r"\s+", " ", query).strip().lower().rstrip("?!. ")
+
+
+class QueryResultCache:
+    """Caches successful query responses in Redis."""
+
+    def __init__(self, redis_client: Optional[Any] = None, ttl: Optional[int] = None) -> None:
+        if redis_client is None:
+            from src.components.tasks.redis_client import get_redis_client
+            redis_client = get_redis_client()
+        self.redis_client = redis_client
+        self.ttl = ttl if ttl is not None else settings.QUERY_CACHE_TTL
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def collection_version(self) -> int:
+        """Current collection version; 0 until the first write."""
+        version = self.redis_client.get_json(COLLECTION_VERSION_KEY)
+        return int(version) if version is not None else 0
+
+    def bump_collection_version(self) -> None:
+        """Invalidate every cached response by moving to a new collection version."""
+        version = self.redis_client.incr(COLLECTION_VERSION_KEY)
+        logging.info(f"Query cache collection version bumped to {version}")
+
+    def make_key(self, query: str, version: int, **params: Any) -> str:
+        payload = json.dumps({"query": normalize_query(query), **params}, sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return f"{QUERY_CACHE_PREFIX}:v{version}:{digest}"
+
+    def get(self, query: str, collection_version: Optional[int] = None, **params: Any) -> Optional[Dict[str, Any]]:
+        """Return the cached response for the query and parameters, or None.
+        
+        Looks under ``collection_version``, or the current version when not given.
+        """
+        version = self.collection_version() if collection_version is None else collection_version
+        key = self.make_key(query, version, **params)
+        value = self.redis_client.get_json(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, query: str, response: Dict[str, Any], collection_version: Optional[int] = None,
+            **params: Any) -> None:
+        """Cache a successful response under the collection version it was computed against.
+        
+        Pass the version read before the workflow ran; it defaults to the current one.
+        """
+        if not response.get("success"):
+            return
+        version = self.collection_version() if collection_version is None else collection_version
+        key = self.make_key(query, version, **params)
+        self.redis_client.set_json(key, response, ttl=self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+def create_query_cache() -> Optional[QueryResultCache]:
+    """Create the query cache, or None when it is disabled or Redis is not configured."""
+    if not settings.QUERY_CACHE_ENABLED or not settings.REDIS_URL:
+        return None
+    return QueryResultCache()
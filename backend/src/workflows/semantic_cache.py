@@ -0,0 +1,158 @@
+"""
+Semantic cache for query responses.
+
+Complements the exact-match QueryResultCache: queries are embedded and a
+previous response is reused when an earlier query with the same parameters is
+within SEMANTIC_CACHE_THRESHOLD cosine similarity. The index is a small
+in-memory matrix with LRU eviction and TTL; it is cleared whenever the
+collection changes.
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import json
+import threading
+import time
+
+import numpy as np
+
+from src.config.settings import settings
+from src.config.logging import GraphMindException, logging
+from src.workflows.query_cache import normalize_query
+
+# Recently embedded queries, so a miss followed by a store embeds only once
+_EMBEDDING_MEMO_SIZE = 64
+
+
+class SemanticQueryCache:
+    """In-memory cosine-similarity index over previously answered queries."""
+
+    def __init__(self, embed_query: Callable[[str], List[float]], threshold: Optional[float] = None,
+                 max_entries: Optional[int] = None, ttl: Optional[int] = None) -> None:
+        self.embed_query = embed_query
+        self.threshold = threshold if threshold is not None else settings.SEMANTIC_CACHE_THRESHOLD
+        self.max_entries = max_entries or settings.SEMANTIC_CACHE_MAX_ENTRIES
+        self.ttl = ttl if ttl is not None else settings.SEMANTIC_CACHE_TTL
+        self._lock = threading.Lock()
+        # entry id -> (params key, unit vector, response, expires_at), in LRU order
+        self._entries: "OrderedDict[int, Tuple[str, np.ndarray, Dict[str, Any], float]]" = OrderedDict()
+        self._next_id = 0
+        self._embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.last_hit_similarity: Optional[float] = None
+
+    def get(self, query: str, **params: Any) -> Optional[Dict[str, Any]]:
+        """Return the response of the most similar cached query above the threshold."""
+        vector = self._embed(query)
+        params_key = self._params_key(params)
+        now = time.monotonic()
+
+        with self._lock:
+            best_id, best_score = None, -1.0
+            expired = []
+            for entry_id, (entry_params, entry_vector, _, expires_at) in self._entries.items():
+                if expires_at and expires_at < now:
+                    expired.append(entry_id)
+                    continue
+                if entry_params != params_key:
+                    continue
+                score = float(np.dot(entry_vector, vector))
+                if score > best_score:
+                    best_id, best_score = entry_id, score
+            for entry_id in expired:
+                del self._entries[entry_id]
+                self.expirations += 1
+
+            if best_id is None or best_score < self.threshold:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            self.last_hit_similarity = best_score
+            response = self._entries[best_id][2]
+
+        logging.info(f"Semantic cache hit (similarity {best_score:.3f}) for query: {query[:80]}")
+        return dict(response)
+
+    def set(self, query: str, response: Dict[str, Any], **params: Any) -> None:
+        """Index a successful response under the query's embedding."""
+        if not response.get("success"):
+            return
+        vector = self._embed(query)
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            self._entries[self._next_id] = (self._params_key(params), vector, dict(response), expires_at)
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached responses (e.g. after the collection changed)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "threshold": self.threshold,
+            "last_hit_similarity": self.last_hit_similarity,
+            "cache_size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "eviction_policy": "lru",
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+    def _embed(self, query: str) -> np.ndarray:
+        key = normalize_query(query)
+        with self._lock:
+            vector = self._embeddings.get(key)
+            if vector is not None:
+                self._embeddings.move_to_end(key)
+                return vector
+
+        vector = np.asarray(self.embed_query(key), dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            raise GraphMindException("Query embedding is empty")
+        vector = vector / norm
+
+        with self._lock:
+            self._embeddings[key] = vector
+            while len(self._embeddings) > _EMBEDDING_MEMO_SIZE:
+                self._embeddings.popitem(last=False)
+        return vector
+
+    @staticmethod
+    def _params_key(params: Dict[str, Any]) -> str:
+        return json.dumps(params, sort_keys=True, default=str)
+
+
+def create_query_embedder() -> Callable[[str], List[float]]:
+    """Embedding function for queries.
+
+    Uses the local EmbeddingGenerator when one is configured, otherwise Chroma's
+    default embedding function (the same model Chroma applies to collections
+    created without an explicit embedding function).
+    """
+    if not settings.CHROMA_USE_CLOUD and settings.EMBEDDING_MODEL:
+        from src.services import get_embedding_generator
+        return get_embedding_generator().embed_query
+
+    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+    embedding_function = DefaultEmbeddingFunction()
+    return lambda query: list(embedding_function([query])[0])
+
+
+def create_semantic_cache() -> Optional[SemanticQueryCache]:
+    """Create the semantic cache, or None when it is disabled."""
+    if not settings.SEMANTIC_CACHE_ENABLED:
+        return None
+    return SemanticQueryCache(create_query_embedder())
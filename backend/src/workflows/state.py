@@ -1,6 +1,28 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Annotated
 from langchain_core.documents import Document
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from src.config.settings import settings
+
+
+def merge_errors(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    """Reducer for ``error`` so parallel branches can fail in the same step."""
+    if current and new and new != current:
+        return f"{current}; {new}"
+    return new or current
+
+
+class PipelineConfig(BaseModel):
+    """Per-request tuning knobs carried through the workflow"""
+    
+    chunk_size: int = Field(default_factory=lambda: settings.CHUNK_SIZE)
+    chunk_overlap: int = Field(default_factory=lambda: settings.CHUNK_OVERLAP)
+    top_k: int = 5
+    
+    @classmethod
+    def from_overrides(cls, **overrides: Optional[int]) -> "PipelineConfig":
+        """Build a config from request values, keeping defaults for those left unset"""
+        return cls(**{name: value for name, value in overrides.items() if value is not None})
+
 
 class GraphState(BaseModel):
     """State for the GraphMind workflow"""
@@ -9,11 +31,14 @@ class GraphState(BaseModel):
     query: Optional[str] = None
     documents: Optional[List[Document]] = None
     file_path: Optional[str] = None
+    document_key: Optional[str] = None
+    pipeline_config: PipelineConfig = Field(default_factory=PipelineConfig)
 
     #processing
     chunks: Optional[List[Document]] = None
     relevant_chunks: Optional[List[Document]] = None
     combined_context: Optional[str] = None
+    ingestion_stats: Optional[Dict[str, int]] = None
 
     #Knowledge Graph
     entities: Optional[List[Dict[str, Any]]] = None
@@ -25,5 +50,5 @@ class GraphState(BaseModel):
     visualizations_data: Optional[Dict[str, Any]] = None
 
     #Control flow
-    error: Optional[str] = None
+    error: Annotated[Optional[str], merge_errors] = None
     current_step: str = "initializing"
\ No newline at end of file
@@ -1,9 +1,14 @@
 import pytest
+import asyncio
+import json
+import time
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, AsyncMock, patch
 
 from src.api.routes import router
+from src.workflows.flow_manager import QueryCapacityExceeded
+from src.components.data_ingestion.upload_spool import UploadSpool
 
 # Create test app
 app = FastAPI()
@@ -39,12 +44,12 @@ class TestQueryEndpoint:
     @patch('src.api.routes.workflow_manager')
     def test_query_success(self, mock_workflow_manager):
         """Test successful query processing"""
-        mock_workflow_manager.process_query.return_value = {
+        mock_workflow_manager.aprocess_query = AsyncMock(return_value={
             "success": True,
             "summary": "This is a test summary",
             "entities": [{"name": "AI", "type": "CONCEPT"}],
             "relationships": []
-        }
+        })
         
         client = TestClient(app)
         response = client.post(
@@ -69,6 +74,152 @@ class TestQueryEndpoint:
         )
         
         assert response.status_code == 422  # Validation error
+    
+    @patch('src.api.routes.workflow_manager')
+    def test_query_capacity_exceeded(self, mock_workflow_manager):
+        """Test that a saturated worker sheds load with 429"""
+        mock_workflow_manager.aprocess_query = AsyncMock(
+            side_effect=QueryCapacityExceeded("Query capacity exceeded")
+        )
+        
+        client = TestClient(app)
+        response = client.post(
+            "/query",
+            json={"query": "What is AI?"}
+        )
+        
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "1"
+
+
+class TestQueryParameters:
+    """Test request tuning parameters are passed to the workflow"""
+    
+    @patch('src.api.routes.workflow_manager')
+    def test_query_passes_top_k(self, mock_workflow_manager):
+        """Test top_k from the request reaches the workflow"""
+        mock_workflow_manager.aprocess_query = AsyncMock(return_value={"success": True})
+        
+        client = TestClient(app)
+        response = client.post("/query", json={"query": "What is AI?", "top_k": 12})
+        
+        assert response.status_code == 200
+        assert mock_workflow_manager.aprocess_query.call_args.kwargs["top_k"] == 12
+    
+    @patch('src.api.routes.workflow_manager')
+    def test_query_marks_cached_responses(self, mock_workflow_manager):
+        """Test cached responses are flagged in the response"""
+        mock_workflow_manager.aprocess_query = AsyncMock(return_value={"success": True, "cached": True})
+        
+        client = TestClient(app)
+        response = client.post("/query", json={"query": "What is AI?"})
+        
+        assert response.status_code == 200
+        assert response.json()["cached"] is True
+    
+    @patch('src.api.routes.workflow_manager')
+    def test_cache_stats(self, mock_workflow_manager):
+        """Test cache statistics are exposed"""
+        mock_workflow_manager.get_cache_stats.return_value = {
+            "query_cache": None,
+            "semantic_cache": {"hits": 3, "misses": 1, "hit_rate": 0.75, "threshold": 0.92}
+        }
+        
+        client = TestClient(app)
+        response = client.get("/cache/stats")
+        
+        assert response.status_code == 200
+        assert response.json()["semantic_cache"]["hit_rate"] == 0.75
+    
+    @patch('src.api.routes._fetch_document')
+    @patch('src.api.routes.workflow_manager')
+    def test_sync_processing_passes_chunking(self, mock_workflow_manager, mock_fetch, tmp_path):
+        """Test chunk_size and chunk_overlap from the request reach the workflow"""
+        document = tmp_path / "doc" / "report.pdf"
+        document.parent.mkdir()
+        document.write_bytes(b"%PDF")
+        mock_fetch.return_value = document
+        mock_workflow_manager.process_documents.return_value = {"success": True}
+        
+        client = TestClient(app)
+        response = client.post("/documents/process", json={
+            "s3_key": "documents/1/report.pdf",
+            "chunk_size": 800,
+            "chunk_overlap": 100,
+            "process_in_background": False
+        })
+        
+        assert response.status_code == 200
+        kwargs = mock_workflow_manager.process_documents.call_args.kwargs
+        assert kwargs["chunk_size"] == 800
+        assert kwargs["chunk_overlap"] == 100
+        assert kwargs["document_key"] == "documents/1/report.pdf"
+    
+    @patch('src.api.routes._fetch_document')
+    @patch('src.api.routes.workflow_manager')
+    def test_sync_processing_runs_off_the_event_loop(self, mock_workflow_manager, mock_fetch, tmp_path):
+        """Test synchronous processing does not block the event loop"""
+        document = tmp_path / "doc" / "report.pdf"
+        document.parent.mkdir()
+        document.write_bytes(b"%PDF")
+        mock_fetch.return_value = document
+        on_event_loop = []
+        
+        def process(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_event_loop.append(True)
+            except RuntimeError:
+                on_event_loop.append(False)
+            return {"success": True}
+        
+        mock_workflow_manager.process_documents.side_effect = process
+        
+        response = TestClient(app).post("/documents/process", json={
+            "s3_key": "documents/1/report.pdf",
+            "process_in_background": False
+        })
+        
+        assert response.status_code == 200
+        assert on_event_loop == [False]
+
+
+class TestQueryStreamEndpoint:
+    """Test /query/stream endpoint - Server-Sent Events variant of /query"""
+    
+    @patch('src.api.routes.workflow_manager')
+    def test_stream_query_sends_events(self, mock_workflow_manager):
+        """Test that workflow events are framed as SSE"""
+        async def fake_stream(query, file_path=None, top_k=None):
+            yield {"event": "started", "data": {"query": query}}
+            yield {"event": "relevant_chunks", "data": {"relevant_chunks": []}}
+            yield {"event": "summary_token", "data": {"token": "AI"}}
+            yield {"event": "done", "data": {"processing_steps": []}}
+        
+        mock_workflow_manager.astream_query = fake_stream
+        
+        client = TestClient(app)
+        response = client.post("/query/stream", json={"query": "What is AI?"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [line.split(": ", 1)[1] for line in response.text.splitlines() if line.startswith("event: ")]
+        assert events == ["started", "relevant_chunks", "summary_token", "done"]
+        assert 'data: {"token": "AI"}' in response.text
+    
+    @patch('src.api.routes.workflow_manager')
+    def test_stream_query_capacity_exceeded(self, mock_workflow_manager):
+        """Test that a saturated worker rejects the stream before it starts"""
+        async def saturated_stream(query, file_path=None, top_k=None):
+            raise QueryCapacityExceeded("Query capacity exceeded")
+            yield
+        
+        mock_workflow_manager.astream_query = saturated_stream
+        
+        client = TestClient(app)
+        response = client.post("/query/stream", json={"query": "What is AI?"})
+        
+        assert response.status_code == 429
 
 
 class TestDocumentProcessEndpoint:
@@ -116,6 +267,760 @@ class TestDocumentProcessEndpoint:
         assert data["message"] == "Document processing started in background"
 
 
+class TestDocumentUploadEndpoint:
+    """Test /documents/upload streams the file to S3"""
+    
+    MB = 1024 * 1024
+    
+    def _upload(self, content: bytes, **form):
+        client = TestClient(app)
+        return client.post(
+            "/documents/upload",
+            files={"file": ("report.pdf", content, "application/pdf")},
+            data=form
+        )
+    
+    @patch('src.api.routes._schedule_document_processing')
+    @patch('src.api.routes.task_manager')
+    @patch('src.api.routes.s3_client')
+    def test_reupload_keeps_document_id(self, mock_s3_client, mock_task_manager, mock_schedule):
+        """Test a re-upload is processed under the caller's document ID, not its new S3 key"""
+        mock_s3_client.put_object.return_value = "https://bucket/report.pdf"
+        
+        first = self._upload(b"%PDF v1")
+        second = self._upload(b"%PDF v2", document_id=first.json()["document_id"])
+        
+        assert first.json()["document_id"] == first.json()["s3_key"]
+        assert second.json()["s3_key"] != first.json()["s3_key"]
+        assert mock_schedule.call_args_list[1].args[5] == first.json()["s3_key"]
+    
+    @patch('src.api.routes._process_document_background')
+    @patch('src.api.routes.task_manager')
+    @patch('src.api.routes.s3_client')
+    def test_small_file_uses_single_put(self, mock_s3_client, mock_task_manager, mock_background, tmp_path):
+        """Test files that fit in one part are uploaded with a single PUT"""
+        mock_s3_client.put_object.return_value = "https://bucket/report.pdf"
+        mock_task_manager.create_task.return_value = "task-1"
+        
+        with patch('src.api.routes.upload_spool', UploadSpool(directory=str(tmp_path), enabled=True)) as spool:
+            response = self._upload(b"%PDF small")
+            
+            assert response.status_code == 200
+            assert response.json()["size"] == 10
+            mock_s3_client.put_object.assert_called_once()
+            mock_s3_client.create_multipart_upload.assert_not_called()
+            # The uploading worker keeps a local copy for its background task
+            dest = tmp_path / "report.pdf"
+            assert spool.checkout(response.json()["s3_key"], str(dest))
+            assert dest.read_bytes() == b"%PDF small"
+    
+    @patch('src.api.routes._process_document_background')
+    @patch('src.api.routes.task_manager')
+    @patch('src.api.routes.s3_client')
+    def test_file_of_exactly_one_part_uses_single_put(self, mock_s3_client, mock_task_manager, mock_background):
+        """Test a file filling exactly one part is not sent as a multipart upload"""
+        mock_s3_client.put_object.return_value = "https://bucket/report.pdf"
+        
+        with patch('src.api.routes.settings.S3_MULTIPART_CHUNKSIZE', 5 * self.MB):
+            response = self._upload(b"x" * (5 * self.MB))
+        
+        assert response.status_code == 200
+        assert len(mock_s3_client.put_object.call_args.args[0]) == 5 * self.MB
+        mock_s3_client.create_multipart_upload.assert_not_called()
+    
+    @patch('src.api.routes._process_document_background')
+    @patch('src.api.routes.task_manager')
+    @patch('src.api.routes.s3_client')
+    def test_large_file_uses_multipart_upload(self, mock_s3_client, mock_task_manager, mock_background):
+        """Test large files are sent part by part and then completed"""
+        mock_s3_client.create_multipart_upload.return_value = "upload-1"
+        mock_s3_client.upload_part.side_effect = lambda key, upload_id, number, data: {
+            "PartNumber": number, "ETag": f"etag-{number}", "Size": len(data)
+        }
+        mock_s3_client.complete_multipart_upload.return_value = "https://bucket/report.pdf"
+        mock_task_manager.create_task.return_value = "task-1"
+        
+        with patch('src.api.routes.settings.S3_MULTIPART_CHUNKSIZE', 5 * self.MB):
+            response = self._upload(b"x" * (12 * self.MB))
+        
+        assert response.status_code == 200
+        assert response.json()["size"] == 12 * self.MB
+        _, _, parts = mock_s3_client.complete_multipart_upload.call_args.args
+        assert [part["PartNumber"] for part in parts] == [1, 2, 3]
+        assert [part["Size"] for part in parts] == [5 * self.MB, 5 * self.MB, 2 * self.MB]
+        mock_s3_client.put_object.assert_not_called()
+        mock_s3_client.abort_multipart_upload.assert_not_called()
+    
+    @patch('src.api.routes.task_manager')
+    @patch('src.api.routes.s3_client')
+    def test_oversized_file_aborts_multipart_upload(self, mock_s3_client, mock_task_manager):
+        """Test the size limit is enforced while streaming and the upload is aborted"""
+        mock_s3_client.create_multipart_upload.return_value = "upload-1"
+        mock_s3_client.upload_part.return_value = {"PartNumber": 1, "ETag": "etag"}
+        
+        with patch('src.api.routes.settings.S3_MULTIPART_CHUNKSIZE', 5 * self.MB), \
+                patch('src.api.routes.settings.MAX_FILE_SIZE', 8 * self.MB):
+            response = self._upload(b"x" * (12 * self.MB))
+        
+        assert response.status_code == 413
+        mock_s3_client.abort_multipart_upload.assert_called_once()
+        assert mock_s3_client.abort_multipart_upload.call_args.args[1] == "upload-1"
+        mock_s3_client.complete_multipart_upload.assert_not_called()
+        mock_task_manager.create_task.assert_not_called()
+    
+    @patch('src.api.routes.s3_client')
+    def test_empty_file_rejected(self, mock_s3_client):
+        """Test empty uploads are rejected before anything is sent to S3"""
+        response = self._upload(b"")
+        
+        assert response.status_code == 400
+        mock_s3_client.put_object.assert_not_called()
+
+
+class TestS3Download:
+    """Test streaming S3 downloads used by document processing"""
+    
+    @patch('src.api.routes.s3_client')
+    def test_download_from_s3_writes_temp_file(self, mock_s3_client):
+        """Test the object is downloaded to a temp file named after the key"""
+        from src.api.routes import _download_from_s3
+        
+        def download(s3_key, file_path):
+            with open(file_path, 'wb') as f:
+                f.write(b"%PDF")
+            return 4
+        mock_s3_client.download_to_path.side_effect = download
+        
+        path = _download_from_s3("documents/abc/report.pdf")
+        try:
+            assert path.name == "report.pdf"
+            assert path.read_bytes() == b"%PDF"
+        finally:
+            import shutil
+            shutil.rmtree(path.parent, ignore_errors=True)
+    
+    @patch('src.api.routes.tempfile.mkdtemp')
+    @patch('src.api.routes.s3_client')
+    def test_download_from_s3_cleans_up_on_failure(self, mock_s3_client, mock_mkdtemp, tmp_path):
+        """Test the temp directory is removed when the download fails"""
+        from src.api.routes import _download_from_s3
+        
+        temp_dir = tmp_path / "download"
+        temp_dir.mkdir()
+        mock_mkdtemp.return_value = str(temp_dir)
+        mock_s3_client.download_to_path.side_effect = RuntimeError("access denied")
+        
+        with pytest.raises(RuntimeError):
+            _download_from_s3("documents/abc/report.pdf")
+        
+        assert not temp_dir.exists()
+    
+    @patch('src.api.routes.s3_client')
+    @patch('src.api.routes.upload_spool')
+    def test_fetch_document_prefers_local_copy(self, mock_spool, mock_s3_client):
+        """Test documents staged by this worker are not downloaded again"""
+        from src.api.routes import _fetch_document
+        import shutil
+        
+        mock_spool.checkout.return_value = True
+        path = _fetch_document("documents/abc/report.pdf")
+        shutil.rmtree(path.parent, ignore_errors=True)
+        
+        assert path.name == "report.pdf"
+        mock_s3_client.download_to_path.assert_not_called()
+    
+    @patch('src.api.routes.s3_client')
+    @patch('src.api.routes.upload_spool')
+    def test_fetch_document_falls_back_to_s3(self, mock_spool, mock_s3_client):
+        """Test a spool miss downloads the document from S3"""
+        from src.api.routes import _fetch_document
+        import shutil
+        
+        mock_spool.checkout.return_value = False
+        mock_s3_client.download_to_path.return_value = 0
+        path = _fetch_document("documents/abc/report.pdf")
+        shutil.rmtree(path.parent, ignore_errors=True)
+        
+        mock_s3_client.download_to_path.assert_called_once_with("documents/abc/report.pdf", str(path))
+    
+    def test_s3_client_uses_managed_transfer(self, tmp_path):
+        """Test download_to_path delegates to boto3's managed transfer"""
+        from src.config.aws_config import S3Client
+        
+        target = tmp_path / "report.pdf"
+        client = S3Client()
+        client.s3_client = Mock()
+        client.s3_client.download_file.side_effect = lambda bucket, key, path, Config: target.write_bytes(b"data")
+        
+        assert client.download_to_path("documents/report.pdf", str(target)) == 4
+        _, kwargs = client.s3_client.download_file.call_args
+        assert kwargs["Config"] is client.transfer_config
+    
+    def test_s3_client_stream_object_closes_body(self):
+        """Test stream_object yields chunks and closes the body"""
+        from src.config.aws_config import S3Client
+        
+        body = Mock()
+        body.iter_chunks.return_value = iter([b"ab", b"cd"])
+        client = S3Client()
+        client.s3_client = Mock()
+        client.s3_client.get_object.return_value = {"Body": body}
+        
+        assert list(client.stream_object("documents/report.pdf", chunk_size=2)) == [b"ab", b"cd"]
+        body.iter_chunks.assert_called_once_with(2)
+        body.close.assert_called_once()
+
+    
+    def test_s3_client_list_files_follows_pagination(self):
+        """Test list_files returns keys from every listing page"""
+        from src.config.aws_config import S3Client
+        
+        client = S3Client()
+        client.s3_client = Mock()
+        client.s3_client.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": f"docs/{i}.pdf"} for i in range(1000)]},
+            {"Contents": [{"Key": "docs/1000.pdf"}]},
+            {},
+        ]
+        
+        keys = client.list_files("docs/")
+        
+        assert len(keys) == 1001
+        client.s3_client.get_paginator.assert_called_once_with("list_objects_v2")
+
+
+class TestBulkIngestEndpoint:
+    """Test /documents/bulk endpoints"""
+    
+    @patch('src.api.routes.BackgroundTasks.add_task')
+    @patch('src.api.routes.bulk_ingestion')
+    def test_bulk_ingest_starts_parent_task(self, mock_bulk, mock_add_task):
+        """Test a bulk request creates one parent task and schedules the run"""
+        mock_bulk.start.return_value = "bulk-task"
+        client = TestClient(app)
+        
+        response = client.post("/documents/bulk", json={"prefix": "customers/acme/", "workers": 8})
+        
+        assert response.status_code == 200
+        assert response.json()["task_id"] == "bulk-task"
+        mock_bulk.start.assert_called_once_with("customers/acme/", 1000, 200, 8)
+        mock_add_task.assert_called_once()
+    
+    @patch('src.api.routes.bulk_ingestion')
+    def test_resume_unknown_bulk_task(self, mock_bulk):
+        """Test resuming a task without bulk state returns 404"""
+        from src.config.logging import GraphMindException
+        mock_bulk.prepare_resume.side_effect = GraphMindException("No bulk ingestion state found")
+        client = TestClient(app)
+        
+        response = client.post("/documents/bulk/missing/resume")
+        
+        assert response.status_code == 404
+    
+    @patch('src.api.routes.task_manager')
+    @patch('src.api.routes.bulk_ingestion')
+    def test_bulk_status_filters_failures(self, mock_bulk, mock_task_manager):
+        """Test the status endpoint can list only failed documents"""
+        mock_bulk.get_config.return_value = {"prefix": "docs/"}
+        mock_bulk.get_documents.return_value = {
+            "docs/a.pdf": {"status": "completed"},
+            "docs/b.pdf": {"status": "failed", "error": "corrupt"},
+        }
+        mock_task_manager.get_task_status.return_value = {"status": "processing"}
+        client = TestClient(app)
+        
+        response = client.get("/documents/bulk/bulk-task", params={"failed_only": True})
+        
+        assert response.status_code == 200
+        assert list(response.json()["documents"]) == ["docs/b.pdf"]
+    
+    @patch('src.api.routes.task_manager')
+    @patch('src.api.routes.bulk_ingestion')
+    def test_background_run_failure_marks_task_failed(self, mock_bulk, mock_task_manager):
+        """Test a run that fails before it starts does not leave the task processing"""
+        from src.api.routes import _run_bulk_ingestion_background
+        from src.config.logging import GraphMindException
+        mock_bulk.run.side_effect = GraphMindException("No bulk ingestion state found")
+        
+        _run_bulk_ingestion_background("bulk-task")
+        
+        mock_task_manager.mark_task_failed.assert_called_once_with("bulk-task", "No bulk ingestion state found")
+
+
+class TestJobQueue:
+    """Test the Redis job queue against fakeredis"""
+    
+    @pytest.fixture
+    def queue(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        from src.components.tasks.job_queue import JobQueue
+        return JobQueue(name="test", connection=fakeredis.FakeRedis(decode_responses=True),
+                        visibility_timeout=60, max_attempts=2, retry_backoff=0)
+    
+    def test_reserve_and_ack(self, queue):
+        """Test a job is leased once and removed when acknowledged"""
+        job_id = queue.enqueue("process_document", {"task_id": "t1"})
+        
+        job = queue.reserve(timeout=0.1)
+        
+        assert job.id == job_id and job.attempts == 1
+        assert queue.reserve(timeout=0.1) is None
+        queue.ack(job)
+        assert queue.stats() == {"ready": 0, "processing": 0, "delayed": 0, "dead": 0}
+        assert queue.get_job(job_id) is None
+    
+    def test_failed_job_is_retried_then_dead_lettered(self, queue):
+        """Test failures back off into a retry and end in the dead-letter list"""
+        queue.enqueue("process_document", {"task_id": "t1"})
+        
+        assert queue.fail(queue.reserve(timeout=0.1), "boom") is True
+        retry = queue.reserve(timeout=0.1)
+        assert retry.attempts == 2 and retry.last_error == "boom"
+        assert queue.fail(retry, "boom again") is False
+        
+        assert queue.stats()["dead"] == 1
+        assert [job.last_error for job in queue.dead_letters()] == ["boom again"]
+    
+    def test_retry_waits_for_backoff(self, queue):
+        """Test a retry is not handed out before its backoff elapses"""
+        queue.retry_backoff = 60
+        queue.enqueue("process_document", {})
+        queue.fail(queue.reserve(timeout=0.1), "boom")
+        
+        assert queue.reserve(timeout=0.1) is None
+        assert queue.stats()["delayed"] == 1
+        assert queue.backoff(3) == 240
+    
+    def test_expired_lease_is_redelivered(self, queue):
+        """Test a job whose worker died is handed to the next worker"""
+        queue.visibility_timeout = 0.01
+        job_id = queue.enqueue("process_document", {})
+        queue.reserve(timeout=0.1)
+        time.sleep(0.05)
+        
+        job = queue.reserve(timeout=0.1)
+        
+        assert job.id == job_id and job.attempts == 2
+    
+    def test_job_moved_without_a_lease_is_redelivered(self, queue):
+        """Test a job whose worker died between the move and the lease write is not lost"""
+        job_id = queue.enqueue("process_document", {})
+        queue.redis.lmove(queue.ready_key, queue.processing_key, "RIGHT", "LEFT")
+        
+        assert queue.reserve(timeout=0.1) is None
+        with patch("src.components.tasks.job_queue.time.time", return_value=time.time() + 120):
+            assert queue.reap() == 1
+        
+        assert queue.reserve(timeout=0.1).id == job_id
+        assert queue.redis.zcard(queue.orphans_key) == 0
+    
+    def test_job_outliving_its_attempts_is_dead_lettered(self, queue):
+        """Test a job that keeps losing its lease ends up dead-lettered"""
+        dead = []
+        queue.on_dead_letter = dead.append
+        queue.visibility_timeout = 0.01
+        queue.enqueue("process_document", {"task_id": "t1"})
+        queue.reserve(timeout=0.1)
+        time.sleep(0.05)
+        queue.reserve(timeout=0.1)
+        time.sleep(0.05)
+        
+        assert queue.reserve(timeout=0.1) is None
+        assert [job.payload["task_id"] for job in dead] == ["t1"]
+        assert queue.stats()["dead"] == 1
+    
+    def test_dead_letter_can_be_requeued(self, queue):
+        """Test a dead-lettered job gets a fresh set of attempts"""
+        queue.max_attempts = 1
+        job_id = queue.enqueue("process_document", {})
+        queue.fail(queue.reserve(timeout=0.1), "boom")
+        
+        assert queue.requeue_dead(job_id)
+        assert queue.reserve(timeout=0.1).attempts == 1
+
+
+class TestIngestionWorker:
+    """Test the standalone ingestion worker"""
+    
+    def _job(self, job_type="process_document"):
+        from src.components.tasks.job_queue import Job
+        return Job(id="job-1", type=job_type, payload={"task_id": "t1", "s3_key": "documents/a/report.pdf"}, attempts=1)
+    
+    def test_successful_job_is_acked(self):
+        """Test a job whose handler succeeds is acknowledged"""
+        from src.components.tasks.worker import IngestionWorker
+        handler = Mock()
+        queue = Mock(visibility_timeout=60)
+        worker = IngestionWorker(queue=queue, handlers={"process_document": handler}, workflow_manager=Mock())
+        
+        assert worker.run_job(self._job()) is True
+        handler.assert_called_once()
+        queue.ack.assert_called_once()
+    
+    @patch('src.components.tasks.worker.task_manager')
+    def test_failed_job_marks_task_retrying(self, mock_task_manager):
+        """Test a failure that will be retried leaves the task pending"""
+        from src.components.tasks.worker import IngestionWorker
+        queue = Mock(visibility_timeout=60)
+        queue.fail.return_value = True
+        worker = IngestionWorker(queue=queue, handlers={"process_document": Mock(side_effect=RuntimeError("s3 down"))},
+                                 workflow_manager=Mock())
+        
+        assert worker.run_job(self._job()) is False
+        queue.ack.assert_not_called()
+        mock_task_manager.mark_task_retrying.assert_called_once_with("t1", "s3 down", 1)
+    
+    @patch('src.components.tasks.worker.task_manager')
+    def test_unknown_job_type_fails(self, mock_task_manager):
+        """Test jobs without a handler are failed rather than acked"""
+        from src.components.tasks.worker import IngestionWorker
+        queue = Mock(visibility_timeout=60)
+        queue.fail.return_value = False
+        worker = IngestionWorker(queue=queue, handlers={}, workflow_manager=Mock())
+        
+        assert worker.run_job(self._job("unknown")) is False
+        mock_task_manager.mark_task_failed.assert_called_once()
+    
+    @patch('src.components.data_ingestion.ingestion_pipeline.cleanup_fetched')
+    @patch('src.components.data_ingestion.ingestion_pipeline.fetch_from_s3')
+    @patch('src.components.tasks.worker.task_manager')
+    def test_process_document_job_runs_workflow(self, mock_task_manager, mock_fetch, mock_cleanup):
+        """Test the document job downloads, processes and completes the task"""
+        from src.components.tasks.worker import process_document_job
+        mock_fetch.return_value = "/tmp/x/report.pdf"
+        workflow_manager = Mock()
+        workflow_manager.process_documents.return_value = {"success": True, "chunks_created": 3}
+        
+        process_document_job(self._job(), workflow_manager)
+        
+        mock_cleanup.assert_called_once_with("/tmp/x/report.pdf")
+        result = mock_task_manager.mark_task_completed.call_args.args[1]
+        assert result["s3_key"] == "documents/a/report.pdf"
+
+
+class TestQueuedIngestion:
+    """Test that the API enqueues ingestion in queue mode"""
+    
+    @patch('src.api.routes.settings')
+    @patch('src.api.routes.BackgroundTasks.add_task')
+    @patch('src.api.routes.job_queue')
+    @patch('src.api.routes.task_manager')
+    def test_process_document_enqueues_job(self, mock_task_manager, mock_job_queue, mock_add_task, mock_settings):
+        """Test background processing goes to the job queue instead of BackgroundTasks"""
+        mock_settings.INGESTION_EXECUTION_MODE = "queue"
+        mock_task_manager.create_task.return_value = "t1"
+        client = TestClient(app)
+        
+        response = client.post(
+            "/documents/process", json={"s3_key": "documents/a/report.pdf", "document_id": "acme/report"}
+        )
+        
+        assert response.status_code == 200
+        job_type, payload = mock_job_queue.enqueue.call_args.args
+        assert job_type == "process_document"
+        assert payload == {
+            "task_id": "t1", "s3_key": "documents/a/report.pdf", "chunk_size": 1000, "chunk_overlap": 200,
+            "document_id": "acme/report"
+        }
+        mock_add_task.assert_not_called()
+
+
+class TestRedisAvailability:
+    """Test RedisClient fails fast while Redis is unreachable"""
+    
+    def test_unreachable_redis_is_not_retried_on_every_call(self):
+        """Test calls skip reconnecting until the retry interval has passed"""
+        from src.components.tasks.redis_client import RedisClient
+        
+        with patch('src.components.tasks.redis_client.settings') as mock_settings, \
+                patch.object(RedisClient, '_connect') as mock_connect:
+            mock_settings.REDIS_URL = "redis://unreachable:6379"
+            mock_settings.REDIS_RETRY_INTERVAL = 30.0
+            client = RedisClient()
+            mock_connect.reset_mock()
+            
+            for _ in range(3):
+                assert client.get_json("query_cache:collection_version") is None
+                assert client.incr("query_cache:collection_version") is None
+            mock_connect.assert_not_called()
+            
+            with patch('time.monotonic', return_value=time.monotonic() + 31):
+                client.get_json("query_cache:collection_version")
+            mock_connect.assert_called_once_with(retries=1, delay=0)
+    
+    def test_connection_error_opens_the_circuit(self):
+        """Test an operation failing on a dropped connection stops further calls for a while"""
+        fakeredis = pytest.importorskip("fakeredis")
+        from src.components.tasks.redis_client import RedisClient
+        server = fakeredis.FakeServer()
+        client = RedisClient()
+        client.redis_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        
+        server.connected = False
+        assert client.get_json("k") is None
+        server.connected = True
+        client.redis_client.set("k", "1")
+        
+        assert client.get_json("k") is None
+        with patch('time.monotonic', return_value=time.monotonic() + 31):
+            assert client.get_json("k") == 1
+
+
+class TestTaskStorage:
+    """Test hash-based task records in RedisClient"""
+    
+    @pytest.fixture
+    def client(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")  # Lua scripting in fakeredis
+        from src.components.tasks.redis_client import RedisClient
+        client = RedisClient()
+        client.redis_client = fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+        return client
+    
+    def test_task_round_trips_as_hash(self, client):
+        """Test nested task fields survive storage as hash fields"""
+        client.set_task("t1", {"status": "pending", "request": {"s3_key": "a.pdf"}, "result": None}, ttl=100)
+        
+        task = client.get_task("t1")
+        
+        assert task["request"] == {"s3_key": "a.pdf"} and task["result"] is None
+        assert client.redis_client.type("task:t1") == "hash"
+    
+    def test_update_keeps_ttl_and_other_fields(self, client):
+        """Test an update writes only its fields and does not reset the TTL"""
+        client.set_task("t1", {"status": "pending", "progress": 0}, ttl=100)
+        client.redis_client.hset("task:t1", "counter", "7")
+        
+        assert client.update_task_status("t1", "processing", progress=50)
+        
+        task = client.get_task("t1")
+        assert task["progress"] == 50 and task["counter"] == 7
+        assert 0 < client.redis_client.ttl("task:t1") <= 100
+    
+    def test_update_can_set_ttl(self, client):
+        """Test finishing a task can shorten its lifetime"""
+        client.set_task("t1", {"status": "processing"}, ttl=100)
+        
+        client.update_task_status("t1", "completed", ttl=10)
+        
+        assert client.redis_client.ttl("task:t1") <= 10
+    
+    def test_progress_does_not_reopen_finished_task(self, client):
+        """Test guarded updates are skipped once the task completed"""
+        client.set_task("t1", {"status": "completed"}, ttl=100)
+        
+        assert not client.update_task_status("t1", "processing", only_if_active=True, progress=40)
+        assert client.get_task("t1")["status"] == "completed"
+    
+    def test_missing_task_is_not_created(self, client):
+        """Test updating an unknown task does not create a partial record"""
+        assert not client.update_task_status("missing", "processing")
+        assert client.get_task("missing") is None
+    
+    def test_legacy_json_task_is_migrated(self, client):
+        """Test tasks stored as JSON strings remain readable and are converted on update"""
+        client.redis_client.set("task:old", json.dumps({"status": "pending", "progress": 0}), ex=100)
+        
+        assert client.get_task("old")["status"] == "pending"
+        assert client.update_task_status("old", "processing", progress=10)
+        assert client.get_task("old")["progress"] == 10
+        assert 0 < client.redis_client.ttl("task:old") <= 100
+    
+    def test_tasks_are_indexed_by_status(self, client):
+        """Test status changes move a task between status indexes"""
+        client.set_task("t1", {"task_id": "t1", "status": "pending"}, ttl=100)
+        client.set_task("t2", {"task_id": "t2", "status": "pending"}, ttl=100)
+        client.update_task_status("t1", "completed")
+        
+        assert client.count_tasks_by_status() == {"pending": 1, "processing": 0, "completed": 1, "failed": 0}
+        tasks, _ = client.list_tasks(status="completed")
+        assert [task["task_id"] for task in tasks] == ["t1"]
+    
+    def test_list_tasks_pages_newest_first(self, client):
+        """Test cursor pagination walks every task once, newest first"""
+        for index in range(5):
+            client.set_task(f"t{index}", {"task_id": f"t{index}", "status": "pending"}, ttl=100)
+        
+        seen = []
+        page, cursor = client.list_tasks(limit=2)
+        seen += [task["task_id"] for task in page]
+        while cursor:
+            page, cursor = client.list_tasks(cursor=cursor, limit=2)
+            seen += [task["task_id"] for task in page]
+        
+        assert seen == ["t4", "t3", "t2", "t1", "t0"]
+    
+    def test_list_tasks_pages_through_equal_scores(self, client):
+        """Test tasks updated at the same instant are neither skipped nor repeated across pages"""
+        with patch("time.time", return_value=time.time()):
+            for index in range(5):
+                client.set_task(f"t{index}", {"task_id": f"t{index}", "status": "pending"}, ttl=100)
+        
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = client.list_tasks(cursor=cursor, limit=2)
+            seen += [task["task_id"] for task in page]
+            if cursor is None:
+                break
+        
+        assert seen == ["t4", "t3", "t2", "t1", "t0"]
+    
+    def test_list_tasks_rejects_malformed_cursors(self, client):
+        """Test cursors that list_tasks did not issue are rejected"""
+        from src.components.tasks.redis_client import InvalidTaskCursor
+        
+        for cursor in ("abc", "1700000000.5", "nan:t1", "x:t1"):
+            with pytest.raises(InvalidTaskCursor):
+                client.list_tasks(cursor=cursor)
+    
+    def test_count_tasks_uses_the_index(self, client):
+        """Test counts cover all matching tasks, not one page"""
+        for index in range(3):
+            client.set_task(f"t{index}", {"task_id": f"t{index}", "status": "pending"}, ttl=100)
+        client.update_task_status("t0", "completed")
+        
+        assert client.count_tasks() == 3
+        assert client.count_tasks("pending") == 2
+    
+    def test_list_tasks_drops_expired_entries(self, client):
+        """Test index entries of expired tasks are removed when listed"""
+        client.set_task("t1", {"task_id": "t1", "status": "pending"}, ttl=100)
+        client.redis_client.delete("task:t1")
+        
+        assert client.list_tasks() == ([], None)
+        assert client.redis_client.zcard("tasks:index:all") == 0
+    
+    def test_cleanup_deletes_old_finished_tasks_only(self, client):
+        """Test cleanup removes finished tasks older than the cutoff and their index entries"""
+        with patch("time.time", return_value=time.time() - 7200):
+            client.set_task("old", {"task_id": "old", "status": "completed"}, ttl=86400)
+            client.set_task("old_pending", {"task_id": "old_pending", "status": "pending"}, ttl=86400)
+        client.set_task("new", {"task_id": "new", "status": "failed"}, ttl=100)
+        
+        assert client.cleanup_completed_tasks(older_than_hours=1) == 1
+        assert client.get_task("old") is None
+        assert client.get_task("old_pending") and client.get_task("new")
+        assert client.redis_client.zscore("tasks:index:all", "old") is None
+    
+    def test_rebuild_indexes_existing_tasks(self, client):
+        """Test tasks stored before indexing are picked up by the migration"""
+        client.redis_client.set("task:legacy", json.dumps({"task_id": "legacy", "status": "failed"}), ex=100)
+        
+        assert client.ensure_task_index() == 1
+        assert client.count_tasks_by_status()["failed"] == 1
+
+
+class TestTaskProgressThrottling:
+    """Test coalescing of frequent progress updates in TaskManager"""
+    
+    def _manager(self):
+        from src.components.tasks.task_manager import TaskManager
+        manager = TaskManager()
+        manager.redis_client = Mock()
+        return manager
+    
+    def test_rapid_updates_are_coalesced(self):
+        """Test only the first and the latest of a burst of updates are written"""
+        from src.config.settings import settings
+        manager = self._manager()
+        
+        with patch.object(settings, "TASK_PROGRESS_MIN_INTERVAL", 0.1):
+            manager.update_task_progress("t1", 10, "Starting")
+            manager.update_task_progress("t1", 20, "Downloading")
+            manager.update_task_progress("t1", 30, "Processing")
+            time.sleep(0.3)
+        
+        calls = manager.redis_client.update_task_status.call_args_list
+        assert [call.kwargs["progress"] for call in calls] == [10, 30]
+        assert calls[1].kwargs["message"] == "Processing"
+    
+    def test_completion_discards_pending_progress(self):
+        """Test a coalesced update is dropped when the task finishes first"""
+        from src.config.settings import settings
+        manager = self._manager()
+        
+        with patch.object(settings, "TASK_PROGRESS_MIN_INTERVAL", 0.1):
+            manager.update_task_progress("t1", 10)
+            manager.update_task_progress("t1", 90)
+            manager.mark_task_completed("t1", {"success": True})
+            time.sleep(0.3)
+        
+        statuses = [call.args[1] for call in manager.redis_client.update_task_status.call_args_list]
+        assert statuses == ["processing", "completed"]
+
+
+class TestTaskEvents:
+    """Test the task progress event stream against fakeredis"""
+    
+    @pytest.fixture
+    def redis_pair(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")  # Lua scripting in fakeredis
+        from src.components.tasks.redis_client import RedisClient
+        server = fakeredis.FakeServer()
+        client = RedisClient()
+        client.redis_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        return client, fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    
+    @staticmethod
+    def _events(frames):
+        events = []
+        for frame in frames:
+            lines = dict(line.split(": ", 1) for line in frame.strip().split("\n") if not line.startswith(":"))
+            if "event" in lines:
+                events.append((lines["event"], int(lines["id"]) if "id" in lines else None, json.loads(lines["data"])))
+        return events
+    
+    def test_stream_sends_snapshot_then_updates_until_done(self, redis_pair):
+        """Test a stream starts from the stored task and ends with the completion event"""
+        from src.components.tasks.task_events import stream_task_events
+        client, async_redis = redis_pair
+        client.set_task("t1", {"task_id": "t1", "status": "pending", "progress": 0}, ttl=100)
+        
+        async def run():
+            frames = []
+            async for frame in stream_task_events("t1", connection=async_redis):
+                frames.append(frame)
+                if "snapshot" in frame:
+                    client.update_task_status("t1", "processing", progress=50)
+                    client.update_task_status("t1", "completed", result={"success": True})
+            return frames
+        
+        events = self._events(asyncio.run(asyncio.wait_for(run(), timeout=5)))
+        
+        assert [(event, event_id) for event, event_id, _ in events] == [("snapshot", 1), ("update", 2), ("update", 3)]
+        assert events[1][2]["progress"] == 50
+        assert events[2][2]["status"] == "completed" and events[2][2]["result"] == {"success": True}
+    
+    def test_reconnect_with_last_event_id_skips_snapshot(self, redis_pair):
+        """Test a client that saw the latest event gets no snapshot and the stream ends"""
+        from src.components.tasks.task_events import stream_task_events
+        client, async_redis = redis_pair
+        client.set_task("t1", {"task_id": "t1", "status": "pending"}, ttl=100)
+        client.update_task_status("t1", "completed")
+        
+        async def run(last_event_id):
+            return [frame async for frame in stream_task_events("t1", last_event_id, connection=async_redis)]
+        
+        assert self._events(asyncio.run(run(2))) == []
+        assert [event for event, _, _ in self._events(asyncio.run(run(1)))] == ["snapshot"]
+    
+    def test_unknown_task_returns_404(self):
+        """Test the endpoint answers 404 for a task that does not exist"""
+        from src.components.tasks.task_events import TaskNotFound
+        
+        async def missing(task_id, last_event_id=None):
+            raise TaskNotFound(f"Task {task_id} not found")
+            yield
+        
+        with patch("src.api.routes.stream_task_events", missing):
+            response = TestClient(app).get("/tasks/missing/events")
+        
+        assert response.status_code == 404
+
+
 class TestTaskStatusEndpoint:
     """Test /tasks/{task_id} endpoint"""
     
@@ -125,6 +1030,27 @@ class TestTaskStatusEndpoint:
         response = client.get("/tasks/non-existent-task-id")
         
         assert response.status_code == 404
+    
+    @patch('src.api.routes.task_manager')
+    def test_list_tasks_reports_the_full_count(self, mock_task_manager):
+        """Test total counts every matching task, not just the page"""
+        mock_task_manager.list_tasks.return_value = ([{"task_id": "t1"}], "1.0:t1")
+        mock_task_manager.count_tasks.return_value = 7
+        
+        response = TestClient(app).get("/tasks", params={"status": "pending", "limit": 1})
+        
+        assert response.json()["total"] == 7
+        mock_task_manager.count_tasks.assert_called_once_with("pending")
+    
+    @patch('src.api.routes.task_manager')
+    def test_list_tasks_rejects_malformed_cursor(self, mock_task_manager):
+        """Test a malformed cursor is a client error"""
+        from src.components.tasks.redis_client import InvalidTaskCursor
+        mock_task_manager.list_tasks.side_effect = InvalidTaskCursor("Invalid task cursor: 'abc'")
+        
+        response = TestClient(app).get("/tasks", params={"cursor": "abc"})
+        
+        assert response.status_code == 400
 
 
 class TestDocumentStatsEndpoint:
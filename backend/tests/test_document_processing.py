@@ -5,9 +5,15 @@ from unittest.mock import Mock, patch, MagicMock
 from langchain_core.documents import Document
 
 from src.components.data_ingestion.doc_loader import DocumentLoader
+from src.components.data_ingestion.upload_spool import UploadSpool
 from src.components.processing.chunking import create_chunker, Chunker
 from src.components.processing.embeddings import EmbeddingGenerator
-from src.components.processing.vector_store import create_vector_store, ChromaVectorStore
+from src.components.processing.embedding_cache import EmbeddingCache
+from src.components.processing.vector_store import create_vector_store, ChromaVectorStore, make_chunk_id
+from src.components.processing.chunk_manifest import LocalChunkManifestStore, sync_document_chunks, chunk_keys
+from src.components.data_ingestion.ingestion_pipeline import IngestionPipeline, DocumentResult
+from src.components.data_ingestion.bulk_ingestion import BulkIngestion
+from src.components.data_ingestion.parser_pool import ParserPool, parse_document
 from src.config.logging import GraphMindException
 
 
@@ -42,6 +48,17 @@ class TestDocumentLoading:
         if os.path.exists(temp_path):
             os.unlink(temp_path)
     
+    def test_load_document_sets_document_hash(self, temp_test_file):
+        """Test loaded documents carry the file's content hash"""
+        import hashlib
+        loader = DocumentLoader()
+        documents, metadata = loader.load_documents(temp_test_file)
+        
+        with open(temp_test_file, 'rb') as f:
+            expected = hashlib.sha256(f.read()).hexdigest()
+        assert metadata["document_hash"] == expected
+        assert all(doc.metadata["document_hash"] == expected for doc in documents)
+    
     def test_load_document_success(self, temp_test_file):
         """Test successful document loading"""
         loader = DocumentLoader()
@@ -85,6 +102,116 @@ class TestDocumentLoading:
                 loader.load_documents(temp_test_file)
             
             assert "File too large" in str(exc_info.value) or "too large" in str(exc_info.value).lower()
+    
+    def _write_pdf(self, path, pages):
+        import pymupdf
+        pdf = pymupdf.open()
+        for text in pages:
+            pdf.new_page().insert_text((72, 72), text)
+        pdf.save(str(path))
+        pdf.close()
+    
+    def test_lazy_load_streams_pdf_pages(self, tmp_path):
+        """Test PDFs are yielded page by page with file metadata attached"""
+        path = tmp_path / "report.pdf"
+        self._write_pdf(path, ["First page", "Second page", "Third page"])
+        
+        pages = DocumentLoader().lazy_load_documents(str(path))
+        first = next(pages)
+        rest = list(pages)
+        
+        assert "First page" in first.page_content
+        assert first.metadata["page"] == 0 and first.metadata["total_pages"] == 3
+        assert first.metadata["file_name"] == "report.pdf" and first.metadata["document_hash"]
+        assert [page.metadata["page"] for page in rest] == [1, 2]
+    
+    def test_lazy_load_missing_file_raises(self):
+        """Test lazy loading validates the file on first use"""
+        with pytest.raises(GraphMindException):
+            next(DocumentLoader().lazy_load_documents("/nonexistent/path/file.pdf"))
+
+
+class TestUploadSpool:
+    """Test the local staging spool for uploaded documents"""
+    
+    def _stage(self, spool, s3_key, content):
+        writer = spool.open_writer(s3_key)
+        writer.write(content)
+        writer.commit()
+    
+    def test_checkout_returns_staged_copy(self, tmp_path):
+        """Test a staged upload can be checked out by S3 key"""
+        spool = UploadSpool(directory=str(tmp_path / "spool"), max_bytes=1024, enabled=True)
+        self._stage(spool, "documents/1/report.pdf", b"%PDF-1.4")
+        
+        dest = tmp_path / "report.pdf"
+        assert spool.checkout("documents/1/report.pdf", str(dest)) is True
+        assert dest.read_bytes() == b"%PDF-1.4"
+        assert spool.stats()["hits"] == 1
+    
+    def test_checkout_miss_for_unknown_key(self, tmp_path):
+        """Test keys staged by another worker are reported as misses"""
+        spool = UploadSpool(directory=str(tmp_path / "spool"), max_bytes=1024, enabled=True)
+        
+        assert spool.checkout("documents/2/other.pdf", str(tmp_path / "other.pdf")) is False
+        assert spool.stats()["misses"] == 1
+    
+    def test_identical_uploads_share_one_file(self, tmp_path):
+        """Test content addressing stores duplicate uploads once"""
+        spool = UploadSpool(directory=str(tmp_path / "spool"), max_bytes=1024, enabled=True)
+        self._stage(spool, "documents/1/a.pdf", b"same bytes")
+        self._stage(spool, "documents/2/a.pdf", b"same bytes")
+        
+        stats = spool.stats()
+        assert stats["files"] == 1
+        assert stats["keys"] == 2
+        assert stats["total_bytes"] == len(b"same bytes")
+    
+    def test_least_recently_used_files_are_evicted(self, tmp_path):
+        """Test the spool stays under its size limit by evicting old files"""
+        spool = UploadSpool(directory=str(tmp_path / "spool"), max_bytes=20, enabled=True)
+        self._stage(spool, "documents/1/a.pdf", b"a" * 10)
+        self._stage(spool, "documents/2/b.pdf", b"b" * 10)
+        # Touch a so that b becomes the eviction candidate
+        assert spool.checkout("documents/1/a.pdf", str(tmp_path / "a.pdf"))
+        self._stage(spool, "documents/3/c.pdf", b"c" * 10)
+        
+        assert spool.stats()["total_bytes"] == 20
+        assert spool.stats()["evictions"] == 1
+        assert spool.checkout("documents/2/b.pdf", str(tmp_path / "b.pdf")) is False
+        # Checked-out copies survive eviction of the spooled file
+        assert (tmp_path / "a.pdf").read_bytes() == b"a" * 10
+    
+    def test_aborted_upload_is_not_staged(self, tmp_path):
+        """Test aborted writes leave nothing behind"""
+        spool = UploadSpool(directory=str(tmp_path / "spool"), max_bytes=1024, enabled=True)
+        writer = spool.open_writer("documents/1/report.pdf")
+        writer.write(b"partial")
+        writer.abort()
+        
+        assert list(spool.directory.iterdir()) == []
+        assert spool.checkout("documents/1/report.pdf", str(tmp_path / "report.pdf")) is False
+    
+    def test_spools_of_exited_workers_are_removed(self, tmp_path):
+        """Test directories left by dead processes are swept while live ones are kept"""
+        base = tmp_path / "spool"
+        dead = base / "worker-99999999"
+        live = base / f"worker-{os.getppid()}"
+        for directory in (dead, live):
+            directory.mkdir(parents=True)
+            (directory / "leftover.pdf").write_bytes(b"x" * 10)
+        spool = UploadSpool(directory=str(base), max_bytes=1024, enabled=True)
+        
+        self._stage(spool, "documents/1/report.pdf", b"%PDF-1.4")
+        
+        assert not dead.exists()
+        assert (live / "leftover.pdf").exists()
+    
+    def test_disabled_spool_does_not_stage(self, tmp_path):
+        """Test no writer is created when the spool is disabled"""
+        spool = UploadSpool(directory=str(tmp_path / "spool"), enabled=False)
+        
+        assert spool.open_writer("documents/1/report.pdf") is None
 
 
 class TestDocumentChunking:
@@ -113,6 +240,20 @@ class TestDocumentChunking:
         assert all(isinstance(chunk, Document) for chunk in chunks)
         assert all(len(chunk.page_content) > 0 for chunk in chunks)
     
+    def test_chunker_honours_size_overrides(self):
+        """Test per-request chunk size and overlap reach the splitter"""
+        chunker = create_chunker("recursive", chunk_size=100, chunk_overlap=10)
+        
+        assert chunker.splitter._chunk_size == 100
+        assert chunker.splitter._chunk_overlap == 10
+        chunks = chunker.chunk_text("word " * 200)
+        assert all(len(chunk.page_content) <= 100 for chunk in chunks)
+    
+    def test_chunker_rejects_overlap_not_smaller_than_size(self):
+        """Test invalid chunk size/overlap combinations are rejected"""
+        with pytest.raises(GraphMindException):
+            create_chunker("recursive", chunk_size=100, chunk_overlap=100)
+    
     def test_chunk_documents_token(self, sample_documents):
         """Test token-based chunking"""
         # Patch the settings to use a valid OpenAI model for tiktoken
@@ -127,6 +268,14 @@ class TestDocumentChunking:
             assert len(chunks) > 0
             assert all(isinstance(chunk, Document) for chunk in chunks)
     
+    def test_lazy_chunking_matches_eager_chunking(self, sample_documents):
+        """Test chunking a page stream yields the same chunks as chunking a list"""
+        chunker = create_chunker(strategy="recursive", chunk_size=100, chunk_overlap=20)
+        
+        lazy = list(chunker.chunk_documents_lazy(iter(sample_documents)))
+        
+        assert [c.page_content for c in lazy] == [c.page_content for c in chunker.chunk_documents(sample_documents)]
+    
     def test_chunk_text_with_metadata(self):
         """Test chunking text with custom metadata"""
         chunker = create_chunker("recursive")
@@ -213,6 +362,92 @@ class TestEmbeddingGeneration:
         assert embeddings == batch_1 + batch_2
 
 
+class TestEmbeddingCache:
+    """Test caching of computed embeddings"""
+    
+    def test_round_trip_through_disk(self, tmp_path):
+        """Test embeddings survive a new cache instance via SQLite"""
+        path = str(tmp_path / "embeddings.sqlite")
+        EmbeddingCache("model-a", path=path).set_many(["header"], [[0.5, 0.25]])
+        
+        cache = EmbeddingCache("model-a", path=path)
+        assert cache.get_many(["header", "body"]) == [[0.5, 0.25], None]
+        assert cache.stats()["disk_hits"] == 1
+        assert cache.stats()["misses"] == 1
+    
+    def test_keys_include_model_and_kind(self, tmp_path):
+        """Test other models and query embeddings do not share entries"""
+        path = str(tmp_path / "embeddings.sqlite")
+        EmbeddingCache("model-a", path=path).set_many(["text"], [[1.0]])
+        
+        assert EmbeddingCache("model-b", path=path).get_many(["text"]) == [None]
+        assert EmbeddingCache("model-a", path=path).get_many(["text"], kind="query") == [None]
+    
+    def test_memory_tier_is_bounded(self, tmp_path):
+        """Test the in-memory LRU keeps at most max_memory_entries"""
+        cache = EmbeddingCache("model-a", path=str(tmp_path / "embeddings.sqlite"), max_memory_entries=2)
+        cache.set_many(["a", "b", "c"], [[1.0], [2.0], [3.0]])
+        
+        assert cache.stats()["memory_size"] == 2
+        assert cache.get_many(["a"]) == [[1.0]]
+    
+    def test_repeated_keys_are_counted_per_lookup(self, tmp_path):
+        """Test duplicates in one call are looked up once but counted per occurrence"""
+        path = str(tmp_path / "embeddings.sqlite")
+        EmbeddingCache("model-a", path=path).set_many(["disk"], [[0.5]])
+        cache = EmbeddingCache("model-a", path=path)
+        cache.set_many(["memory"], [[1.0]])
+        
+        vectors = cache.get_many(["memory", "disk", "disk", "new", "new", "memory"])
+        
+        assert vectors == [[1.0], [0.5], [0.5], None, None, [1.0]]
+        stats = cache.stats()
+        assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (2, 2, 2)
+    
+    def _generator(self, mock_model, tmp_path):
+        with patch('src.components.processing.embeddings.HuggingFaceEmbeddings', return_value=mock_model), \
+                patch('src.components.processing.embeddings.settings') as mock_settings:
+            mock_settings.CHROMA_USE_CLOUD = False
+            mock_settings.EMBEDDING_MODEL = "test-model"
+            mock_settings.EMBEDDING_DEVICE = "cpu"
+            mock_settings.EMBEDDING_BATCH_SIZE = 2
+            return EmbeddingGenerator(cache=EmbeddingCache("test-model", path=str(tmp_path / "embeddings.sqlite")))
+    
+    def test_generator_only_embeds_misses(self, tmp_path):
+        """Test repeated and previously seen texts are not re-embedded"""
+        mock_model = Mock()
+        mock_model.embed_documents.side_effect = lambda texts: [[float(len(text))] for text in texts]
+        generator = self._generator(mock_model, tmp_path)
+        
+        generator.embed_documents(["footer", "page one"])
+        embeddings = generator.embed_documents(["footer", "page two", "page two"])
+        
+        assert embeddings == [[6.0], [8.0], [8.0]]
+        assert mock_model.embed_documents.call_args_list[-1].args[0] == ["page two"]
+    
+    def test_batch_embedding_sends_only_misses(self, tmp_path):
+        """Test embed_documents_batch batches only uncached texts"""
+        mock_model = Mock()
+        mock_model.embed_documents.side_effect = lambda texts: [[float(len(text))] for text in texts]
+        generator = self._generator(mock_model, tmp_path)
+        generator.embed_documents(["disclaimer"])
+        
+        embeddings = generator.embed_documents_batch(["disclaimer", "a", "bb", "ccc"], batch_size=2)
+        
+        assert embeddings == [[10.0], [1.0], [2.0], [3.0]]
+        assert [call.args[0] for call in mock_model.embed_documents.call_args_list[1:]] == [["a", "bb"], ["ccc"]]
+    
+    def test_query_embeddings_are_cached(self, tmp_path):
+        """Test repeated queries are embedded once"""
+        mock_model = Mock()
+        mock_model.embed_query.return_value = [0.5]
+        generator = self._generator(mock_model, tmp_path)
+        
+        assert generator.embed_query("what is ai") == [0.5]
+        assert generator.embed_query("what is ai") == [0.5]
+        mock_model.embed_query.assert_called_once()
+
+
 class TestVectorStoreOperations:
     """Test vector store operations"""
     
@@ -303,6 +538,468 @@ class TestVectorStoreOperations:
         assert health["status"] == "healthy"
 
 
+class TestVectorUpserts:
+    """Test batched, idempotent upserts into the vector store"""
+    
+    def _store(self):
+        with patch.object(ChromaVectorStore, '_initialize_vector_store'), \
+                patch('src.components.processing.vector_store.settings') as mock_settings:
+            mock_settings.CHROMA_USE_CLOUD = True
+            mock_settings.CHROMA_API_KEY = "key"
+            store = ChromaVectorStore()
+        store.client = Mock()
+        store.vector_store = Mock()
+        return store
+    
+    def _chunks(self, count):
+        return [
+            Document(page_content=f"chunk {i}", metadata={"document_hash": "abc", "page": 0, "start_index": i * 10})
+            for i in range(count)
+        ]
+    
+    def test_chunk_ids_are_deterministic(self):
+        """Test IDs come from document hash, page and offset"""
+        chunk = Document(page_content="text", metadata={"document_hash": "abc", "page": 2, "start_index": 40})
+        
+        assert make_chunk_id(chunk) == "abc:2:40"
+        assert make_chunk_id(Document(page_content="x")) == make_chunk_id(Document(page_content="x"))
+        assert make_chunk_id(Document(page_content="x")) != make_chunk_id(Document(page_content="y"))
+    
+    def test_add_documents_upserts_in_batches(self):
+        """Test documents are sent in batches with their IDs"""
+        store = self._store()
+        
+        with patch('src.components.processing.vector_store.settings') as mock_settings:
+            mock_settings.VECTOR_UPSERT_BATCH_SIZE = 2
+            mock_settings.VECTOR_UPSERT_CONCURRENCY = 1
+            mock_settings.VECTOR_UPSERT_MAX_RETRIES = 0
+            ids = store.add_documents(self._chunks(5))
+        
+        assert ids == [f"abc:0:{i * 10}" for i in range(5)]
+        calls = store.vector_store.add_documents.call_args_list
+        assert [len(call.args[0]) for call in calls] == [2, 2, 1]
+        assert calls[0].kwargs["ids"] == ["abc:0:0", "abc:0:10"]
+    
+    def test_add_documents_is_idempotent(self):
+        """Test re-adding the same chunks reuses the same IDs"""
+        store = self._store()
+        
+        first = store.add_documents(self._chunks(3))
+        second = store.add_documents(self._chunks(3) + self._chunks(1))
+        
+        assert first == second
+    
+    def test_failed_batch_is_retried(self):
+        """Test a transient batch failure is retried"""
+        store = self._store()
+        store.vector_store.add_documents.side_effect = [RuntimeError("timeout"), None]
+        
+        with patch('src.components.processing.vector_store.settings') as mock_settings, \
+                patch('src.components.processing.vector_store.time.sleep'):
+            mock_settings.VECTOR_UPSERT_BATCH_SIZE = 10
+            mock_settings.VECTOR_UPSERT_CONCURRENCY = 1
+            mock_settings.VECTOR_UPSERT_MAX_RETRIES = 2
+            mock_settings.VECTOR_UPSERT_RETRY_BACKOFF = 0.1
+            store.add_documents(self._chunks(3))
+        
+        assert store.vector_store.add_documents.call_count == 2
+    
+    def test_concurrent_batches_raise_on_exhausted_retries(self):
+        """Test persistent failures surface as GraphMindException"""
+        store = self._store()
+        store.vector_store.add_documents.side_effect = RuntimeError("down")
+        
+        with patch('src.components.processing.vector_store.settings') as mock_settings, \
+                patch('src.components.processing.vector_store.time.sleep'):
+            mock_settings.VECTOR_UPSERT_BATCH_SIZE = 1
+            mock_settings.VECTOR_UPSERT_CONCURRENCY = 3
+            mock_settings.VECTOR_UPSERT_MAX_RETRIES = 1
+            mock_settings.VECTOR_UPSERT_RETRY_BACKOFF = 0.1
+            with pytest.raises(GraphMindException):
+                store.add_documents(self._chunks(3))
+
+
+class TestIncrementalIngestion:
+    """Test chunk manifests and incremental re-ingestion"""
+    
+    def _chunks(self, texts, document_hash):
+        return [
+            Document(page_content=text, metadata={"document_hash": document_hash, "page": 0, "start_index": i * 100})
+            for i, text in enumerate(texts)
+        ]
+    
+    def test_chunk_keys_distinguish_repeated_content(self):
+        """Test identical chunks in one document get distinct keys"""
+        keys = chunk_keys(self._chunks(["same", "same", "other"], "v1"))
+        
+        assert keys[0] != keys[1]
+        assert keys[0].endswith("#0") and keys[1].endswith("#1")
+    
+    def test_local_manifest_round_trip(self, tmp_path):
+        """Test the local manifest store persists manifests per document"""
+        store = LocalChunkManifestStore(directory=str(tmp_path))
+        store.set("report.pdf", {"abc#0": "v1:0:0"})
+        
+        assert LocalChunkManifestStore(directory=str(tmp_path)).get("report.pdf") == {"abc#0": "v1:0:0"}
+        assert store.get("other.pdf") is None
+    
+    def test_first_ingest_upserts_all_chunks(self, tmp_path):
+        """Test a document without a manifest is fully upserted"""
+        vector_store = Mock()
+        store = LocalChunkManifestStore(directory=str(tmp_path))
+        
+        stats = sync_document_chunks(vector_store, store, "report.pdf", self._chunks(["a", "b"], "v1"))
+        
+        assert stats == {"chunks_added": 2, "chunks_unchanged": 0, "chunks_removed": 0}
+        assert len(vector_store.add_documents.call_args.args[0]) == 2
+        vector_store.delete_documents.assert_not_called()
+    
+    def test_reingest_only_upserts_changed_chunks(self, tmp_path):
+        """Test a revised document only embeds new chunks and deletes removed ones"""
+        vector_store = Mock()
+        store = LocalChunkManifestStore(directory=str(tmp_path))
+        sync_document_chunks(vector_store, store, "report.pdf", self._chunks(["a", "b", "c"], "v1"))
+        vector_store.reset_mock()
+        
+        stats = sync_document_chunks(vector_store, store, "report.pdf", self._chunks(["a", "c", "d"], "v2"))
+        
+        assert stats == {"chunks_added": 1, "chunks_unchanged": 2, "chunks_removed": 1}
+        upserted = vector_store.add_documents.call_args.args[0]
+        assert [chunk.page_content for chunk in upserted] == ["d"]
+        vector_store.delete_documents.assert_called_once_with(ids=["v1:0:100"])
+    
+    def test_unchanged_reingest_touches_nothing(self, tmp_path):
+        """Test re-ingesting an identical document skips the vector store"""
+        vector_store = Mock()
+        store = LocalChunkManifestStore(directory=str(tmp_path))
+        sync_document_chunks(vector_store, store, "report.pdf", self._chunks(["a", "b"], "v1"))
+        vector_store.reset_mock()
+        
+        stats = sync_document_chunks(vector_store, store, "report.pdf", self._chunks(["a", "b"], "v1"))
+        
+        assert stats["chunks_unchanged"] == 2
+        vector_store.add_documents.assert_not_called()
+        vector_store.delete_documents.assert_not_called()
+        vector_store.update_metadata.assert_not_called()
+    
+    def test_moved_chunks_get_current_metadata(self, tmp_path):
+        """Test unchanged chunks of a revised document keep their vectors but cite the new version"""
+        vector_store = Mock()
+        store = LocalChunkManifestStore(directory=str(tmp_path))
+        sync_document_chunks(vector_store, store, "report.pdf", self._chunks(["a", "b"], "v1"))
+        vector_store.reset_mock()
+        
+        sync_document_chunks(vector_store, store, "report.pdf", self._chunks(["new", "a", "b"], "v2"))
+        
+        kwargs = vector_store.update_metadata.call_args.kwargs
+        assert kwargs["ids"] == ["v1:0:0", "v1:0:100"]
+        assert kwargs["metadatas"] == [
+            {"document_hash": "v2", "page": 0, "start_index": 100},
+            {"document_hash": "v2", "page": 0, "start_index": 200}
+        ]
+    
+    def test_streamed_chunks_are_upserted_before_the_stream_ends(self, tmp_path):
+        """Test a lazy chunk stream is upserted batch by batch while it is consumed"""
+        events = []
+        vector_store = Mock()
+        vector_store.add_documents.side_effect = lambda batch: events.append(("upsert", len(batch)))
+        
+        def stream():
+            for chunk in self._chunks(["a", "b", "c", "d", "e"], "v1"):
+                events.append(("chunk", chunk.page_content))
+                yield chunk
+        
+        stats = sync_document_chunks(
+            vector_store, LocalChunkManifestStore(directory=str(tmp_path)), "report.pdf", stream(), batch_size=2
+        )
+        
+        assert stats == {"chunks_added": 5, "chunks_unchanged": 0, "chunks_removed": 0}
+        assert events.index(("upsert", 2)) < events.index(("chunk", "c"))
+        assert [event for event in events if event[0] == "upsert"] == [("upsert", 2), ("upsert", 2), ("upsert", 1)]
+    
+    def test_same_named_documents_keep_separate_manifests(self, tmp_path):
+        """Test ingesting a file never deletes the vectors of another file with the same name"""
+        from src.workflows.node.document_processing import process_documents
+        from src.workflows.state import GraphState
+        vector_store = Mock()
+        store = LocalChunkManifestStore(directory=str(tmp_path / "manifests"))
+        for prefix in ("acme", "globex"):
+            (tmp_path / prefix).mkdir()
+            (tmp_path / prefix / "report.txt").write_text(f"{prefix} quarterly figures. " * 20)
+        
+        with patch('src.workflows.node.document_processing.get_vector_store', return_value=vector_store), \
+             patch('src.workflows.node.document_processing.get_chunk_manifest_store', return_value=store):
+            process_documents(GraphState(file_path=str(tmp_path / "acme" / "report.txt")))
+            update = process_documents(GraphState(file_path=str(tmp_path / "globex" / "report.txt")))
+        
+        assert update["ingestion_stats"]["chunks_removed"] == 0
+        vector_store.delete_documents.assert_not_called()
+
+
+class TestIngestionPipeline:
+    """Test the pipelined multi-document ingestion"""
+    
+    def _files(self, tmp_path, count):
+        paths = []
+        for i in range(count):
+            path = tmp_path / f"doc{i}.txt"
+            path.write_text(f"Document {i} talks about topic {i}. " * 5)
+            paths.append(str(path))
+        return paths
+    
+    def _pipeline(self, tmp_path, vector_store, **kwargs):
+        options = dict(chunk_size=100, chunk_overlap=10, batch_size=4, batch_linger=0.05)
+        options.update(kwargs)
+        return IngestionPipeline(
+            vector_store=vector_store,
+            manifest_store=LocalChunkManifestStore(directory=str(tmp_path / "manifests")),
+            **options
+        )
+    
+    def test_ingests_every_document(self, tmp_path):
+        """Test each document is upserted and finalised with its manifest"""
+        vector_store = Mock()
+        pipeline = self._pipeline(tmp_path, vector_store)
+        
+        files = self._files(tmp_path, 3)
+        results = pipeline.run(files)
+        
+        assert sorted(result.document_key for result in results) == files
+        assert all(result.success for result in results)
+        upserted = sum(len(call.args[0]) for call in vector_store.add_documents.call_args_list)
+        assert upserted == sum(result.stats["chunks_added"] for result in results)
+        assert pipeline.manifest_store.get(files[0])
+    
+    def test_batches_chunks_across_documents(self, tmp_path):
+        """Test upsert batches are filled with chunks from several documents"""
+        vector_store = Mock()
+        pipeline = self._pipeline(tmp_path, vector_store, batch_size=1000, batch_linger=5)
+        
+        pipeline.run(self._files(tmp_path, 3))
+        
+        vector_store.add_documents.assert_called_once()
+        sources = {chunk.metadata["source"] for chunk in vector_store.add_documents.call_args.args[0]}
+        assert len(sources) == 3
+    
+    def test_precomputed_embeddings_are_upserted(self, tmp_path):
+        """Test the embed stage hands its vectors to the upsert"""
+        vector_store = Mock()
+        embedder = Mock()
+        embedder.embed_documents.side_effect = lambda texts: [[0.1, 0.2] for _ in texts]
+        pipeline = self._pipeline(tmp_path, vector_store, embedder=embedder)
+        
+        pipeline.run(self._files(tmp_path, 1))
+        
+        call = vector_store.add_documents.call_args
+        assert call.kwargs["embeddings"] == [[0.1, 0.2]] * len(call.args[0])
+    
+    def test_failures_are_reported_per_document(self, tmp_path):
+        """Test a missing file fails alone without stopping the other documents"""
+        vector_store = Mock()
+        reported = []
+        pipeline = self._pipeline(tmp_path, vector_store)
+        
+        results = pipeline.run(self._files(tmp_path, 2) + [str(tmp_path / "missing.txt")], on_document=reported.append)
+        
+        assert len(reported) == 3
+        failed = [result for result in results if not result.success]
+        assert [result.document_key for result in failed] == [str(tmp_path / "missing.txt")]
+        assert failed[0].error
+    
+    def _same_named_files(self, tmp_path, texts):
+        paths = []
+        for prefix, text in texts.items():
+            (tmp_path / prefix).mkdir()
+            path = tmp_path / prefix / "report.txt"
+            path.write_text(text * 5)
+            paths.append(str(path))
+        return paths
+    
+    def test_same_named_documents_keep_separate_manifests(self, tmp_path):
+        """Test documents with the same file name under different prefixes do not share a manifest"""
+        vector_store = Mock()
+        files = self._same_named_files(tmp_path, {"acme": "Acme revenue grew. ", "globex": "Globex costs fell. "})
+        pipeline = self._pipeline(tmp_path, vector_store)
+        
+        pipeline.run(files[:1])
+        results = pipeline.run(files[1:])
+        
+        assert results[0].stats["chunks_removed"] == 0
+        vector_store.delete_documents.assert_not_called()
+        assert pipeline.manifest_store.get(files[0]) and pipeline.manifest_store.get(files[1])
+    
+    def test_documents_sharing_a_key_are_synced_in_turn(self, tmp_path):
+        """Test the second of two in-flight documents with one key plans against the first's manifest"""
+        vector_store = Mock()
+        files = self._same_named_files(tmp_path, {"a": "Same text. ", "b": "Same text. "})
+        pipeline = self._pipeline(tmp_path, vector_store, document_key=os.path.basename, chunk_workers=2)
+        
+        results = pipeline.run(files)
+        
+        assert sorted(result.stats["chunks_unchanged"] > 0 for result in results) == [False, True]
+    
+    def test_unchanged_documents_skip_the_vector_store(self, tmp_path):
+        """Test re-running the pipeline over the same files upserts nothing"""
+        vector_store = Mock()
+        files = self._files(tmp_path, 2)
+        self._pipeline(tmp_path, vector_store).run(files)
+        vector_store.reset_mock()
+        
+        results = self._pipeline(tmp_path, vector_store).run(files)
+        
+        assert all(result.success and result.stats["chunks_added"] == 0 for result in results)
+        vector_store.add_documents.assert_not_called()
+
+    
+    def test_parser_pool_replaces_in_process_loading(self, tmp_path):
+        """Test chunks come from the parser pool when one is configured"""
+        vector_store = Mock()
+        parser_pool = Mock()
+        parser_pool.parse.side_effect = lambda path, size, overlap: parse_document(path, size, overlap)
+        pipeline = self._pipeline(tmp_path, vector_store, parser_pool=parser_pool)
+        
+        results = pipeline.run(self._files(tmp_path, 2))
+        
+        assert all(result.success for result in results)
+        assert parser_pool.parse.call_count == 2
+        assert parser_pool.parse.call_args.args[1:] == (100, 10)
+
+
+class TestParserPool:
+    """Test out-of-process document parsing"""
+    
+    def _file(self, tmp_path):
+        path = tmp_path / "report.txt"
+        path.write_text("Parsing happens in a worker process. " * 40)
+        return str(path)
+    
+    def _inline_chunks(self, path):
+        documents, _ = DocumentLoader().load_documents(path)
+        return create_chunker(chunk_size=200, chunk_overlap=20).chunk_documents(documents)
+    
+    def test_compact_payload_rebuilds_identical_chunks(self, tmp_path):
+        """Test the compact payload stores file metadata once and round-trips exactly"""
+        path = self._file(tmp_path)
+        
+        parsed = parse_document(path, chunk_size=200, chunk_overlap=20)
+        
+        assert parsed.page_count == 1
+        assert "document_hash" in parsed.file_metadata
+        assert all("document_hash" not in metadata for metadata in parsed.chunk_metadata)
+        assert parsed.to_chunks() == self._inline_chunks(path)
+    
+    def test_pool_parses_in_worker_process(self, tmp_path):
+        """Test a warm worker process returns the same chunks as inline parsing"""
+        path = self._file(tmp_path)
+        pool = ParserPool(workers=1)
+        try:
+            pool.warm_up()
+            parsed = pool.parse(path, chunk_size=200, chunk_overlap=20)
+        finally:
+            pool.shutdown()
+        
+        assert parsed.to_chunks() == self._inline_chunks(path)
+
+
+class _FakeRedis:
+    """In-memory stand-in for the RedisClient JSON and hash helpers"""
+    
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+    
+    def get_json(self, key):
+        return self.values.get(key)
+    
+    def set_json(self, key, value, ttl=3600):
+        self.values[key] = value
+        return True
+    
+    def set_hash_field(self, key, field, value, ttl=3600):
+        self.hashes.setdefault(key, {})[field] = value
+        return True
+    
+    def get_hash(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+class _FakePipeline:
+    """Reports every source as ingested except those listed as failing"""
+    
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.runs = []
+    
+    def run(self, sources, on_document=None):
+        self.runs.append(list(sources))
+        for source in sources:
+            if source in self.failing:
+                on_document(DocumentResult(source, source, success=False, error="corrupt"))
+            else:
+                on_document(DocumentResult(source, source, success=True, stats={"chunks_added": 1}))
+
+
+class TestBulkIngestion:
+    """Test bulk ingestion progress tracking and resuming"""
+    
+    def _bulk(self, keys, pipeline, redis=None):
+        tasks = Mock()
+        tasks.create_task.return_value = "bulk-task"
+        bulk = BulkIngestion(
+            redis=redis or _FakeRedis(), tasks=tasks,
+            pipeline_factory=lambda **options: pipeline,
+            list_sources=lambda prefix: iter(keys)
+        )
+        return bulk, tasks
+    
+    def test_run_records_each_document(self):
+        """Test every document outcome is recorded and summarised on the parent task"""
+        pipeline = _FakePipeline(failing={"docs/b.pdf"})
+        bulk, tasks = self._bulk(["docs/a.pdf", "docs/b.pdf", "docs/c.pdf"], pipeline)
+        task_id = bulk.start("docs/")
+        
+        result = bulk.run(task_id)
+        
+        assert result["documents_completed"] == 2
+        assert result["failed_documents"] == ["docs/b.pdf"]
+        assert not result["success"]
+        assert bulk.get_documents(task_id)["docs/b.pdf"] == {"status": "failed", "error": "corrupt", "duration": 0.0}
+        tasks.mark_task_completed.assert_called_once_with(task_id, result)
+    
+    def test_resume_skips_completed_documents(self):
+        """Test a resumed run only ingests documents that did not complete"""
+        keys = ["docs/a.pdf", "docs/b.pdf", "docs/c.pdf"]
+        redis = _FakeRedis()
+        bulk, _ = self._bulk(keys, _FakePipeline(failing={"docs/b.pdf"}), redis=redis)
+        task_id = bulk.start("docs/")
+        bulk.run(task_id)
+        
+        retry = _FakePipeline()
+        resumed, tasks = self._bulk(keys, retry, redis=redis)
+        resumed.prepare_resume(task_id)
+        result = resumed.run(task_id)
+        
+        assert retry.runs == [["docs/b.pdf"]]
+        assert result["documents_skipped"] == 2 and result["success"]
+    
+    def test_resume_unknown_task_raises(self):
+        """Test resuming without stored state is rejected"""
+        bulk, _ = self._bulk([], _FakePipeline())
+        
+        with pytest.raises(GraphMindException):
+            bulk.prepare_resume("missing")
+    
+    def test_resume_restores_expired_parent_task(self):
+        """Test an expired parent task is re-created under the same id"""
+        bulk, tasks = self._bulk([], _FakePipeline())
+        task_id = bulk.start("docs/")
+        tasks.get_task_status.return_value = None
+        
+        bulk.prepare_resume(task_id)
+        
+        assert tasks.create_task.call_args.kwargs["task_id"] == task_id
+
+
 class TestDocumentProcessingPipeline:
     """Test complete document processing pipeline"""
     
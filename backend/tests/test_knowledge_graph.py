@@ -6,14 +6,19 @@ from langchain_core.documents import Document
 from src.components.knowledge_graph.entity_extractor import EntityExtractor
 from src.components.knowledge_graph.relationship_extractor import RelationshipExtractor
 from src.components.knowledge_graph.graph_builder import KnowledgeGraphBuilder
+from src.components.knowledge_graph.joint_extractor import JointExtractor
 from src.components.knowledge_graph.orchestrator import GraphOrchestrator
+from src.components.knowledge_graph.extraction_cache import (
+    InMemoryExtractionCache, RedisExtractionCache, TieredExtractionCache, make_cache_key
+)
+from src.services import LLMClientPool
 from src.config.logging import GraphMindException
 
 
 class TestEntityExtractor:
     """Test EntityExtractor.extract_entities() - the core function"""
     
-    @patch('src.components.knowledge_graph.entity_extractor.ChatGoogleGenerativeAI')
+    @patch('src.components.knowledge_graph.entity_extractor.get_llm_client')
     def test_extract_entities_success(self, mock_gemini):
         """Test successful entity extraction"""
         mock_llm = Mock()
@@ -49,7 +54,7 @@ class TestEntityExtractor:
         assert entities[1]["name"] == "Google"
         assert entities[1]["type"] == "ORGANIZATION"
     
-    @patch('src.components.knowledge_graph.entity_extractor.ChatGoogleGenerativeAI')
+    @patch('src.components.knowledge_graph.entity_extractor.get_llm_client')
     def test_extract_entities_handles_invalid_json(self, mock_gemini):
         """Test handling of invalid JSON response"""
         mock_llm = Mock()
@@ -64,7 +69,7 @@ class TestEntityExtractor:
         # Should return empty list when JSON parsing fails
         assert entities == []
     
-    @patch('src.components.knowledge_graph.entity_extractor.ChatGoogleGenerativeAI')
+    @patch('src.components.knowledge_graph.entity_extractor.get_llm_client')
     def test_extract_entities_text_truncation(self, mock_gemini):
         """Test that long text is truncated"""
         mock_llm = Mock()
@@ -87,7 +92,7 @@ class TestEntityExtractor:
 class TestRelationshipExtractor:
     """Test RelationshipExtractor.extract_relationships() - the core function"""
     
-    @patch('src.components.knowledge_graph.relationship_extractor.ChatGoogleGenerativeAI')
+    @patch('src.components.knowledge_graph.relationship_extractor.get_llm_client')
     def test_extract_relationships_success(self, mock_gemini):
         """Test successful relationship extraction"""
         mock_llm = Mock()
@@ -122,7 +127,7 @@ class TestRelationshipExtractor:
         assert relationships[0]["target"] == "Google"
         assert relationships[0]["type"] == "WORKS_FOR"
     
-    @patch('src.components.knowledge_graph.relationship_extractor.ChatGoogleGenerativeAI')
+    @patch('src.components.knowledge_graph.relationship_extractor.get_llm_client')
     def test_extract_relationships_handles_invalid_json(self, mock_gemini):
         """Test handling of invalid JSON response"""
         mock_llm = Mock()
@@ -138,6 +143,60 @@ class TestRelationshipExtractor:
         assert relationships == []
 
 
+class TestJointExtractor:
+    """Test JointExtractor.extract() - single-pass entity and relationship extraction"""
+    
+    @patch('src.components.knowledge_graph.joint_extractor.get_llm_client')
+    def test_extract_returns_entities_and_relationships(self, mock_client):
+        """Test that one LLM call yields both halves of the graph"""
+        mock_client.return_value = Mock()
+        
+        extractor = JointExtractor(cache=InMemoryExtractionCache())
+        extractor.chain = Mock()
+        extractor.chain.invoke.return_value = "```json\n" + json.dumps({
+            "entities": [
+                {"name": "Alice", "type": "PERSON", "confidence": 0.9},
+                {"name": "Google", "type": "ORGANIZATION", "confidence": 0.9},
+                {"description": "missing name"}
+            ],
+            "relationships": [
+                {"source": "Alice", "target": "Google", "type": "WORKS_FOR", "confidence": 0.9}
+            ]
+        }) + "\n```"
+        
+        entities, relationships = extractor.extract("Alice works at Google.")
+        
+        extractor.chain.invoke.assert_called_once()
+        assert [entity["name"] for entity in entities] == ["Alice", "Google"]
+        assert relationships[0]["type"] == "WORKS_FOR"
+        
+        # Output feeds the existing graph builder unchanged
+        graph = KnowledgeGraphBuilder().build_graph(entities, relationships)
+        assert graph["metrics"]["num_edges"] == 1
+        
+        # Second call is served from the cache
+        assert extractor.extract("Alice works at Google.") == (entities, relationships)
+        extractor.chain.invoke.assert_called_once()
+    
+    @patch('src.components.knowledge_graph.orchestrator.JointExtractor')
+    @patch('src.components.knowledge_graph.orchestrator.EntityExtractor')
+    @patch('src.components.knowledge_graph.orchestrator.RelationshipExtractor')
+    def test_orchestrator_joint_strategy_skips_two_pass(self, mock_rel_class, mock_ent_class, mock_joint_class):
+        """Test that the joint strategy makes one extraction call per text"""
+        mock_joint_class.return_value.extract.return_value = (
+            [{"name": "Alice", "type": "PERSON"}, {"name": "Google", "type": "ORGANIZATION"}],
+            [{"source": "Alice", "target": "Google", "type": "WORKS_FOR"}]
+        )
+        
+        orchestrator = GraphOrchestrator(extraction_strategy="joint")
+        result = orchestrator.build_graph_from_text("Alice works at Google.")
+        
+        mock_joint_class.return_value.extract.assert_called_once()
+        mock_ent_class.assert_not_called()
+        mock_rel_class.assert_not_called()
+        assert result["metrics"]["num_edges"] == 1
+
+
 class TestKnowledgeGraphBuilder:
     """Test KnowledgeGraphBuilder.build_graph() - the core function"""
     
@@ -252,8 +311,65 @@ class TestGraphOrchestrator:
         
         assert result == mock_graph_result
     
-    @patch('src.components.knowledge_graph.entity_extractor.ChatGoogleGenerativeAI')
-    @patch('src.components.knowledge_graph.relationship_extractor.ChatGoogleGenerativeAI')
+    @patch('src.components.knowledge_graph.orchestrator.EntityExtractor')
+    @patch('src.components.knowledge_graph.orchestrator.RelationshipExtractor')
+    def test_build_knowledge_graph_per_chunk_merges_results(self, mock_rel_class, mock_ent_class):
+        """Test map-reduce extraction over chunks with deduplication"""
+        chunk_entities = {
+            "Alice works at Google.": [
+                {"name": "Alice", "type": "PERSON", "confidence": 0.8},
+                {"name": "Google", "type": "ORGANIZATION", "confidence": 0.9}
+            ],
+            "alice lives in London.": [
+                {"name": "alice", "type": "PERSON", "confidence": 0.95},
+                {"name": "London", "type": "LOCATION", "confidence": 0.9}
+            ]
+        }
+        chunk_relationships = {
+            "Alice works at Google.": [
+                {"source": "Alice", "target": "Google", "type": "WORKS_FOR", "confidence": 0.9}
+            ],
+            "alice lives in London.": [
+                {"source": "alice", "target": "London", "type": "LOCATED_IN", "confidence": 0.8},
+                {"source": "alice", "target": "Google", "type": "works_for", "confidence": 0.5}
+            ]
+        }
+        mock_ent_class.return_value.extract_entities.side_effect = lambda text: chunk_entities[text]
+        mock_rel_class.return_value.extract_relationships.side_effect = lambda text, entities: chunk_relationships[text]
+        
+        orchestrator = GraphOrchestrator(extraction_mode="per_chunk", max_workers=2)
+        documents = [Document(page_content=text) for text in chunk_entities]
+        result = orchestrator.build_knowledge_graph(documents)
+        
+        # Every chunk was extracted on its own rather than as one truncated blob
+        assert mock_ent_class.return_value.extract_entities.call_count == 2
+        
+        names = sorted(entity["name"] for entity in result["entities"])
+        assert names == ["Google", "London", "alice"]
+        
+        relationships = {(rel["source"], rel["target"], rel["type"]) for rel in result["relationships"]}
+        assert relationships == {("alice", "Google", "WORKS_FOR"), ("alice", "London", "LOCATED_IN")}
+        assert result["metrics"]["num_edges"] == 2
+    
+    @patch('src.components.knowledge_graph.orchestrator.EntityExtractor')
+    @patch('src.components.knowledge_graph.orchestrator.RelationshipExtractor')
+    def test_build_knowledge_graph_per_chunk_tolerates_failed_chunk(self, mock_rel_class, mock_ent_class):
+        """Test that one failing chunk does not fail the whole graph"""
+        def extract(text):
+            if text == "bad":
+                raise GraphMindException("LLM error")
+            return [{"name": "Alice", "type": "PERSON", "confidence": 0.9}]
+        
+        mock_ent_class.return_value.extract_entities.side_effect = extract
+        mock_rel_class.return_value.extract_relationships.return_value = []
+        
+        orchestrator = GraphOrchestrator(extraction_mode="per_chunk")
+        result = orchestrator.build_knowledge_graph([Document(page_content="good"), Document(page_content="bad")])
+        
+        assert [entity["name"] for entity in result["entities"]] == ["Alice"]
+    
+    @patch('src.components.knowledge_graph.entity_extractor.get_llm_client')
+    @patch('src.components.knowledge_graph.relationship_extractor.get_llm_client')
     def test_build_graph_from_text_empty_error(self, mock_rel_gemini, mock_ent_gemini):
         """Test error handling for empty text"""
         # Mock the LLM instances
@@ -267,8 +383,8 @@ class TestGraphOrchestrator:
         
         assert "Text cannot be empty" in str(exc_info.value)
     
-    @patch('src.components.knowledge_graph.entity_extractor.ChatGoogleGenerativeAI')
-    @patch('src.components.knowledge_graph.relationship_extractor.ChatGoogleGenerativeAI')
+    @patch('src.components.knowledge_graph.entity_extractor.get_llm_client')
+    @patch('src.components.knowledge_graph.relationship_extractor.get_llm_client')
     def test_build_knowledge_graph_empty_documents_error(self, mock_rel_gemini, mock_ent_gemini):
         """Test error handling for documents with no content"""
         # Mock the LLM instances
@@ -282,4 +398,148 @@ class TestGraphOrchestrator:
         with pytest.raises(GraphMindException) as exc_info:
             orchestrator.build_knowledge_graph(documents)
         
-        assert "No text content" in str(exc_info.value)
\ No newline at end of file
+        assert "No text content" in str(exc_info.value)
+
+
+class TestLLMClientPool:
+    """Test the process-wide LLM client pool"""
+    
+    @patch('langchain_google_genai.ChatGoogleGenerativeAI')
+    def test_clients_are_shared_per_configuration(self, mock_gemini):
+        """Test that identical configurations reuse one client"""
+        mock_gemini.side_effect = lambda **kwargs: Mock()
+        pool = LLMClientPool()
+        
+        first = pool.get_client(max_retries=5)
+        second = pool.get_client(max_retries=5)
+        other = pool.get_client()
+        
+        assert first is second
+        assert other is not first
+        assert mock_gemini.call_count == 2
+        assert pool.stats()["clients_created"] == 2
+    
+    @patch('langchain_google_genai.ChatGoogleGenerativeAI')
+    def test_chains_cached_only_for_pooled_clients(self, mock_gemini):
+        """Test that chains over pooled clients are built once"""
+        mock_gemini.side_effect = lambda **kwargs: Mock()
+        pool = LLMClientPool()
+        builder = Mock(side_effect=lambda llm: Mock())
+        
+        llm = pool.get_client()
+        chain = pool.get_chain("summary", llm, builder)
+        
+        assert pool.get_chain("summary", llm, builder) is chain
+        assert builder.call_count == 1
+        
+        # Clients from outside the pool never populate the cache
+        pool.get_chain("summary", Mock(), builder)
+        pool.get_chain("summary", Mock(), builder)
+        assert builder.call_count == 3
+        assert pool.stats()["chains_created"] == 1
+    
+    @patch('langchain_google_genai.ChatGoogleGenerativeAI')
+    def test_reset_zeroes_the_counters(self, mock_gemini):
+        """Test stats are consistent with the pool after a reset"""
+        mock_gemini.side_effect = lambda **kwargs: Mock()
+        pool = LLMClientPool()
+        pool.get_chain("summary", pool.get_client(), lambda client: Mock())
+        
+        pool.reset()
+        
+        stats = pool.stats()
+        assert stats["clients"] == stats["clients_created"] == 0
+        assert stats["chains"] == stats["chains_created"] == 0
+    
+    @patch('src.components.knowledge_graph.relationship_extractor.get_llm_client')
+    @patch('src.components.knowledge_graph.entity_extractor.get_llm_client')
+    def test_extractors_use_pooled_client(self, mock_ent_client, mock_rel_client):
+        """Test that extractors take their client from the pool"""
+        shared_llm = Mock()
+        mock_ent_client.return_value = shared_llm
+        mock_rel_client.return_value = shared_llm
+        
+        orchestrator = GraphOrchestrator()
+        
+        assert orchestrator.entity_extractor.llm is shared_llm
+        assert orchestrator.relationship_extractor.llm is shared_llm
+
+
+class TestExtractionCache:
+    """Test the shared extraction result cache"""
+    
+    def test_cache_key_depends_on_model_and_prompt_version(self):
+        """Test that model or prompt changes produce different keys"""
+        key = make_cache_key("entities", "text", "model-a", "1")
+        
+        assert key == make_cache_key("entities", "text", "model-a", "1")
+        assert key != make_cache_key("entities", "text", "model-b", "1")
+        assert key != make_cache_key("entities", "text", "model-a", "2")
+        assert key != make_cache_key("relationships", "text", "model-a", "1")
+    
+    def test_memory_cache_evicts_least_recently_used(self):
+        """Test LRU eviction and hit/miss/eviction counters"""
+        cache = InMemoryExtractionCache(max_entries=2, ttl=0)
+        cache.set("a", [{"name": "A"}])
+        cache.set("b", [{"name": "B"}])
+        cache.get("a")
+        cache.set("c", [{"name": "C"}])
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == [{"name": "A"}]
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["cache_size"] == 2
+    
+    def test_memory_cache_expires_entries(self):
+        """Test TTL expiry"""
+        cache = InMemoryExtractionCache(max_entries=10, ttl=60)
+        cache.set("a", [{"name": "A"}])
+        
+        with patch('src.components.knowledge_graph.extraction_cache.time.monotonic', return_value=1e12):
+            assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+    
+    def test_tiered_cache_promotes_redis_hits(self):
+        """Test that shared Redis hits are copied into the memory tier"""
+        store = {}
+        redis_client = Mock()
+        redis_client.get_json.side_effect = lambda key: store.get(key)
+        redis_client.set_json.side_effect = lambda key, value, ttl: store.__setitem__(key, value)
+        
+        writer = TieredExtractionCache(InMemoryExtractionCache(), RedisExtractionCache(redis_client))
+        reader = TieredExtractionCache(InMemoryExtractionCache(), RedisExtractionCache(redis_client))
+        writer.set("k", [{"name": "A"}])
+        
+        assert reader.get("k") == [{"name": "A"}]
+        assert reader.memory.get("k") == [{"name": "A"}]
+        assert redis_client.get_json.call_count == 1
+    
+    def test_missing_redis_url_falls_back_to_memory(self):
+        """Test the tiered default does not build a Redis tier without REDIS_URL"""
+        from src.components.knowledge_graph.extraction_cache import create_extraction_cache
+        from src.config.settings import settings
+        
+        with patch.object(settings, "REDIS_URL", ""):
+            assert isinstance(create_extraction_cache("tiered"), InMemoryExtractionCache)
+    
+    @patch('src.components.knowledge_graph.entity_extractor.get_llm_client')
+    def test_cache_shared_between_extractor_instances(self, mock_client):
+        """Test that a new extractor reuses results cached by a previous one"""
+        mock_client.return_value = Mock()
+        cache = InMemoryExtractionCache()
+        
+        first = EntityExtractor(cache=cache)
+        first.chain = Mock()
+        first.chain.invoke.return_value = json.dumps({"entities": [{"name": "AI", "type": "CONCEPT"}]})
+        first.extract_entities("AI text")
+        
+        second = EntityExtractor(cache=cache)
+        second.chain = Mock()
+        entities = second.extract_entities("AI text")
+        
+        assert entities == [{"name": "AI", "type": "CONCEPT"}]
+        second.chain.invoke.assert_not_called()
+        assert second.get_cache_stats()["hits"] == 1
@@ -1,8 +1,11 @@
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+import asyncio
+import json
+import threading
+from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from langchain_core.documents import Document
 
-from src.workflows.flow_manager import WorkflowManager
+from src.workflows.flow_manager import WorkflowManager, QueryCapacityExceeded
 from src.workflows.state import GraphState
 from src.workflows.kg_workflow import kg_workflow
 from src.config.logging import GraphMindException
@@ -87,6 +90,103 @@ class TestWorkflowManager:
         assert result["success"] is False
         assert "error" in result
     
+    @patch('src.workflows.flow_manager.kg_workflow')
+    def test_aprocess_query_success(self, mock_workflow):
+        """Test async query processing uses the async workflow entry point"""
+        mock_workflow.ainvoke = AsyncMock(return_value=GraphState(
+            query="What is AI?",
+            summary="AI is artificial intelligence",
+            current_step="complete"
+        ))
+        
+        manager = WorkflowManager()
+        result = asyncio.run(manager.aprocess_query("What is AI?"))
+        
+        assert result["success"] is True
+        assert result["summary"] == "AI is artificial intelligence"
+        mock_workflow.ainvoke.assert_awaited_once()
+        mock_workflow.invoke.assert_not_called()
+        assert manager.get_query_load()["admitted"] == 0
+    
+    @patch('src.workflows.flow_manager.kg_workflow')
+    def test_aprocess_query_rejects_when_saturated(self, mock_workflow):
+        """Test queries beyond running + queued capacity are rejected"""
+        release = None
+        
+        async def slow_invoke(state):
+            await release.wait()
+            return GraphState(query=state.query, summary="done", current_step="complete")
+        
+        mock_workflow.ainvoke = slow_invoke
+        manager = WorkflowManager(max_concurrent_queries=1, query_queue_size=1)
+        
+        async def run():
+            nonlocal release
+            release = asyncio.Event()
+            running = asyncio.ensure_future(manager.aprocess_query("first"))
+            queued = asyncio.ensure_future(manager.aprocess_query("second"))
+            await asyncio.sleep(0)
+            
+            with pytest.raises(QueryCapacityExceeded):
+                await manager.aprocess_query("third")
+            
+            release.set()
+            return await asyncio.gather(running, queued)
+        
+        results = asyncio.run(run())
+        
+        assert all(result["success"] for result in results)
+        assert manager.get_query_load()["admitted"] == 0
+    
+    @patch('src.workflows.flow_manager.kg_workflow')
+    def test_astream_query_emits_stage_events(self, mock_workflow):
+        """Test that streaming yields each stage as soon as it completes"""
+        chunk = Document(page_content="AI content", metadata={"page": 1})
+        
+        async def fake_astream(state, stream_mode):
+            yield "updates", {"retrieve_relevant_context": {"relevant_chunks": [chunk], "current_step": "context_retrieved"}}
+            yield "messages", (Mock(content="ignored"), {"langgraph_node": "generate_knowledge_graph"})
+            yield "updates", {"generate_knowledge_graph": {"entities": [{"name": "AI"}], "knowledge_graph": {"nodes": []}}}
+            yield "messages", (Mock(content="AI is"), {"langgraph_node": "generate_summary"})
+            yield "messages", (Mock(content=" great"), {"langgraph_node": "generate_summary"})
+            yield "updates", {"generate_summary": {"summary": "AI is great", "current_step": "summary_generated"}}
+        
+        mock_workflow.astream = fake_astream
+        manager = WorkflowManager()
+        
+        async def collect():
+            return [event async for event in manager.astream_query("What is AI?")]
+        
+        events = asyncio.run(collect())
+        
+        assert [event["event"] for event in events] == [
+            "started", "relevant_chunks", "knowledge_graph",
+            "summary_token", "summary_token", "summary", "done"
+        ]
+        assert events[1]["data"]["relevant_chunks"] == [{"content": "AI content", "metadata": {"page": 1}}]
+        assert events[2]["data"]["entities"] == [{"name": "AI"}]
+        assert "".join(event["data"]["token"] for event in events if event["event"] == "summary_token") == "AI is great"
+        assert events[-1]["data"]["processing_steps"] == ["context_retrieved", "summary_generated"]
+        assert manager.get_query_load()["admitted"] == 0
+    
+    @patch('src.workflows.flow_manager.kg_workflow')
+    def test_astream_query_stops_on_error(self, mock_workflow):
+        """Test that a failing node ends the stream with an error event"""
+        async def fake_astream(state, stream_mode):
+            yield "updates", {"retrieve_relevant_context": {"error": "Context retrieval failed", "current_step": "error"}}
+            yield "updates", {"generate_summary": {"summary": "should not be sent"}}
+        
+        mock_workflow.astream = fake_astream
+        manager = WorkflowManager()
+        
+        async def collect():
+            return [event async for event in manager.astream_query("What is AI?")]
+        
+        events = asyncio.run(collect())
+        
+        assert [event["event"] for event in events] == ["started", "error"]
+        assert manager.get_query_load()["admitted"] == 0
+    
     @patch('src.workflows.flow_manager.kg_workflow')
     def test_process_documents_success(self, mock_workflow):
         """Test successful document processing"""
@@ -106,6 +206,241 @@ class TestWorkflowManager:
         assert result["success"] is True
 
 
+class _FakeRedis:
+    """Dict-backed stand-in for the RedisClient JSON helpers"""
+    
+    def __init__(self):
+        self.store = {}
+    
+    def get_json(self, key):
+        return self.store.get(key)
+    
+    def set_json(self, key, value, ttl=3600):
+        self.store[key] = json.loads(json.dumps(value, default=str))
+        return True
+    
+    def incr(self, key):
+        self.store[key] = int(self.store.get(key, 0)) + 1
+        return self.store[key]
+
+
+class TestQueryResultCache:
+    """Test the query response cache"""
+    
+    def test_normalized_queries_share_an_entry(self):
+        """Test case, whitespace and trailing punctuation do not affect the key"""
+        from src.workflows.query_cache import QueryResultCache
+        
+        cache = QueryResultCache(redis_client=_FakeRedis())
+        cache.set("What is AI?", {"success": True, "summary": "AI"}, top_k=5, file_path=None)
+        
+        assert cache.get("  what is   ai ", top_k=5, file_path=None) == {"success": True, "summary": "AI"}
+        assert cache.get("What is AI?", top_k=10, file_path=None) is None
+    
+    def test_collection_change_invalidates_entries(self):
+        """Test bumping the collection version hides older responses"""
+        from src.workflows.query_cache import QueryResultCache
+        
+        cache = QueryResultCache(redis_client=_FakeRedis())
+        cache.set("What is AI?", {"success": True}, top_k=5)
+        cache.bump_collection_version()
+        
+        assert cache.get("What is AI?", top_k=5) is None
+        assert cache.stats()["misses"] == 1
+    
+    def test_failed_responses_are_not_cached(self):
+        """Test only successful responses are stored"""
+        from src.workflows.query_cache import QueryResultCache
+        
+        cache = QueryResultCache(redis_client=_FakeRedis())
+        cache.set("What is AI?", {"success": False, "error": "boom"}, top_k=5)
+        
+        assert cache.get("What is AI?", top_k=5) is None
+    
+    @patch('src.workflows.flow_manager.kg_workflow')
+    def test_cached_query_skips_workflow(self, mock_workflow):
+        """Test a repeated query is answered from the cache and marked as cached"""
+        from src.workflows.query_cache import QueryResultCache
+        
+        mock_workflow.ainvoke = AsyncMock(return_value=GraphState(query="What is AI?", summary="AI", current_step="completed"))
+        manager = WorkflowManager(query_cache=QueryResultCache(redis_client=_FakeRedis()))
+        manager.workflow = mock_workflow
+        
+        first = asyncio.run(manager.aprocess_query("What is AI?"))
+        second = asyncio.run(manager.aprocess_query("what is ai"))
+        
+        assert "cached" not in first
+        assert second["cached"] is True
+        assert second["summary"] == "AI"
+        assert mock_workflow.ainvoke.await_count == 1
+    
+    @patch('src.workflows.flow_manager.kg_workflow')
+    def test_answer_from_before_an_ingest_is_not_cached_as_fresh(self, mock_workflow):
+        """Test a response is stored under the version read before the workflow ran"""
+        from src.workflows.query_cache import QueryResultCache
+        
+        cache = QueryResultCache(redis_client=_FakeRedis())
+        
+        async def answer_during_ingest(state):
+            cache.bump_collection_version()
+            return GraphState(query="What is AI?", summary="AI", current_step="completed")
+        
+        mock_workflow.ainvoke = AsyncMock(side_effect=answer_during_ingest)
+        manager = WorkflowManager(query_cache=cache)
+        manager.semantic_cache = None
+        manager.workflow = mock_workflow
+        
+        asyncio.run(manager.aprocess_query("What is AI?"))
+        second = asyncio.run(manager.aprocess_query("What is AI?"))
+        
+        assert "cached" not in second
+        assert mock_workflow.ainvoke.await_count == 2
+    
+    def test_vector_store_writes_notify_listeners(self):
+        """Test ingest and delete notify change listeners"""
+        from src.components.processing.vector_store import ChromaVectorStore
+        
+        with patch.object(ChromaVectorStore, '_initialize_vector_store'), \
+                patch('src.components.processing.vector_store.settings') as mock_settings:
+            mock_settings.CHROMA_USE_CLOUD = True
+            mock_settings.CHROMA_API_KEY = "key"
+            mock_settings.VECTOR_UPSERT_BATCH_SIZE = 10
+            mock_settings.VECTOR_UPSERT_CONCURRENCY = 1
+            mock_settings.VECTOR_UPSERT_MAX_RETRIES = 0
+            store = ChromaVectorStore()
+            store.client = Mock()
+            store.vector_store = Mock()
+            listener = Mock()
+            store.add_change_listener(listener)
+            
+            store.add_documents([Document(page_content="AI")])
+            store.delete_documents(ids=["a"])
+        
+        assert listener.call_count == 2
+    
+    def test_precomputed_upserts_reuse_the_collection(self):
+        """Test batches with precomputed vectors resolve the collection once and omit empty metadata"""
+        from src.components.processing.vector_store import ChromaVectorStore
+        
+        with patch.object(ChromaVectorStore, '_initialize_vector_store'), \
+                patch('src.components.processing.vector_store.settings') as mock_settings:
+            mock_settings.CHROMA_USE_CLOUD = True
+            mock_settings.CHROMA_API_KEY = "key"
+            mock_settings.VECTOR_UPSERT_BATCH_SIZE = 2
+            mock_settings.VECTOR_UPSERT_CONCURRENCY = 1
+            mock_settings.VECTOR_UPSERT_MAX_RETRIES = 0
+            store = ChromaVectorStore()
+            store.client = Mock()
+            store.vector_store = Mock()
+            
+            documents = [Document(page_content="AI", metadata={"page": 1}), Document(page_content="ML"),
+                         Document(page_content="DL", metadata={"page": 2})]
+            store.add_documents(documents, embeddings=[[0.1], [0.2], [0.3]])
+        
+        store.client.get_or_create_collection.assert_called_once()
+        upserts = store.client.get_or_create_collection.return_value.upsert.call_args_list
+        assert [call.kwargs["documents"] for call in upserts] == [["AI"], ["ML"], ["DL"]]
+        assert upserts[0].kwargs["metadatas"] == [{"page": 1}]
+        assert "metadatas" not in upserts[1].kwargs
+
+
+def _bag_of_words_embedding(query):
+    """Deterministic toy embedding: word counts over a fixed vocabulary"""
+    vocabulary = ["what", "is", "ai", "artificial", "intelligence", "explain", "cats", "dogs"]
+    words = query.lower().replace("?", "").split()
+    return [float(words.count(word)) for word in vocabulary]
+
+
+class TestSemanticQueryCache:
+    """Test the similarity-based query cache"""
+    
+    def _cache(self, **kwargs):
+        from src.workflows.semantic_cache import SemanticQueryCache
+        return SemanticQueryCache(_bag_of_words_embedding, **{"threshold": 0.8, "max_entries": 10, "ttl": 60, **kwargs})
+    
+    def test_paraphrased_query_hits(self):
+        """Test a similar query above the threshold reuses the response"""
+        cache = self._cache()
+        cache.set("what is ai", {"success": True, "summary": "AI"}, top_k=5)
+        
+        assert cache.get("explain what is ai?", top_k=5) == {"success": True, "summary": "AI"}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["last_hit_similarity"] >= 0.8
+    
+    def test_dissimilar_query_misses(self):
+        """Test unrelated queries fall below the threshold"""
+        cache = self._cache()
+        cache.set("what is ai", {"success": True}, top_k=5)
+        
+        assert cache.get("cats dogs", top_k=5) is None
+        assert cache.stats()["misses"] == 1
+    
+    def test_parameters_partition_entries(self):
+        """Test responses are only reused for the same request parameters"""
+        cache = self._cache()
+        cache.set("what is ai", {"success": True}, top_k=5)
+        
+        assert cache.get("what is ai", top_k=10) is None
+    
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test the index stays within max_entries"""
+        cache = self._cache(max_entries=1)
+        cache.set("what is ai", {"success": True, "summary": "AI"}, top_k=5)
+        cache.set("cats dogs", {"success": True, "summary": "pets"}, top_k=5)
+        
+        assert cache.get("what is ai", top_k=5) is None
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["cache_size"] == 1
+    
+    def test_expired_entries_are_dropped(self):
+        """Test entries past their TTL are not served"""
+        cache = self._cache()
+        cache.set("what is ai", {"success": True}, top_k=5)
+        
+        with patch('src.workflows.semantic_cache.time.monotonic', return_value=10 ** 9):
+            assert cache.get("what is ai", top_k=5) is None
+        assert cache.stats()["expirations"] == 1
+    
+    @patch('src.workflows.flow_manager.kg_workflow')
+    def test_workflow_manager_uses_semantic_cache(self, mock_workflow):
+        """Test a paraphrased query is served from the semantic cache"""
+        mock_workflow.ainvoke = AsyncMock(return_value=GraphState(query="what is ai", summary="AI", current_step="completed"))
+        manager = WorkflowManager(semantic_cache=self._cache())
+        manager.query_cache = None
+        manager.workflow = mock_workflow
+        
+        asyncio.run(manager.aprocess_query("what is ai"))
+        second = asyncio.run(manager.aprocess_query("explain what is ai"))
+        
+        assert second["cached"] is True
+        assert mock_workflow.ainvoke.await_count == 1
+        assert manager.get_cache_stats()["semantic_cache"]["hits"] == 1
+    
+    @patch('src.workflows.flow_manager.kg_workflow')
+    def test_semantic_entry_keeps_the_version_read_before_the_run(self, mock_workflow):
+        """Test an answer computed while an ingest lands is not served after it"""
+        from src.workflows.query_cache import QueryResultCache
+        
+        versions = QueryResultCache(redis_client=_FakeRedis())
+        
+        async def answer_during_ingest(state):
+            versions.bump_collection_version()
+            return GraphState(query="what is ai", summary="AI", current_step="completed")
+        
+        mock_workflow.ainvoke = AsyncMock(side_effect=answer_during_ingest)
+        manager = WorkflowManager(semantic_cache=self._cache())
+        manager.query_cache = None
+        manager._collection_version = versions.collection_version
+        manager.workflow = mock_workflow
+        
+        asyncio.run(manager.aprocess_query("what is ai"))
+        second = asyncio.run(manager.aprocess_query("explain what is ai"))
+        
+        assert "cached" not in second
+        assert mock_workflow.ainvoke.await_count == 2
+
+
 class TestWorkflowComponents:
     """Test workflow components"""
     
@@ -169,6 +504,118 @@ class TestWorkflowDecisionLogic:
         assert len(doc_state.documents) > 0
 
 
+class TestNodeUpdates:
+    """Test that workflow nodes return partial state updates"""
+    
+    @patch('src.workflows.node.retrival.get_vector_store')
+    def test_retrieval_returns_only_changed_fields(self, mock_vector_store):
+        """Test retrieval does not copy the documents already in the state"""
+        from src.workflows.node.retrival import retrieve_relevant_context
+        
+        chunk = Document(page_content="AI content")
+        mock_vector_store.return_value.query.return_value = [chunk]
+        state = GraphState(query="What is AI?", documents=[Document(page_content="Page")])
+        
+        update = retrieve_relevant_context(state)
+        
+        assert set(update) == {"relevant_chunks", "combined_context", "current_step"}
+        assert update["relevant_chunks"][0] is chunk
+        assert update["current_step"] == "context_retrieved"
+    
+    @patch('src.workflows.node.retrival.get_vector_store')
+    def test_retrieval_failure_returns_error_update(self, mock_vector_store):
+        """Test retrieval failures are reported as an error update"""
+        from src.workflows.node.retrival import retrieve_relevant_context
+        
+        mock_vector_store.return_value.query.side_effect = GraphMindException("store down")
+        
+        update = retrieve_relevant_context(GraphState(query="What is AI?"))
+        
+        assert update["current_step"] == "error"
+        assert "Context retrieval failed" in update["error"]
+    
+    @patch('src.workflows.node.retrival.get_vector_store')
+    def test_retrieval_uses_requested_top_k(self, mock_vector_store):
+        """Test top_k from the pipeline config reaches the vector store"""
+        from src.workflows.node.retrival import retrieve_relevant_context
+        from src.workflows.state import PipelineConfig
+        
+        mock_vector_store.return_value.query.return_value = []
+        state = GraphState(query="What is AI?", pipeline_config=PipelineConfig(top_k=12))
+        
+        retrieve_relevant_context(state)
+        
+        mock_vector_store.return_value.query.assert_called_once_with("What is AI?", top_k=12)
+    
+    def test_pipeline_config_keeps_defaults_for_unset_values(self):
+        """Test request overrides only replace the values that were given"""
+        from src.workflows.state import PipelineConfig
+        from src.config.settings import settings
+        
+        config = PipelineConfig.from_overrides(chunk_size=800, chunk_overlap=None, top_k=None)
+        
+        assert config.chunk_size == 800
+        assert config.chunk_overlap == settings.CHUNK_OVERLAP
+        assert config.top_k == 5
+    
+    def test_nodes_without_input_return_empty_update(self):
+        """Test nodes leave the state untouched when they have nothing to do"""
+        from src.workflows.node.document_processing import process_documents
+        from src.workflows.node.retrival import retrieve_relevant_context
+        
+        assert process_documents(GraphState(query="What is AI?")) == {}
+        assert retrieve_relevant_context(GraphState(file_path="doc.pdf")) == {}
+
+
+class TestParallelQueryBranches:
+    """Test that knowledge graph and summary generation fan out from retrieval"""
+    
+    @patch('src.workflows.node.summarization.get_llm_chain')
+    @patch('src.workflows.node.summarization.get_llm_client')
+    @patch('src.workflows.node.knowledge_graph.GraphOrchestrator')
+    @patch('src.workflows.node.retrival.get_vector_store')
+    def test_branches_run_concurrently_and_join(self, mock_vector_store, mock_orchestrator, mock_llm, mock_chain):
+        """Test both branches overlap in time and their results are joined"""
+        mock_vector_store.return_value.query.return_value = [Document(page_content="AI content")]
+        
+        # Each branch waits for the other; a sequential graph would time out here
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def build_graph(chunks):
+            barrier.wait()
+            return {"entities": [{"name": "AI"}], "relationships": [], "visualization": {}}
+        
+        def summarize(inputs):
+            barrier.wait()
+            return Mock(content="AI summary")
+        
+        mock_orchestrator.return_value.build_knowledge_graph.side_effect = build_graph
+        mock_chain.return_value.invoke.side_effect = summarize
+        
+        result = WorkflowManager().process_query("What is AI?")
+        
+        assert result["success"] is True
+        assert result["summary"] == "AI summary"
+        assert result["entities"] == [{"name": "AI"}]
+        assert result["processing_steps"] == ["completed"]
+    
+    @patch('src.workflows.node.summarization.get_llm_chain')
+    @patch('src.workflows.node.summarization.get_llm_client')
+    @patch('src.workflows.node.knowledge_graph.GraphOrchestrator')
+    @patch('src.workflows.node.retrival.get_vector_store')
+    def test_branch_errors_are_propagated(self, mock_vector_store, mock_orchestrator, mock_llm, mock_chain):
+        """Test that failures in both parallel branches reach the error node"""
+        mock_vector_store.return_value.query.return_value = [Document(page_content="AI content")]
+        mock_orchestrator.return_value.build_knowledge_graph.side_effect = GraphMindException("graph down")
+        mock_chain.return_value.invoke.side_effect = GraphMindException("llm down")
+        
+        result = WorkflowManager().process_query("What is AI?")
+        
+        assert result["success"] is False
+        assert "Knowledge graph generation failed" in result["error"]
+        assert "Summary generation failed" in result["error"]
+
+
 class TestWorkflowIntegration:
     """Integration tests for complete workflows"""
     
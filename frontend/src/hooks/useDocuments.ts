@@ -96,8 +96,8 @@ export const useDocuments = () => {
             } : doc
           ));
 
-          // Poll for task completion with faster intervals
-          pollTaskStatus(newDoc.id, response.task_id, file.name);
+          // Follow task progress, falling back to polling if streaming is unavailable
+          watchTaskStatus(newDoc.id, response.task_id, file.name);
         } else if (response.success && !response.task_id) {
           // Synchronous processing completed
           setDocuments(prev => prev.map(doc => 
@@ -127,6 +127,64 @@ export const useDocuments = () => {
     }
   };
 
+  // Applies a task status to its document; returns true once the task is finished
+  const applyTaskStatus = (docId: number, taskStatus: TaskStatusResponse, fileName?: string): boolean => {
+    // Better progress mapping
+    let mappedProgress = taskStatus.progress || 35;
+    if (taskStatus.progress) {
+      // Map backend progress (0-100) to frontend progress (35-100)
+      mappedProgress = 35 + (taskStatus.progress * 0.65);
+    }
+    
+    setDocuments(prev => prev.map(doc => 
+      doc.id === docId ? { 
+        ...doc, 
+        progress: Math.round(mappedProgress),
+        status: taskStatus.status === 'completed' ? 'ready' : 
+               taskStatus.status === 'failed' ? 'failed' : 'processing'
+      } : doc
+    ));
+
+    if (taskStatus.status === 'completed') {
+      setDocuments(prev => prev.map(doc => 
+        doc.id === docId ? { ...doc, progress: 100 } : doc
+      ));
+      toast({
+        title: "✅ Processing Complete",
+        description: `${fileName || 'Document'} is ready for queries!`,
+      });
+      return true;
+    } else if (taskStatus.status === 'failed') {
+      toast({
+        title: "❌ Processing Failed",
+        description: taskStatus.error || `Failed to process ${fileName || 'document'}`,
+        variant: "destructive"
+      });
+      return true;
+    }
+    return false;
+  };
+
+  const watchTaskStatus = (docId: number, taskId: string, fileName?: string) => {
+    if (typeof EventSource === 'undefined') {
+      pollTaskStatus(docId, taskId, fileName);
+      return;
+    }
+
+    let finished = false;
+    apiClient.watchTaskStatus(
+      taskId,
+      (taskStatus) => {
+        finished = applyTaskStatus(docId, taskStatus, fileName) || finished;
+      },
+      () => {
+        if (!finished) {
+          pollTaskStatus(docId, taskId, fileName);
+        }
+      }
+    );
+  };
+
   const pollTaskStatus = async (docId: number, taskId: string, fileName?: string) => {
     const maxPolls = 120; // 10 minutes max
     let pollCount = 0;
@@ -135,37 +193,7 @@ export const useDocuments = () => {
       try {
         const taskStatus: TaskStatusResponse = await apiClient.getTaskStatus(taskId);
         
-        // Better progress mapping
-        let mappedProgress = taskStatus.progress || 35;
-        if (taskStatus.progress) {
-          // Map backend progress (0-100) to frontend progress (35-100)
-          mappedProgress = 35 + (taskStatus.progress * 0.65);
-        }
-        
-        setDocuments(prev => prev.map(doc => 
-          doc.id === docId ? { 
-            ...doc, 
-            progress: Math.round(mappedProgress),
-            status: taskStatus.status === 'completed' ? 'ready' : 
-                   taskStatus.status === 'failed' ? 'failed' : 'processing'
-          } : doc
-        ));
-
-        if (taskStatus.status === 'completed') {
-          setDocuments(prev => prev.map(doc => 
-            doc.id === docId ? { ...doc, progress: 100 } : doc
-          ));
-          toast({
-            title: "✅ Processing Complete",
-            description: `${fileName || 'Document'} is ready for queries!`,
-          });
-          return;
-        } else if (taskStatus.status === 'failed') {
-          toast({
-            title: "❌ Processing Failed",
-            description: taskStatus.error || `Failed to process ${fileName || 'document'}`,
-            variant: "destructive"
-          });
+        if (applyTaskStatus(docId, taskStatus, fileName)) {
           return;
         }
 
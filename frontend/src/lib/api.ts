@@ -269,6 +269,43 @@ class ApiClient {
     return this.request<TaskStatusResponse>(`/tasks/${taskId}`);
   }
 
+  /**
+   * Stream task progress over Server-Sent Events until the task completes or fails.
+   * The browser reconnects on its own, resuming from the last event it saw.
+   * Returns a function that closes the stream.
+   */
+  watchTaskStatus(
+    taskId: string,
+    onStatus: (status: TaskStatusResponse) => void,
+    onError: () => void
+  ): () => void {
+    const source = new EventSource(`${this.baseUrl}/tasks/${taskId}/events`);
+    let task = {} as TaskStatusResponse;
+
+    const handle = (replace: boolean) => (event: MessageEvent) => {
+      task = replace ? JSON.parse(event.data) : { ...task, ...JSON.parse(event.data) };
+      if (task.status === 'completed' || task.status === 'failed') {
+        source.close();
+      }
+      onStatus(task);
+    };
+
+    source.addEventListener('snapshot', handle(true));
+    source.addEventListener('update', handle(false));
+    source.addEventListener('expired', () => {
+      source.close();
+      onError();
+    });
+    source.onerror = () => {
+      // The browser gives up on errors such as a 404; otherwise it reconnects
+      if (source.readyState === EventSource.CLOSED) {
+        onError();
+      }
+    };
+
+    return () => source.close();
+  }
+
   async getAllTasks(): Promise<Record<string, any>> {
     return this.request<Record<string, any>>('/tasks');
   }